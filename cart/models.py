@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils.timezone import now
 from users.models import User
 from food.models import FoodItem
 
@@ -6,10 +7,14 @@ from food.models import FoodItem
 class Cart(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # 🧹 idle carts get swept
 
     def __str__(self):
         return f"Cart of {self.user.username} (ID: {self.id})"
 
+    def touch(self):
+        Cart.objects.filter(pk=self.pk).update(updated_at=now())
+
 # Individual Items in the Cart
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, null=True, blank=True)
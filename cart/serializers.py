@@ -1,15 +1,16 @@
 ﻿from rest_framework import serializers
 from .models import Cart, CartItem
 from food.models import FoodItem
+from maakaswad.sparse import SparseFieldsMixin
 
 # ✅ Minimal food item details
-class FoodItemMinimalSerializer(serializers.ModelSerializer):
+class FoodItemMinimalSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = FoodItem
         fields = ['id', 'name', 'price', 'image']  # Added image for cart display
 
 # ✅ CartItem Serializer
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     food_item = FoodItemMinimalSerializer(read_only=True)
     food_item_id = serializers.PrimaryKeyRelatedField(
         queryset=FoodItem.objects.all(), write_only=True, source='food_item', required=False
@@ -21,7 +22,7 @@ class CartItemSerializer(serializers.ModelSerializer):
         fields = ['id', 'cart', 'food_item', 'food_item_id', 'quantity']
 
 # ✅ Cart Serializer with related items
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     items = CartItemSerializer(source='cartitem_set', many=True, read_only=True)
 
     class Meta:
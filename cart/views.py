@@ -1,16 +1,20 @@
-﻿from rest_framework import generics, permissions, status
+﻿from django.db.models import Prefetch
+from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from .models import Cart, CartItem
 from .serializers import CartSerializer, CartItemSerializer
 from food.models import FoodItem
+from maakaswad.sparse import SparseFieldsViewMixin
 
 # ✅ List the user's cart and its items
-class CartListCreateView(generics.ListCreateAPIView):
+class CartListCreateView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     serializer_class = CartSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Cart.objects.filter(user=self.request.user)
+        return Cart.objects.filter(user=self.request.user).prefetch_related(
+            Prefetch('cartitem_set', queryset=CartItem.objects.select_related('food_item'))
+        )
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -22,7 +26,9 @@ class AddToCartView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        cart, _ = Cart.objects.get_or_create(user=self.request.user)
+        cart, created = Cart.objects.get_or_create(user=self.request.user)
+        if not created:
+            cart.touch()
         food_item = serializer.validated_data['food_item']
         quantity = serializer.validated_data.get('quantity', 1)
 
@@ -46,6 +52,10 @@ class CartItemDeleteView(generics.DestroyAPIView):
         cart, _ = Cart.objects.get_or_create(user=self.request.user)
         return CartItem.objects.filter(cart=cart)
 
+    def perform_destroy(self, instance):
+        instance.delete()
+        instance.cart.touch()
+
 
 # ✅ Update a CartItem quantity
 class CartItemUpdateView(generics.UpdateAPIView):
@@ -67,5 +77,6 @@ class CartItemUpdateView(generics.UpdateAPIView):
 
         instance.quantity = int(quantity)
         instance.save()
+        instance.cart.touch()
         serializer = self.get_serializer(instance)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from .models import FoodItem
+
+
+# ==========================================================
+# ⚡ Fast path for FoodItemSerializer (catalog lists)
+# ==========================================================
+# Builds the exact FoodItemSerializer payload from one .values() query,
+# skipping model instantiation and per-field DRF overhead.
+# Keep in sync with FoodItemSerializer.Meta.fields.
+
+FOOD_ITEM_COLUMNS = (
+    'id',
+    'name',
+    'description',
+    'price',
+    'image',
+    'category_id',
+    'is_available',
+)
+
+_CENTS = Decimal('0.01')
+
+
+def encode_food_items(queryset, request=None):
+    """
+    Serialize a FoodItem queryset to the FoodItemSerializer(many=True)
+    payload. Pass the request to get absolute image URLs, as DRF does.
+    """
+    storage = FoodItem._meta.get_field('image').storage
+
+    def image_url(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    return [
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'description': row['description'],
+            'price': '{:f}'.format(row['price'].quantize(_CENTS)),
+            'image': image_url(row['image']),
+            'category': row['category_id'],
+            'is_available': row['is_available'],
+        }
+        for row in queryset.values(*FOOD_ITEM_COLUMNS)
+    ]
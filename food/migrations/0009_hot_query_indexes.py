@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+from maakaswad.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('food', '0008_fooditem_chef'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='fooditem',
+            index=models.Index(fields=['is_available', 'category'], name='fooditem_available_category'),
+        ),
+        AddIndexConcurrently(
+            model_name='supportticket',
+            index=models.Index(fields=['user', '-created_at'], name='supportticket_user_created'),
+        ),
+    ]
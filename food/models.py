@@ -38,6 +38,12 @@ class FoodItem(models.Model):
     def __str__(self):
         return self.name
 
+    class Meta:
+        # 🗂️ Customer menu by category (chef menus use the chef FK index)
+        indexes = [
+            models.Index(fields=['is_available', 'category'], name='fooditem_available_category'),
+        ]
+
 
 # ✅ Favorite Items
 class Favorite(models.Model):
@@ -81,4 +87,9 @@ class SupportTicket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Ticket #{self.id} by {self.user} ({self.status})"
\ No newline at end of file
+        return f"Ticket #{self.id} by {self.user} ({self.status})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='supportticket_user_created'),
+        ]
\ No newline at end of file
@@ -1,9 +1,10 @@
 ﻿from rest_framework import serializers
 from .models import Category, FoodItem, Favorite, SupportTicket
+from maakaswad.sparse import SparseFieldsMixin
 
 
 # ✅ Category Serializer
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     image = serializers.ImageField(read_only=True)
 
     class Meta:
@@ -12,7 +13,7 @@ class CategorySerializer(serializers.ModelSerializer):
 
 
 # ✅ Food Item Serializer
-class FoodItemSerializer(serializers.ModelSerializer):
+class FoodItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     # 🔥 Allow category selection while creating
     category = serializers.PrimaryKeyRelatedField(
@@ -31,6 +32,11 @@ class FoodItemSerializer(serializers.ModelSerializer):
             'is_available',
         ]
 
+        # ?expand=category
+        expandable_fields = {
+            'category': CategorySerializer,
+        }
+
     # 🔥 Automatically assign chef
     def create(self, validated_data):
         request = self.context.get("request")
@@ -39,7 +45,7 @@ class FoodItemSerializer(serializers.ModelSerializer):
 
 
 # ✅ Favorite Serializer
-class FavoriteSerializer(serializers.ModelSerializer):
+class FavoriteSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     food_item = FoodItemSerializer(read_only=True)
 
     class Meta:
@@ -48,7 +54,7 @@ class FavoriteSerializer(serializers.ModelSerializer):
 
 
 # ✅ Support Ticket Serializer
-class SupportTicketSerializer(serializers.ModelSerializer):
+class SupportTicketSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -10,12 +10,14 @@ from .serializers import (
     FavoriteSerializer,
     SupportTicketSerializer,
 )
+from .encoders import encode_food_items
+from maakaswad.sparse import SparseFieldsViewMixin, prune_queryset, sparse_requested
 
 
 # ==========================================================
 # 🟢 CATEGORY LIST (PUBLIC)
 # ==========================================================
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(SparseFieldsViewMixin, generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
@@ -24,7 +26,7 @@ class CategoryListView(generics.ListAPIView):
 # ==========================================================
 # 🟢 CUSTOMER FOOD LIST (PUBLIC)
 # ==========================================================
-class FoodItemListView(generics.ListAPIView):
+class FoodItemListView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = FoodItemSerializer
     permission_classes = [AllowAny]
 
@@ -38,11 +40,19 @@ class FoodItemListView(generics.ListAPIView):
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        if sparse_requested(request):
+            return super().list(request, *args, **kwargs)
+
+        # ⚡ same payload as FoodItemSerializer, built from .values() rows
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(encode_food_items(queryset, request=request))
+
 
 # ==========================================================
 # 🟢 CUSTOMER FOOD DETAIL
 # ==========================================================
-class FoodItemDetailView(generics.RetrieveAPIView):
+class FoodItemDetailView(SparseFieldsViewMixin, generics.RetrieveAPIView):
     queryset = FoodItem.objects.filter(is_available=True)
     serializer_class = FoodItemSerializer
     permission_classes = [AllowAny]
@@ -51,7 +61,7 @@ class FoodItemDetailView(generics.RetrieveAPIView):
 # ==========================================================
 # 🔵 CHEF - VIEW OWN MENU
 # ==========================================================
-class ChefFoodItemListCreateView(generics.ListCreateAPIView):
+class ChefFoodItemListCreateView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     serializer_class = FoodItemSerializer
     permission_classes = [IsAuthenticated]
 
@@ -68,7 +78,7 @@ class ChefFoodItemListCreateView(generics.ListCreateAPIView):
 # ==========================================================
 # 🔵 CHEF - UPDATE OWN ITEM
 # ==========================================================
-class ChefFoodItemDetailView(generics.RetrieveUpdateAPIView):
+class ChefFoodItemDetailView(SparseFieldsViewMixin, generics.RetrieveUpdateAPIView):
     serializer_class = FoodItemSerializer
     permission_classes = [IsAuthenticated]
 
@@ -100,8 +110,13 @@ class FavoriteListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        favorites = Favorite.objects.filter(user=request.user)
-        serializer = FavoriteSerializer(favorites, many=True)
+        context = {'request': request}
+
+        favorites = prune_queryset(
+            Favorite.objects.filter(user=request.user).select_related('food_item'),
+            FavoriteSerializer(context=context)
+        )
+        serializer = FavoriteSerializer(favorites, many=True, context=context)
         return Response(serializer.data)
 
 
@@ -126,12 +141,12 @@ class ToggleFavoriteView(APIView):
 # ==========================================================
 # 🎟 SUPPORT TICKET
 # ==========================================================
-class SupportTicketListCreateView(generics.ListCreateAPIView):
+class SupportTicketListCreateView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     serializer_class = SupportTicketSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return SupportTicket.objects.filter(user=self.request.user).order_by('-created_at')
+        return SupportTicket.objects.filter(user=self.request.user).select_related('user').order_by('-created_at')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
\ No newline at end of file
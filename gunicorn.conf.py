@@ -0,0 +1,205 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+
+# ==========================================================
+# 🦄 gunicorn configuration (loaded automatically from the repo root)
+# ==========================================================
+# Every value can be overridden from the environment:
+#
+#   WEB_CONCURRENCY         worker processes (default: from CPU and memory)
+#   GUNICORN_THREADS        threads per worker (gthread)
+#   GUNICORN_WORKER_CLASS   e.g. uvicorn.workers.UvicornWorker with maakaswad.asgi
+#   WEB_WORKER_MEMORY_MB    expected RSS of one worker, used for sizing
+#   GUNICORN_TIMEOUT, GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER
+#
+# With ?pool=true in DATABASE_URL keep pool_max_size >= threads, and
+# workers * pool_max_size under Postgres max_connections.
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "maakaswad.settings")
+
+# Prometheus multiprocess mode (maakaswad.metrics): workers write samples
+# here and /metrics aggregates them. Must be set before the app is loaded.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "maakaswad-prometheus"))
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def _cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _memory_limit_mb():
+    """Container (cgroup v2 / v1) memory limit, else physical memory."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:
+            return int(value) // (1024 * 1024)
+
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _default_workers():
+    by_cpu = 2 * _cpu_count() + 1
+
+    memory_mb = _memory_limit_mb()
+    if memory_mb is None:
+        return by_cpu
+
+    # Leave ~25% for the master, page cache and spikes
+    per_worker_mb = int(os.environ.get("WEB_WORKER_MEMORY_MB", 200))
+    by_memory = int(memory_mb * 0.75) // per_worker_mb
+
+    return max(1, min(by_cpu, by_memory))
+
+
+# ----------------------------------------------------------
+# Server
+# ----------------------------------------------------------
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+workers = int(os.environ.get("WEB_CONCURRENCY", _default_workers()))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Load Django once in the master; workers share its memory copy-on-write
+preload_app = True
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers to cap slow memory growth; jitter keeps them from all
+# restarting at the same moment
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+accesslog = "-"
+errorlog = "-"
+
+
+# ----------------------------------------------------------
+# Worker lifecycle
+# ----------------------------------------------------------
+def on_starting(server):
+    # Samples left by a previous master would be counted again
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    for name in os.listdir(metrics_dir):
+        os.remove(os.path.join(metrics_dir, name))
+
+
+def pre_fork(server, worker):
+    # Nothing opened in the master (by preload or a previous hook) may be
+    # inherited: a socket shared between processes corrupts both sides.
+    from django.db import connections
+
+    for conn in connections.all():
+        conn.close()
+        if getattr(conn, "pool", None) is not None:
+            conn.close_pool()
+
+
+def post_fork(server, worker):
+    from django.core.cache import caches
+    from django.db import connections
+
+    from maakaswad.httpclient import reset_clients
+
+    connections.close_all()
+    caches.close_all()
+    reset_clients()
+
+    # Workers would otherwise share the master's PRNG state (replica choice)
+    random.seed()
+
+    _stats.reset()
+    server.log.info("Worker %s ready (%s threads)", worker.pid, threads)
+
+
+# ----------------------------------------------------------
+# Per-worker request stats (logged when the worker exits)
+# ----------------------------------------------------------
+# pre_request / post_request are called by sync and gthread workers only.
+
+class _WorkerStats:
+    SAMPLE_SIZE = 5000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.statuses = Counter()
+        self.latencies = deque(maxlen=self.SAMPLE_SIZE)
+
+    def record(self, elapsed_ms, status):
+        with self.lock:
+            self.requests += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self.statuses[status] += 1
+            self.latencies.append(elapsed_ms)
+
+    def summary(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+
+            def percentile(p):
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 1)
+
+            return {
+                "uptime_s": round(time.monotonic() - self.started),
+                "requests": self.requests,
+                "mean_ms": round(self.total_ms / self.requests, 1) if self.requests else None,
+                "p50_ms": percentile(0.50),
+                "p95_ms": percentile(0.95),
+                "p99_ms": percentile(0.99),
+                "max_ms": round(self.max_ms, 1),
+                "statuses": dict(self.statuses),
+            }
+
+
+_stats = _WorkerStats()
+
+
+def pre_request(worker, req):
+    req.start_time = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    start = getattr(req, "start_time", None)
+    if start is None:
+        return
+
+    status = f"{resp.status_code // 100}xx" if resp.status_code else "unknown"
+    _stats.record((time.perf_counter() - start) * 1000, status)
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (pool usage); its counters stay
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    server.log.info("worker_stats %s", json.dumps({"pid": worker.pid, **_stats.summary()}))
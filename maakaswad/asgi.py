@@ -0,0 +1,15 @@
+import os
+from django.core.asgi import get_asgi_application
+
+# ASGI deployment mode. The outbound-I/O views (Google social login,
+# Razorpay create/verify) are async, so on an event loop a slow upstream
+# doesn't hold a worker thread:
+#
+#   gunicorn maakaswad.asgi:application -k uvicorn.workers.UvicornWorker
+#
+# Everything else runs unchanged (sync views in Django's thread pool).
+# All middleware must be async-capable, see ASGI_MODE in settings.py.
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "maakaswad.settings")
+os.environ.setdefault("DJANGO_ASGI", "True")
+application = get_asgi_application()
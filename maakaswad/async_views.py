@@ -0,0 +1,33 @@
+import json
+
+from django.http import HttpResponse
+from rest_framework.settings import api_settings
+
+
+# ==========================================================
+# ⚡ Helpers for plain async Django views
+# ==========================================================
+# DRF's APIView is sync-only, so the outbound-I/O views (Google login,
+# Razorpay) are async Django views. These keep their request parsing and
+# JSON output the same as the DRF views they replace.
+
+def request_data(request):
+    """request.data equivalent: JSON body, or form / multipart fields."""
+    if request.content_type == 'application/json':
+        if not request.body:
+            return {}
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return request.POST
+
+
+def json_response(data, status=200):
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(
+        renderer.render(data),
+        status=status,
+        content_type='application/json',
+    )
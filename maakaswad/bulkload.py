@@ -0,0 +1,104 @@
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+
+class BulkLoader:
+    """
+    Streams rows into one table, `batch_size` at a time: COPY on PostgreSQL,
+    executemany INSERT elsewhere. Nothing goes through the ORM, so rows never
+    live as model instances and auto_now_add values can be backdated.
+
+    Rows are tuples in `columns` order (attnames, primary key included).
+    Every other column gets its field default; auto_now / auto_now_add
+    fields get the load time.
+
+    A loader created with `parent` (e.g. order items of orders) never flushes
+    on its own: it is written right after each parent batch, so foreign keys
+    always point at committed rows.
+    """
+
+    def __init__(self, model, columns, batch_size=50_000, using=DEFAULT_DB_ALIAS, parent=None):
+        self.model = model
+        self.connection = connections[using]
+        self.batch_size = batch_size
+        self.rows = []
+        self.written = 0
+
+        self.children = []
+        self.autoflush = parent is None
+        if parent is not None:
+            parent.children.append(self)
+
+        now = timezone.now()
+        fields = {field.attname: field for field in model._meta.concrete_fields}
+        rest = [field for name, field in fields.items() if name not in columns]
+        ordered = [fields[name] for name in columns] + rest
+
+        self.tail = tuple(
+            now if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+            else field.get_default()
+            for field in rest
+        )
+
+        quote = self.connection.ops.quote_name
+        self.table = quote(model._meta.db_table)
+        self.column_sql = ", ".join(quote(field.column) for field in ordered)
+        self.placeholders = ", ".join(["%s"] * len(ordered))
+
+        self.use_copy = self.connection.vendor == "postgresql"
+        # psycopg adapts aware datetimes and Decimals itself; other drivers
+        # get the backend's own representation
+        self.prepared = [] if self.use_copy else [
+            (index, field) for index, field in enumerate(ordered)
+            if field.get_internal_type() in ("DateTimeField", "DateField", "DecimalField")
+        ]
+
+    def add(self, *values):
+        self.rows.append(values + self.tail)
+        if self.autoflush and len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.write()
+        for child in self.children:
+            child.flush()
+
+    def write(self):
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            if self.use_copy:
+                with cursor.copy(f"COPY {self.table} ({self.column_sql}) FROM STDIN") as copy:
+                    for row in self.rows:
+                        copy.write_row(row)
+            else:
+                cursor.executemany(
+                    f"INSERT INTO {self.table} ({self.column_sql}) VALUES ({self.placeholders})",
+                    [self.prepare(row) for row in self.rows] if self.prepared else self.rows,
+                )
+
+        self.written += len(self.rows)
+        self.rows = []
+
+    def prepare(self, row):
+        row = list(row)
+        for index, field in self.prepared:
+            if row[index] is not None:
+                row[index] = field.get_db_prep_save(row[index], self.connection)
+        return row
+
+
+def next_id(model, using=DEFAULT_DB_ALIAS):
+    """First free primary key; loaders assign ids themselves so rows can refer to each other."""
+    return (model.objects.using(using).aggregate(top=Max("pk"))["top"] or 0) + 1
+
+
+def reset_sequences(models, using=DEFAULT_DB_ALIAS):
+    """Move id sequences past explicitly inserted keys (no-op on SQLite)."""
+    connection = connections[using]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
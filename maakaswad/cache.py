@@ -0,0 +1,35 @@
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from .perf import record_cache
+
+_MISSING = object()
+
+
+# ==========================================================
+# ⚡ Cache backends counting hits / misses per request
+# ==========================================================
+# Same behaviour as Django's backends; lookups also report to
+# maakaswad.perf (Server-Timing, perf logs). The async variants go through
+# these in BaseCache.
+
+class InstrumentedCacheMixin:
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        record_cache(value is not _MISSING)
+        return default if value is _MISSING else value
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    # BaseCache.get_many() calls get(), already counted
+    pass
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+
+    def get_many(self, keys, version=None):
+        found = super().get_many(keys, version)
+        for key in keys:
+            record_cache(key in found)
+        return found
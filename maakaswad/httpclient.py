@@ -0,0 +1,85 @@
+import asyncio
+import atexit
+import threading
+
+import httpx
+from django.conf import settings
+
+from . import perf
+from .perf import HTTPX_EVENT_HOOKS
+
+
+# ==========================================================
+# 🌐 Shared async HTTP client (Google, Razorpay)
+# ==========================================================
+# One httpx.AsyncClient per worker process, owned by an event loop running
+# on its own daemon thread, so connections (and TLS sessions) to upstreams
+# are reused across requests under both servers:
+#
+#   ASGI  views run on the worker's long-lived loop
+#   WSGI  async_to_sync runs every async view on a fresh, short-lived loop;
+#         a client bound to that loop would never be reused or closed
+#
+# send() hands the call to the client's loop and awaits the result from
+# whichever loop the caller is on. The caller's RequestStats travel in the
+# request extensions, since the hooks run on the client's thread.
+
+_lock = threading.Lock()
+_loop = None
+_client = None
+
+
+def _shared():
+    global _loop, _client
+
+    with _lock:
+        if _client is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='httpclient', daemon=True).start()
+            _client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    settings.OUTBOUND_HTTP_TIMEOUT,
+                    connect=settings.OUTBOUND_HTTP_CONNECT_TIMEOUT,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.OUTBOUND_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OUTBOUND_HTTP_MAX_KEEPALIVE,
+                ),
+                event_hooks=HTTPX_EVENT_HOOKS,
+            )
+        return _loop, _client
+
+
+async def send(method, url, **kwargs):
+    """client.request(method, url, **kwargs) on the shared client; await from any loop."""
+    loop, client = _shared()
+
+    extensions = kwargs.pop('extensions', {})
+    extensions['perf_stats'] = perf.current()
+
+    future = asyncio.run_coroutine_threadsafe(
+        client.request(method, url, extensions=extensions, **kwargs),
+        loop,
+    )
+    # Cancelling the caller cancels the request on the client's loop too
+    return await asyncio.wrap_future(future)
+
+
+def reset_clients():
+    """Forget the client inherited across fork(); its loop thread and sockets belong to the parent."""
+    global _loop, _client
+
+    with _lock:
+        _loop = _client = None
+
+
+@atexit.register
+def _close():
+    with _lock:
+        loop, client = _loop, _client
+
+    if client is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=2)
+        except Exception:
+            pass
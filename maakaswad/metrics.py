@@ -0,0 +1,158 @@
+import hmac
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from .pooling import pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================================
+# 📈 Prometheus metrics (GET /metrics)
+# ==========================================================
+# Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+# (set in gunicorn.conf.py) and a scrape, whichever worker answers it,
+# aggregates all of them. Without that variable (runserver, management
+# commands) metrics live in process memory.
+#
+# Recording is an increment on a pre-resolved child metric; anything that
+# needs a query (queue depth, online captains) is computed at scrape time.
+
+MULTIPROCESS = 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .2, .3, .5, .8, 1.0, 1.5, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    'maakaswad_http_request_duration_seconds',
+    'Request latency by URL name.',
+    ['endpoint'],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    'maakaswad_http_requests',
+    'Requests by URL name, method and status code.',
+    ['endpoint', 'method', 'status'],
+)
+
+CACHE_LOOKUPS = Counter(
+    'maakaswad_cache_lookups',
+    'Cache lookups made while serving requests.',
+    ['result'],
+)
+_CACHE_HITS = CACHE_LOOKUPS.labels(result='hit')
+_CACHE_MISSES = CACHE_LOOKUPS.labels(result='miss')
+
+DB_QUERIES = Counter('maakaswad_db_queries', 'Database queries made while serving requests.')
+
+LOCATION_UPDATES = Counter('maakaswad_driver_location_updates', 'Driver location updates accepted.')
+
+THROTTLED = Counter(
+    'maakaswad_throttled_requests',
+    'Requests refused with 429: failed-attempt buckets (by action) or the password hashing cap.',
+    ['reason'],
+)
+
+# Sampled from the worker's own pools, summed over live workers
+DB_POOL_SIZE = Gauge('maakaswad_db_pool_size', 'Open pooled connections.', ['alias'], multiprocess_mode='livesum')
+DB_POOL_AVAILABLE = Gauge('maakaswad_db_pool_available', 'Idle pooled connections.', ['alias'], multiprocess_mode='livesum')
+DB_POOL_WAITING = Gauge('maakaswad_db_pool_waiting', 'Requests waiting for a connection.', ['alias'], multiprocess_mode='livesum')
+
+POOL_SAMPLE_SECONDS = 10
+_next_pool_sample = 0.0
+
+
+def observe_request(endpoint, method, status, total_ms, stats):
+    """Called by PerformanceMiddleware once per request."""
+    endpoint = endpoint or 'unmatched'
+
+    REQUEST_LATENCY.labels(endpoint).observe(total_ms / 1000)
+    REQUESTS.labels(endpoint, method, status).inc()
+
+    if stats.db_queries:
+        DB_QUERIES.inc(stats.db_queries)
+    if stats.cache_hits:
+        _CACHE_HITS.inc(stats.cache_hits)
+    if stats.cache_misses:
+        _CACHE_MISSES.inc(stats.cache_misses)
+
+    global _next_pool_sample
+    now = time.monotonic()
+    if now >= _next_pool_sample:
+        _next_pool_sample = now + POOL_SAMPLE_SECONDS
+        _sample_pools()
+
+
+def _sample_pools():
+    for alias, stats in pool_stats().items():
+        DB_POOL_SIZE.labels(alias).set(stats.get('pool_size', 0))
+        DB_POOL_AVAILABLE.labels(alias).set(stats.get('pool_available', 0))
+        DB_POOL_WAITING.labels(alias).set(stats.get('requests_waiting', 0))
+
+
+# ----------------------------------------------------------
+# Scrape-time business gauges
+# ----------------------------------------------------------
+class BusinessCollector:
+    """Counted from the database on each scrape, so once for all workers."""
+
+    def describe(self):
+        # Lets the registry learn the names without running collect() (and
+        # its queries) at registration, i.e. at import
+        yield GaugeMetricFamily('maakaswad_business_metrics_up', '')
+        yield GaugeMetricFamily('maakaswad_pending_orders', '')
+        yield GaugeMetricFamily('maakaswad_online_captains', '')
+
+    def collect(self):
+        from orders.models import Order
+        from users.models import User
+
+        up = GaugeMetricFamily('maakaswad_business_metrics_up', 'Whether the business gauges below could be read.')
+        try:
+            pending = Order.objects.filter(status='pending').count()
+            captains = User.objects.filter(role='captain', is_online=True).count()
+        except DatabaseError:
+            logger.exception("Could not read business metrics")
+            up.add_metric([], 0)
+            yield up
+            return
+
+        up.add_metric([], 1)
+        yield up
+        yield GaugeMetricFamily('maakaswad_pending_orders', 'Orders waiting for a chef.', value=pending)
+        yield GaugeMetricFamily('maakaswad_online_captains', 'Captains currently online.', value=captains)
+
+
+_business = BusinessCollector()
+
+if not MULTIPROCESS:
+    REGISTRY.register(_business)
+
+
+def metrics_view(request):
+    token = settings.METRICS_BEARER_TOKEN
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponse(status=401)
+    elif not settings.DEBUG:
+        # Business gauges are not public: without a token there is no endpoint
+        return HttpResponse(status=404)
+
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_business)
+    else:
+        registry = REGISTRY
+
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
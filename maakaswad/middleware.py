@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import Resolver404, resolve
+
+from . import metrics, perf
+from .routers import pin_to_primary, unpin
+
+perf_logger = logging.getLogger('maakaswad.perf')
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+# ==========================================================
+# 🛢️ Read-your-writes for replica routing
+# ==========================================================
+class ReplicaRoutingMiddleware:
+    """
+    Pins reads to the primary for unsafe requests, for views that ask for it
+    and, for REPLICA_STICKY_SECONDS after a client's last write, for that
+    client's later requests. Clients are told apart by their Authorization
+    header (JWT auth runs in the view, after middleware); anonymous requests
+    never stick.
+
+    Sync and async capable, so async views under ASGI aren't funnelled
+    through a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = self.sticky_key(request)
+        writing = request.method not in SAFE_METHODS
+        pinned = writing or self.view_reads_from_primary(request) or bool(key and cache.get(key))
+
+        previous = pin_to_primary() if pinned else None
+        try:
+            response = self.get_response(request)
+        finally:
+            if pinned:
+                unpin(previous)
+
+        if writing and key:
+            cache.set(key, True, settings.REPLICA_STICKY_SECONDS)
+
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        key = self.sticky_key(request)
+        writing = request.method not in SAFE_METHODS
+        pinned = writing or self.view_reads_from_primary(request) or bool(key and await cache.aget(key))
+
+        previous = pin_to_primary() if pinned else None
+        try:
+            response = await self.get_response(request)
+        finally:
+            if pinned:
+                unpin(previous)
+
+        if writing and key:
+            await cache.aset(key, True, settings.REPLICA_STICKY_SECONDS)
+
+        return response
+
+    @staticmethod
+    def view_reads_from_primary(request):
+        """`read_from_primary` on the view (function or class) this request resolves to."""
+        try:
+            view_func = resolve(request.path_info).func
+        except Resolver404:
+            return False
+
+        view_class = getattr(view_func, 'view_class', None)
+        return getattr(view_func, 'read_from_primary', False) or getattr(view_class, 'read_from_primary', False)
+
+    @staticmethod
+    def sticky_key(request):
+        credentials = request.META.get('HTTP_AUTHORIZATION')
+        if not credentials:
+            return None
+        return 'replica-sticky:' + hashlib.sha256(credentials.encode()).hexdigest()
+
+
+# ==========================================================
+# ⏱️ Per-request performance instrumentation
+# ==========================================================
+class PerformanceMiddleware:
+    """
+    Measures each request (see maakaswad.perf) and reports it:
+
+      - a Server-Timing header (PERF_SERVER_TIMING): total, db, cache,
+        render, http and app (the rest: Python in views and serializers)
+      - a JSON log line on 'maakaswad.perf' for PERF_LOG_SAMPLE_RATE of
+        requests, and always (at WARNING) for requests over their budget:
+        PERF_BUDGETS_MS[url name], else PERF_DEFAULT_BUDGET_MS
+      - Prometheus metrics (maakaswad.metrics) for every request
+
+    Keep it first in MIDDLEWARE so the total covers the whole stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats, token = perf.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            perf.end_request(token)
+
+        self.report(request, response, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats, token = perf.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            perf.end_request(token)
+
+        self.report(request, response, stats)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses render after the view; time it here (render() is a
+        # no-op when Django calls it again)
+        stats = perf.current()
+        if stats is not None and not response.is_rendered:
+            start = time.perf_counter()
+            response.render()
+            stats.render_ms += (time.perf_counter() - start) * 1000
+        return response
+
+    def report(self, request, response, stats):
+        total_ms = stats.total_ms()
+        app_ms = max(total_ms - stats.db_ms - stats.render_ms - stats.http_ms, 0.0)
+
+        if settings.PERF_SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                f'total;dur={total_ms:.1f}',
+                f'db;dur={stats.db_ms:.1f};desc="{stats.db_queries} queries"',
+                f'cache;desc="{stats.cache_hits} hits {stats.cache_misses} misses"',
+                f'render;dur={stats.render_ms:.1f}',
+                f'http;dur={stats.http_ms:.1f};desc="{stats.http_calls} calls"',
+                f'app;dur={app_ms:.1f}',
+            ])
+
+        match = request.resolver_match
+        endpoint = (match.url_name or match.view_name) if match else None
+        metrics.observe_request(endpoint, request.method, str(response.status_code), total_ms, stats)
+
+        budget_ms = settings.PERF_BUDGETS_MS.get(endpoint, settings.PERF_DEFAULT_BUDGET_MS)
+        over_budget = total_ms > budget_ms
+
+        if not over_budget and random.random() >= settings.PERF_LOG_SAMPLE_RATE:
+            return
+
+        perf_logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            json.dumps({
+                'endpoint': endpoint,
+                'app': match.func.__module__.split('.')[0] if match else None,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'total_ms': round(total_ms, 1),
+                'db_queries': stats.db_queries,
+                'db_ms': round(stats.db_ms, 1),
+                'cache_hits': stats.cache_hits,
+                'cache_misses': stats.cache_misses,
+                'render_ms': round(stats.render_ms, 1),
+                'http_calls': stats.http_calls,
+                'http_ms': round(stats.http_ms, 1),
+                'app_ms': round(app_ms, 1),
+                'budget_ms': budget_ms,
+                'over_budget': over_budget,
+            }),
+        )
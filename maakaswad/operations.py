@@ -0,0 +1,61 @@
+from django.db import NotSupportedError
+from django.db.migrations.operations import AddIndex, RemoveIndex
+
+
+# ==========================================================
+# 🗂️ Concurrent index migrations
+# ==========================================================
+# On PostgreSQL these run CREATE / DROP INDEX CONCURRENTLY, so adding an
+# index to a live table never takes a write lock. Other backends (SQLite in
+# development) get a plain CREATE / DROP INDEX.
+#
+# Migrations using them must set `atomic = False`. If a concurrent build
+# fails, PostgreSQL leaves an INVALID index behind: drop it and re-run the
+# migration.
+
+def _concurrently(schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return {}
+
+    if schema_editor.connection.in_atomic_block:
+        raise NotSupportedError(
+            "Concurrent index operations cannot run inside a transaction "
+            "(set atomic = False on the migration)."
+        )
+    return {'concurrently': True}
+
+
+class AddIndexConcurrently(AddIndex):
+    atomic = False
+
+    def describe(self):
+        return "Concurrently create index %s on model %s" % (self.index.name, self.model_name)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, **_concurrently(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, **_concurrently(schema_editor))
+
+
+class RemoveIndexConcurrently(RemoveIndex):
+    atomic = False
+
+    def describe(self):
+        return "Concurrently remove index %s from %s" % (self.name, self.model_name)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = from_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            schema_editor.remove_index(model, index, **_concurrently(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = to_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            schema_editor.add_index(model, index, **_concurrently(schema_editor))
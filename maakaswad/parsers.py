@@ -0,0 +1,34 @@
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer, orjson
+
+
+# ==========================================================
+# ⚡ orjson Parser
+# ==========================================================
+# Drop-in replacement for DRF's JSONParser. orjson only reads UTF-8, so
+# other request encodings use the stock parser; bodies orjson rejects are
+# re-parsed by the stock parser too, so accepted input and error handling
+# stay the same.
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+
+        return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,116 @@
+import time
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+# ==========================================================
+# ⏱️ Per-request performance counters
+# ==========================================================
+# PerformanceMiddleware puts a RequestStats in a context variable for the
+# duration of each request; the hooks below add to it:
+#
+#   db      every query on every alias (execute wrapper, see below)
+#   cache   hits / misses of the instrumented cache backends (maakaswad.cache)
+#   render  DRF response rendering (timed by the middleware)
+#   http    outbound calls through maakaswad.httpclient
+#
+# Outside a request (management commands, shell) the hooks are a single
+# context variable lookup.
+
+_current = ContextVar('request_perf_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = (
+        'started', 'db_queries', 'db_ms', 'cache_hits', 'cache_misses',
+        'render_ms', 'http_calls', 'http_ms',
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.render_ms = 0.0
+        self.http_calls = 0
+        self.http_ms = 0.0
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+
+def start_request():
+    # Connections opened before this module was imported never got the
+    # wrapper from connection_created
+    for connection in connections.all(initialized_only=True):
+        _install_query_wrapper(None, connection)
+
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+# ----------------------------------------------------------
+# DB: execute wrapper on every connection
+# ----------------------------------------------------------
+def _record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_ms += (time.perf_counter() - start) * 1000
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    # Fires on every (re)connect of the same wrapper object
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(_install_query_wrapper, dispatch_uid='maakaswad.perf.query_wrapper')
+
+
+# ----------------------------------------------------------
+# Cache / outbound HTTP
+# ----------------------------------------------------------
+def record_cache(hit):
+    stats = _current.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+async def _http_request_started(request):
+    request.extensions['perf_started'] = time.perf_counter()
+
+
+async def _http_response_received(response):
+    # Set by httpclient.send(): the hooks run on the client's own thread
+    stats = response.request.extensions.get('perf_stats') or _current.get()
+    started = response.request.extensions.get('perf_started')
+    if stats is not None and started is not None:
+        stats.http_calls += 1
+        stats.http_ms += (time.perf_counter() - started) * 1000
+
+
+HTTPX_EVENT_HOOKS = {
+    'request': [_http_request_started],
+    'response': [_http_response_received],
+}
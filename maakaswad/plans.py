@@ -0,0 +1,17 @@
+import re
+
+from django.db import connection
+
+
+# ==========================================================
+# 🔍 Query plans
+# ==========================================================
+# Shared by the index tests (orders/tests/test_query_plans.py) and the
+# bench commands that check their probes stay on an index.
+
+def sequential_scans(plan):
+    """Tables read with a full scan in an EXPLAIN plan (PostgreSQL or SQLite)."""
+    if connection.vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    # SQLite: 'SCAN table' (full scan) vs 'SEARCH table USING INDEX ...'
+    return re.findall(r'\bSCAN (\w+)\b(?! USING)', plan)
@@ -0,0 +1,35 @@
+import os
+
+from django.db import connections
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+# ==========================================================
+# 🛢️ Connection pool metrics
+# ==========================================================
+def pool_stats():
+    """
+    psycopg_pool statistics for every pooled database alias of this process
+    (pool_size, pool_available, requests_waiting, requests_wait_ms,
+    connections_errors, ...). Aliases without ?pool=true are left out.
+    """
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is not None:
+            stats[alias] = pool.get_stats()
+    return stats
+
+
+class DatabasePoolStatsView(APIView):
+    """Pools are per worker process: this reports the worker that answered."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "pid": os.getpid(),
+            "pools": pool_stats(),
+        })
@@ -0,0 +1,57 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib renderer
+    orjson = None
+
+
+# ==========================================================
+# ⚡ orjson Renderer
+# ==========================================================
+# Drop-in replacement for DRF's JSONRenderer with the default settings
+# (UNICODE_JSON, COMPACT_JSON, STRICT_JSON): types orjson doesn't know
+# (Decimal, lazy strings, timedelta, QuerySet, ...) go through DRF's own
+# JSONEncoder.default, and anything orjson rejects (e.g. integers wider
+# than 64 bits, ?indent=) is re-rendered by the stock renderer.
+#
+# Output is the same bytes except for floats, which only come from
+# FloatFields (today just User.rating) or hand-built dicts:
+#   - very small or large floats are spelled differently but parse to the
+#     same value: 1e16 / 1e-7 / 0.00001 here, 1e+16 / 1e-07 / 1e-05 from
+#     the stdlib;
+#   - NaN and Infinity render as null, where the stock renderer raises
+#     ValueError under STRICT_JSON (a 500).
+# Views that must reject non-finite floats should use JSONRenderer.
+
+_drf_encoder = encoders.JSONEncoder()
+
+ORJSON_OPTIONS = (
+    orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same \u2028 / \u2029 escaping as JSONRenderer (strict JS subset)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+        return ret
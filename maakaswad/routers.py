@@ -0,0 +1,79 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# ==========================================================
+# 🛢️ Primary / replica routing
+# ==========================================================
+# Writes always go to `default`. Reads go to a random replica
+# (DATABASE_REPLICAS) unless the current request or block is pinned to the
+# primary:
+#
+#   - unsafe requests (POST/PUT/PATCH/DELETE), for their whole duration
+#   - a client's requests for REPLICA_STICKY_SECONDS after it wrote
+#     (read-your-writes, see ReplicaRoutingMiddleware)
+#   - views with `read_from_primary = True` or @read_from_primary
+#   - `with primary():` blocks
+#   - anything inside transaction.atomic() on the primary
+
+_pinned = ContextVar('db_pinned_to_primary', default=False)
+
+
+def pinned_to_primary():
+    return _pinned.get()
+
+
+def pin_to_primary():
+    """Pins reads to the primary; returns the previous state for unpin()."""
+    previous = _pinned.get()
+    _pinned.set(True)
+    return previous
+
+
+def unpin(previous=False):
+    _pinned.set(previous)
+
+
+@contextmanager
+def primary():
+    previous = pin_to_primary()
+    try:
+        yield
+    finally:
+        unpin(previous)
+
+
+def read_from_primary(view):
+    """Marks a function view (or view class) as needing fresh reads."""
+    view.read_from_primary = True
+    return view
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+
+        if (
+            not replicas or
+            _pinned.get() or
+            connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get schema changes through replication
+        return db == DEFAULT_DB_ALIAS
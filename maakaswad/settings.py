@@ -62,6 +62,9 @@ AUTHENTICATION_BACKENDS = [
 # 🔐 Middleware
 # =========================
 MIDDLEWARE = [
+    # ⏱️ first, so its timings cover the whole stack
+    'maakaswad.middleware.PerformanceMiddleware',
+
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -69,6 +72,9 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
 
+    # 🛢️ primary/replica read-your-writes
+    'maakaswad.middleware.ReplicaRoutingMiddleware',
+
     # CSRF disabled for API-based mobile apps
     # 'django.middleware.csrf.CsrfViewMiddleware',
 
@@ -77,6 +83,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# ASGI mode (set by maakaswad/asgi.py): WhiteNoise's middleware is sync-only
+# and would funnel every async view through one thread, so it is left out;
+# /static/ is then served by the route in maakaswad/urls.py.
+ASGI_MODE = os.environ.get('DJANGO_ASGI', 'False') == 'True'
+
+if ASGI_MODE:
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
 # =========================
 # 🌐 CORS Settings
 # =========================
@@ -104,20 +118,103 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'maakaswad.wsgi.application'
+ASGI_APPLICATION = 'maakaswad.asgi.application'
 
 # =========================
 # 🛢️ Database
 # =========================
+# Pooled mode (PostgreSQL, psycopg 3): add ?pool=true to the URL, and
+# optionally pool_min_size, pool_max_size, pool_timeout (seconds to wait for
+# a free connection), pool_max_idle, pool_max_lifetime, pool_max_waiting.
+# Each gunicorn worker process gets its own pool shared by its threads, so
+# workers * pool_max_size must stay under Postgres max_connections.
+# Without ?pool, connections persist per thread for 10 minutes.
+DATABASE_POOL_OPTIONS = {
+    'min_size': int,
+    'max_size': int,
+    'timeout': float,
+    'max_idle': float,
+    'max_lifetime': float,
+    'max_waiting': int,
+}
+
+
+def database_config(url, alias):
+    config = dj_database_url.parse(url, conn_max_age=600)
+    options = config.setdefault('OPTIONS', {})
+
+    # dj-database-url may hand the value over as a bool, an int or the raw
+    # string, and "false" is truthy
+    pooled = str(options.pop('pool', False)).lower() in ('1', 'true', 'yes', 'on')
+    pool_options = {
+        name: cast(options.pop(f'pool_{name}'))
+        for name, cast in DATABASE_POOL_OPTIONS.items()
+        if f'pool_{name}' in options
+    }
+
+    if pooled and config['ENGINE'] == 'django.db.backends.postgresql':
+        options['pool'] = {
+            'name': alias,
+            'min_size': 2,
+            'max_size': 10,
+            'timeout': 10,
+            **pool_options,
+        }
+        # The pool owns connection lifetime
+        config['CONN_MAX_AGE'] = 0
+        # For a pooled alias Django turns this into
+        # ConnectionPool(check=ConnectionPool.check_connection): each
+        # connection is tested as the pool hands it out. (Passing 'check' in
+        # the pool options instead clashes with that keyword and fails.)
+        config['CONN_HEALTH_CHECKS'] = True
+
+    return config
+
+
 DATABASES = {
-    'default': dj_database_url.config(
-        default=os.environ.get(
-            'DATABASE_URL',
-            f"sqlite:///{BASE_DIR / 'db.sqlite3'}"
-        ),
-        conn_max_age=600
+    'default': database_config(
+        os.environ.get('DATABASE_URL', f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+        'default'
     )
 }
 
+# Read replicas: comma-separated URLs. Safe reads are spread over them by
+# maakaswad.routers.PrimaryReplicaRouter; each client's reads stay on the
+# primary for REPLICA_STICKY_SECONDS after it writes. Locally, pointing a
+# replica at the same SQLite file (or a second one) exercises the routing.
+DATABASE_REPLICAS = []
+
+for index, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(','))):
+    alias = f'replica_{index + 1}'
+    DATABASES[alias] = database_config(url.strip(), alias)
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['maakaswad.routers.PrimaryReplicaRouter']
+
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+# =========================
+# ⚡ Cache
+# =========================
+# Shared Redis cache when REDIS_URL is set (needed with several gunicorn
+# workers, so invalidation reaches every process); in-process otherwise.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'maakaswad.cache.InstrumentedRedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'maakaswad.cache.InstrumentedLocMemCache',
+        }
+    }
+
 # =========================
 # 🔐 Password Validators
 # =========================
@@ -147,21 +244,44 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Resumable KYC document uploads (users/uploads.py). Chunks are written to
+# UPLOAD_SESSION_DIR, which every web worker must share (same volume as
+# MEDIA_ROOT, so a finished file is moved into storage rather than copied).
+# A document is at most UPLOAD_MAX_BYTES, sent in chunks of at most
+# UPLOAD_CHUNK_MAX_BYTES; sessions idle for UPLOAD_SESSION_TTL_HOURS are
+# purged by manage.py sweep
+UPLOAD_SESSION_DIR = os.environ.get('UPLOAD_SESSION_DIR', str(BASE_DIR / "upload-sessions"))
+UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', 10 * 1024 * 1024))
+UPLOAD_CHUNK_MAX_BYTES = int(os.environ.get('UPLOAD_CHUNK_MAX_BYTES', 1024 * 1024))
+UPLOAD_SESSION_TTL_HOURS = int(os.environ.get('UPLOAD_SESSION_TTL_HOURS', 24))
+
 # =========================
 # ⭐ REST Framework (JWT)
 # =========================
+# ⚡ orjson-backed JSON renderer/parser (same output as DRF's stock ones
+# apart from float spelling and NaN, see maakaswad/renderers.py).
+# Set DJANGO_FAST_JSON=False to go back to the stdlib json module.
+FAST_JSON = os.environ.get('DJANGO_FAST_JSON', 'True') == 'True'
+
+# Reverse proxies in front of gunicorn (the platform router: 1). DRF takes
+# the client IP for throttling from that many hops into X-Forwarded-For;
+# left unset it would trust the whole client-supplied header. 0 means no
+# proxy: REMOTE_ADDR is used.
+NUM_PROXIES = int(os.environ.get('NUM_PROXIES', 1))
+
 REST_FRAMEWORK = {
+    'NUM_PROXIES': NUM_PROXIES,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'maakaswad.renderers.ORJSONRenderer' if FAST_JSON else 'rest_framework.renderers.JSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'maakaswad.parsers.ORJSONParser' if FAST_JSON else 'rest_framework.parsers.JSONParser',
         'rest_framework.parsers.MultiPartParser',  # ⭐ for image upload
         'rest_framework.parsers.FormParser',
     ],
@@ -176,12 +296,123 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Tokens carry role / is_approved / token_version (users/authentication.py).
+# Each worker trusts its cached copy of a user's current version this long;
+# with Redis a bump is seen everywhere at once, with the local-memory cache
+# other workers may honour stale claims for up to this window.
+JWT_CLAIMS_VERSION_CACHE_SECONDS = int(os.environ.get('JWT_CLAIMS_VERSION_CACHE_SECONDS', 300))
+
+# =========================
+# 🔐 Password hashing & login throttling
+# =========================
+# Concurrent password hashes per worker process, and how many more may wait
+# before sign-ins get a 429 (users/hashing.py)
+PASSWORD_HASHING_CONCURRENCY = int(os.environ.get('PASSWORD_HASHING_CONCURRENCY', 1))
+PASSWORD_HASHING_QUEUE = int(os.environ.get('PASSWORD_HASHING_QUEUE', 4))
+
+# Failed login / reset attempts allowed per identifier and per client IP;
+# an exhausted allowance refills fully over LOGIN_FAILURE_REFILL_SECONDS
+# (users/throttling.py)
+LOGIN_FAILURES_PER_IDENTIFIER = int(os.environ.get('LOGIN_FAILURES_PER_IDENTIFIER', 5))
+LOGIN_FAILURES_PER_IP = int(os.environ.get('LOGIN_FAILURES_PER_IP', 50))
+LOGIN_FAILURE_REFILL_SECONDS = int(os.environ.get('LOGIN_FAILURE_REFILL_SECONDS', 900))
+
+# =========================
+# 🔑 Google sign-in
+# =========================
+# OAuth client ids (web / Android / iOS) whose ID tokens social login accepts
+GOOGLE_CLIENT_IDS = [client for client in os.environ.get('GOOGLE_CLIENT_IDS', '').split(',') if client]
+GOOGLE_JWKS_URL = os.environ.get('GOOGLE_JWKS_URL', 'https://www.googleapis.com/oauth2/v3/certs')
+GOOGLE_USERINFO_URL = os.environ.get('GOOGLE_USERINFO_URL', 'https://www.googleapis.com/oauth2/v3/userinfo')
+# Key set refresh interval when Google's response carries no max-age
+GOOGLE_JWKS_REFRESH_SECONDS = int(os.environ.get('GOOGLE_JWKS_REFRESH_SECONDS', 3600))
+# Verified tokens are remembered this long (a revoked access token keeps working until then)
+GOOGLE_TOKEN_CACHE_SECONDS = int(os.environ.get('GOOGLE_TOKEN_CACHE_SECONDS', 300))
+
 # =========================
 # 💳 Razorpay
 # =========================
 RAZORPAY_KEY_ID = os.environ.get('RAZORPAY_KEY_ID', '')
 RAZORPAY_KEY_SECRET = os.environ.get('RAZORPAY_KEY_SECRET', '')
 
+# =========================
+# 🌐 Outbound HTTP (Google, Razorpay)
+# =========================
+# Shared async client, see maakaswad/httpclient.py (seconds / connections)
+OUTBOUND_HTTP_TIMEOUT = float(os.environ.get('OUTBOUND_HTTP_TIMEOUT', 10))
+OUTBOUND_HTTP_CONNECT_TIMEOUT = float(os.environ.get('OUTBOUND_HTTP_CONNECT_TIMEOUT', 5))
+OUTBOUND_HTTP_MAX_CONNECTIONS = int(os.environ.get('OUTBOUND_HTTP_MAX_CONNECTIONS', 500))
+OUTBOUND_HTTP_MAX_KEEPALIVE = int(os.environ.get('OUTBOUND_HTTP_MAX_KEEPALIVE', 100))
+
+# =========================
+# 🗄️ Order Archive
+# =========================
+# Delivered / cancelled orders older than this move to the archive tables
+# (manage.py archive_orders). Minimum 8 days: earnings windows read the hot table.
+ORDER_ARCHIVE_AFTER_DAYS = int(os.environ.get('ORDER_ARCHIVE_AFTER_DAYS', 30))
+
+# =========================
+# 🧹 Sweeper (manage.py sweep)
+# =========================
+# Pending orders no chef accepted within this window are auto-cancelled
+ORDER_PENDING_SLA_MINUTES = int(os.environ.get('ORDER_PENDING_SLA_MINUTES', 45))
+# Carts untouched for this long are deleted with their items
+CART_IDLE_DAYS = int(os.environ.get('CART_IDLE_DAYS', 14))
+
+# =========================
+# 👩‍🍳 Kitchen Board
+# =========================
+# Upper bound on staleness; order transitions invalidate the board right away
+KITCHEN_BOARD_CACHE_SECONDS = int(os.environ.get('KITCHEN_BOARD_CACHE_SECONDS', 60))
+
+# =========================
+# ⏱️ Performance instrumentation (maakaswad.middleware.PerformanceMiddleware)
+# =========================
+PERF_SERVER_TIMING = os.environ.get('PERF_SERVER_TIMING', 'True') == 'True'
+# Share of requests logged to 'maakaswad.perf'; over-budget ones always are
+PERF_LOG_SAMPLE_RATE = float(os.environ.get('PERF_LOG_SAMPLE_RATE', 0.01))
+PERF_DEFAULT_BUDGET_MS = int(os.environ.get('PERF_DEFAULT_BUDGET_MS', 500))
+# Per URL name
+PERF_BUDGETS_MS = {
+    # orders
+    'user-orders': 200,
+    'order-detail': 100,
+    'track-order': 100,
+    'chef-orders': 200,
+    'chef-kitchen-board': 100,
+    'captain-orders': 200,
+    'captain-dashboard': 250,
+    'place-order': 400,
+    # food
+    'category-list': 100,
+    'fooditem-list': 200,
+    'fooditem-detail': 100,
+    # users (password hashing and Google round trips are slow by design)
+    'login': 800,
+    'partner-login': 800,
+    'register': 800,
+    'social-login': 1500,
+    'profile': 100,
+}
+
+# =========================
+# 📈 Prometheus (GET /metrics)
+# =========================
+# Scrapes must send "Authorization: Bearer <token>". Unset, /metrics is
+# only served with DEBUG on (404 otherwise)
+METRICS_BEARER_TOKEN = os.environ.get('METRICS_BEARER_TOKEN', '')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'maakaswad.perf': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 # =========================
 # 📬 Email Setup
 # =========================
@@ -197,6 +428,16 @@ else:
 
 DEFAULT_FROM_EMAIL = "no-reply@maakaswad.com"
 
+# SMTP socket timeout, seconds (the outbox worker is the only sender)
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 10))
+
+# Outbox delivery (users/outbox.py, manage.py deliver_emails): a failed
+# message retries after EMAIL_OUTBOX_RETRY_SECONDS, doubling each time up to
+# EMAIL_OUTBOX_MAX_RETRY_SECONDS, and is given up after EMAIL_OUTBOX_MAX_ATTEMPTS
+EMAIL_OUTBOX_RETRY_SECONDS = int(os.environ.get('EMAIL_OUTBOX_RETRY_SECONDS', 30))
+EMAIL_OUTBOX_MAX_RETRY_SECONDS = int(os.environ.get('EMAIL_OUTBOX_MAX_RETRY_SECONDS', 3600))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 8))
+
 # =========================
 # 🔧 Default Auto Field
 # =========================
@@ -0,0 +1,196 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+# ==========================================================
+# ✂️ Sparse fieldsets: ?fields= and ?expand=
+# ==========================================================
+#
+#   ?fields=id,status,total_amount      only these fields
+#   ?fields=id,items.quantity           dotted paths prune nested serializers
+#   ?expand=category                    swap a relation listed in
+#                                       Meta.expandable_fields for its
+#                                       nested object (dotted paths work too)
+#
+# Only read (GET/HEAD/OPTIONS) requests are shaped; writes always see the
+# full serializer. Views using SparseFieldsViewMixin also trim the
+# queryset to match: unused columns are deferred, unused joins/prefetches
+# dropped and joins needed by expanded relations added.
+#
+# Fields with source='*' (SerializerMethodField) declare the ORM paths they
+# read in Meta.sparse_sources; without it the queryset is left untouched.
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def sparse_requested(request):
+    return (
+        request.method in SAFE_METHODS and
+        (FIELDS_PARAM in request.query_params or EXPAND_PARAM in request.query_params)
+    )
+
+
+def parse_spec(value):
+    """'id,items.quantity,items.id' -> {'id': {}, 'items': {'quantity': {}, 'id': {}}}"""
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsMixin:
+    """Serializer mixin applying ?fields= / ?expand= to its fields."""
+
+    sparse_applied = False
+
+    def _sparse_spec(self):
+        # Set by the parent serializer for nested serializers
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields, self._sparse_expand
+
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return None, None
+
+        request = self.context.get('request')
+        if request is None or not sparse_requested(request):
+            return None, None
+
+        params = request.query_params
+        only = parse_spec(params[FIELDS_PARAM]) if params.get(FIELDS_PARAM) else None
+        expand = parse_spec(params[EXPAND_PARAM]) if params.get(EXPAND_PARAM) else None
+        return only, expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._sparse_spec()
+
+        if only is None and expand is None:
+            return fields
+
+        self.sparse_applied = True
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+
+        for name in (expand or {}):
+            if name in expandable and name in fields:
+                fields[name] = expandable[name](read_only=True)
+
+        if only is not None:
+            fields = {name: field for name, field in fields.items() if name in only}
+
+        for name, field in fields.items():
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, SparseFieldsMixin):
+                nested._sparse_fields = (only or {}).get(name) or None
+                nested._sparse_expand = (expand or {}).get(name) or None
+
+        return fields
+
+
+class SparseFieldsViewMixin:
+    """Generic view mixin trimming the queryset to the requested fields."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return prune_queryset(queryset, self.get_serializer())
+
+
+def _select_related_paths(tree, prefix=''):
+    for name, subtree in tree.items():
+        if subtree:
+            yield from _select_related_paths(subtree, f'{prefix}{name}__')
+        else:
+            yield f'{prefix}{name}'
+
+
+def _model_field(opts, name):
+    try:
+        return opts.get_field(name)
+    except FieldDoesNotExist:
+        # Reverse relations are looked up by query name; serializers use the
+        # accessor (e.g. 'cartitem_set')
+        for relation in opts.related_objects:
+            if relation.get_accessor_name() == name:
+                return relation
+        raise
+
+
+def prune_queryset(queryset, serializer):
+    serializer = getattr(serializer, 'child', serializer)
+    fields = serializer.fields
+
+    if not serializer.sparse_applied:
+        return queryset
+
+    opts = queryset.model._meta
+    sources = getattr(serializer.Meta, 'sparse_sources', {})
+
+    columns = {opts.pk.name}
+    joins = set()
+    prefetches = set()
+
+    for name, field in fields.items():
+        if field.source == '*':
+            if name not in sources:
+                return queryset
+            paths = sources[name]
+        else:
+            paths = ['__'.join(field.source_attrs)]
+
+        for path in paths:
+            head, _, rest = path.partition('__')
+
+            try:
+                model_field = _model_field(opts, head)
+            except FieldDoesNotExist:
+                # Model property or method: can't tell what it reads
+                return queryset
+
+            if not model_field.is_relation:
+                columns.add(head)
+            elif model_field.concrete and (model_field.many_to_one or model_field.one_to_one):
+                columns.add(head)
+                if rest or not isinstance(field, serializers.PrimaryKeyRelatedField):
+                    joins.add(head)
+            else:
+                prefetches.add(head)
+
+    select_related = queryset.query.select_related
+    existing_joins = (
+        list(_select_related_paths(select_related))
+        if isinstance(select_related, dict) else []
+    )
+    kept_joins = [path for path in existing_joins if path.split('__')[0] in joins]
+    kept_joins += sorted(joins - {path.split('__')[0] for path in kept_joins})
+
+    kept_prefetches = []
+    for lookup in queryset._prefetch_related_lookups:
+        through = lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+        if through.split('__')[0] in prefetches:
+            kept_prefetches.append(lookup)
+    kept_prefetches += sorted(
+        prefetches - {
+            (lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup).split('__')[0]
+            for lookup in kept_prefetches
+        }
+    )
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if kept_joins:
+        queryset = queryset.select_related(*kept_joins)
+    if kept_prefetches:
+        queryset = queryset.prefetch_related(*kept_prefetches)
+
+    deferred = [f.name for f in opts.concrete_fields if f.name not in columns]
+    if deferred:
+        queryset = queryset.defer(*deferred)
+
+    return queryset
@@ -5,6 +5,9 @@ from django.conf.urls.static import static
 from django.http import JsonResponse
 from django.views.static import serve
 
+from .metrics import metrics_view
+from .pooling import DatabasePoolStatsView
+
 def health_check(request):
     return JsonResponse({"status": "ok", "message": "Maakaswad backend running!"})
 
@@ -13,6 +16,8 @@ urlpatterns = [
 
     # Global health check
     path('', health_check),
+    path('health/db-pool/', DatabasePoolStatsView.as_view(), name='db-pool-stats'),
+    path('metrics', metrics_view, name='metrics'),
 
     # Apps
     path('api/users/', include('users.urls')),
@@ -1,28 +1,35 @@
 ﻿from django.contrib import admin
-from .models import Order, OrderItem, DeliveryAddress
+from .kitchen import invalidate_kitchen_board
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem, DeliveryAddress
 
 
 # ---------------------------
 # ✅ ADMIN ACTIONS
 # ---------------------------
+def _set_status(queryset, status):
+    chef_ids = set(queryset.values_list("assigned_chef_id", flat=True))
+    queryset.update(status=status)
+    invalidate_kitchen_board(*chef_ids)
+
+
 @admin.action(description="Accept Selected Orders (Processing)")
 def accept_orders(modeladmin, request, queryset):
-    queryset.update(status="processing")
+    _set_status(queryset, "processing")
 
 
 @admin.action(description="Mark as Out for Delivery")
 def mark_out_for_delivery(modeladmin, request, queryset):
-    queryset.update(status="out_for_delivery")
+    _set_status(queryset, "out_for_delivery")
 
 
 @admin.action(description="Mark as Delivered")
 def mark_delivered(modeladmin, request, queryset):
-    queryset.update(status="delivered")
+    _set_status(queryset, "delivered")
 
 
 @admin.action(description="Reject / Cancel Selected Orders")
 def reject_orders(modeladmin, request, queryset):
-    queryset.update(status="cancelled")
+    _set_status(queryset, "cancelled")
 
 
 # ---------------------------
@@ -62,3 +69,28 @@ class DeliveryAddressAdmin(admin.ModelAdmin):
     list_display = ('user', 'full_name', 'address', 'city', 'pincode')
     search_fields = ('user__username', 'city', 'pincode', 'address')
     list_filter = ('city',)
+
+
+# ---------------------------
+# 🗄️ ARCHIVED ORDERS (read-only)
+# ---------------------------
+class ArchivedOrderItemInline(admin.TabularInline):
+    model = ArchivedOrderItem
+    extra = 0
+    can_delete = False
+    readonly_fields = ('food_item', 'quantity')
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'status', 'total_amount', 'created_at', 'archived_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('user__email', 'id')
+    ordering = ('-created_at',)
+    inlines = [ArchivedOrderItemInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,157 @@
+from decimal import Decimal
+
+from django.utils import timezone
+
+
+# ==========================================================
+# ⚡ Fast path for OrderSerializer (list endpoints)
+# ==========================================================
+# Builds the exact OrderSerializer payload from two .values() queries
+# (orders + items) without instantiating models or running DRF fields.
+# Every value is already a JSON primitive, so the renderer never has to
+# fall back to its Decimal/datetime encoder.
+#
+# Keep in sync with OrderSerializer / OrderItemSerializer /
+# DeliveryAddressSerializer and User.__str__.
+
+ORDER_COLUMNS = (
+    'id',
+    'user__email',
+    'user__role',
+    'assigned_chef_id',
+    'assigned_chef__email',
+    'assigned_chef__role',
+    'assigned_captain_id',
+    'assigned_captain__email',
+    'assigned_captain__role',
+    'delivery_address_id',
+    'delivery_address__full_name',
+    'delivery_address__address',
+    'delivery_address__city',
+    'delivery_address__pincode',
+    'delivery_address__phone',
+    'delivery_address__latitude',
+    'delivery_address__longitude',
+    'created_at',
+    'status',
+    'total_amount',
+    'driver_latitude',
+    'driver_longitude',
+    'pickup_latitude',
+    'pickup_longitude',
+)
+
+ITEM_COLUMNS = (
+    'id',
+    'order_id',
+    'food_item_id',
+    'food_item__name',
+    'food_item__price',
+    'quantity',
+)
+
+_CENTS = Decimal('0.01')
+_MICRO_DEGREES = Decimal('0.000001')
+
+
+def decimal_str(value, quantum):
+    """Same string DRF's DecimalField renders (COERCE_DECIMAL_TO_STRING)."""
+    if value is None:
+        return None
+    return '{:f}'.format(value.quantize(quantum))
+
+
+def datetime_str(value):
+    """Same string DRF's DateTimeField renders (ISO 8601, current timezone)."""
+    if not value:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _user_str(email, role):
+    # Mirrors User.__str__
+    return f"{email} ({role})"
+
+
+def _location(lat, lng):
+    if lat and lng:
+        return {"latitude": float(lat), "longitude": float(lng)}
+    return None
+
+
+def encode_orders(queryset):
+    """
+    Serialize an Order (or ArchivedOrder) queryset to the
+    OrderSerializer(many=True) payload. Filtering, ordering and distinct()
+    on the queryset are preserved.
+    """
+    rows = list(queryset.prefetch_related(None).values(*ORDER_COLUMNS))
+    item_model = queryset.model._meta.get_field('items').related_model
+
+    items_by_order = {}
+    if rows:
+        items = item_model.objects.filter(
+            order_id__in=[row['id'] for row in rows]
+        ).values(*ITEM_COLUMNS)
+
+        for item in items:
+            items_by_order.setdefault(item['order_id'], []).append({
+                'id': item['id'],
+                'food_item': item['food_item_id'],
+                'food_item_name': item['food_item__name'],
+                'food_item_price': decimal_str(item['food_item__price'], _CENTS),
+                'quantity': item['quantity'],
+            })
+
+    return [encode_order_row(row, items_by_order.get(row['id'], [])) for row in rows]
+
+
+def encode_order_row(row, items):
+    if row['delivery_address_id'] is None:
+        delivery_address = None
+        destination = None
+    else:
+        lat = row['delivery_address__latitude']
+        lng = row['delivery_address__longitude']
+        delivery_address = {
+            'id': row['delivery_address_id'],
+            'full_name': row['delivery_address__full_name'],
+            'address': row['delivery_address__address'],
+            'city': row['delivery_address__city'],
+            'pincode': row['delivery_address__pincode'],
+            'phone': row['delivery_address__phone'],
+            'latitude': decimal_str(lat, _MICRO_DEGREES),
+            'longitude': decimal_str(lng, _MICRO_DEGREES),
+        }
+        destination = _location(lat, lng)
+
+    pickup_lat = row['pickup_latitude']
+    pickup_lng = row['pickup_longitude']
+    if pickup_lat is not None and pickup_lng is not None:
+        pickup_location = {"latitude": float(pickup_lat), "longitude": float(pickup_lng)}
+    else:
+        pickup_location = None
+
+    return {
+        'id': row['id'],
+        'user': _user_str(row['user__email'], row['user__role']),
+        'assigned_chef': (
+            _user_str(row['assigned_chef__email'], row['assigned_chef__role'])
+            if row['assigned_chef_id'] is not None else None
+        ),
+        'assigned_captain': (
+            _user_str(row['assigned_captain__email'], row['assigned_captain__role'])
+            if row['assigned_captain_id'] is not None else None
+        ),
+        'delivery_address': delivery_address,
+        'created_at': datetime_str(row['created_at']),
+        'status': row['status'],
+        'total_amount': decimal_str(row['total_amount'], _CENTS),
+        'driver_location': _location(row['driver_latitude'], row['driver_longitude']),
+        'pickup_location': pickup_location,
+        'destination': destination,
+        'items': items,
+    }
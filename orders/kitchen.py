@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min, Q, Sum
+from django.utils.timezone import now
+
+from .encoders import datetime_str
+from .models import Order, OrderItem
+
+
+# ==========================================================
+# 👩‍🍳 Kitchen board: what a chef has to cook right now
+# ==========================================================
+# Built from two queries, items grouped by food item and one conditional
+# aggregate over the orders (per-status counts, oldest order), and cached
+# per chef. Every view that moves one of the chef's orders calls
+# invalidate_kitchen_board(); the TTL only bounds staleness for writes that
+# bypass the views.
+
+KITCHEN_STATUSES = ('accepted', 'preparing')
+
+
+def _cache_key(chef_id):
+    return f'kitchen-board:{chef_id}'
+
+
+def build_kitchen_board(chef_id):
+    orders = Order.objects.filter(assigned_chef_id=chef_id, status__in=KITCHEN_STATUSES)
+
+    items = (
+        OrderItem.objects.filter(
+            order__assigned_chef_id=chef_id,
+            order__status__in=KITCHEN_STATUSES,
+        )
+        .values('food_item_id', 'food_item__name')
+        .annotate(quantity=Sum('quantity'), orders=Count('order_id', distinct=True))
+        .order_by('-quantity', 'food_item__name')
+    )
+
+    status_counts = orders.aggregate(
+        **{status: Count('id', filter=Q(status=status)) for status in KITCHEN_STATUSES},
+        oldest=Min('created_at'),
+    )
+    oldest = status_counts.pop('oldest')
+
+    return {
+        'items': [
+            {
+                'food_item': row['food_item_id'],
+                'food_item_name': row['food_item__name'],
+                'quantity': row['quantity'],
+                'orders': row['orders'],
+            }
+            for row in items
+        ],
+        'status_counts': status_counts,
+        'oldest_order_at': oldest,
+        'generated_at': now(),
+    }
+
+
+def kitchen_board(chef_id):
+    board = cache.get(_cache_key(chef_id))
+    if board is None:
+        board = build_kitchen_board(chef_id)
+        cache.set(_cache_key(chef_id), board, settings.KITCHEN_BOARD_CACHE_SECONDS)
+
+    oldest = board['oldest_order_at']
+    return {
+        'items': board['items'],
+        'status_counts': board['status_counts'],
+        'total_orders': sum(board['status_counts'].values()),
+        'oldest_order_at': datetime_str(oldest),
+        # Age is computed per request so a cached board never reports a stale one
+        'oldest_order_age_seconds': int((now() - oldest).total_seconds()) if oldest else None,
+        'generated_at': datetime_str(board['generated_at']),
+    }
+
+
+def invalidate_kitchen_board(*chef_ids):
+    keys = [_cache_key(chef_id) for chef_id in chef_ids if chef_id is not None]
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from orders.archive import archive_batch, archive_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves delivered / cancelled orders older than ORDER_ARCHIVE_AFTER_DAYS "
+        "(and their items) from the hot order tables into the archive tables, "
+        "in small batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Archive orders older than this (default: ORDER_ARCHIVE_AFTER_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--max-batches", type=int, default=None,
+                            help="Stop after this many batches (default: until nothing is left).")
+        parser.add_argument("--every", type=int, default=None, metavar="SECONDS",
+                            help="Keep running, archiving again every SECONDS.")
+
+    def handle(self, *args, **options):
+        while True:
+            moved = self.archive(options)
+            self.stdout.write(f"Archived {moved} orders.")
+
+            if not options["every"]:
+                return
+
+            close_old_connections()
+            time.sleep(options["every"])
+
+    def archive(self, options):
+        cutoff = archive_cutoff(options["days"])
+        moved = 0
+        batches = 0
+
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            count = archive_batch(cutoff, options["batch_size"])
+            if not count:
+                break
+
+            moved += count
+            batches += 1
+
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  batch {batches}: {count} orders")
+
+        return moved
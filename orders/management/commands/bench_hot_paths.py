@@ -0,0 +1,167 @@
+import json
+import statistics
+import timeit
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from cart.models import Cart, CartItem
+from cart.serializers import CartSerializer
+from food.models import FoodItem
+from food.serializers import FoodItemSerializer
+from orders.models import Order
+from orders.seeding import seed_food_items, seed_orders
+from orders.serializers import CaptainStatusUpdateSerializer, OrderSerializer, PlaceOrderSerializer
+from users.authentication import ClaimsJWTAuthentication, ClaimsRefreshToken
+from users.views import generate_jwt
+
+
+CAPTAIN_LABELS = ("Online 🚀", "picked up", "On the way 🚚", "Delivered ✅", "out_for_delivery", "assigned")
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmarks of per-request hot paths: order / catalog / cart "
+        "serializers, place-order validation and creation, captain status "
+        "label mapping, JWT issue / verify and authentication. Runs on fixed "
+        "seeded data inside a rolled-back transaction; reports the best and "
+        "median time per call and can compare against an earlier JSON run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=7,
+                            help="Timing rounds per case; best and median are reported.")
+        parser.add_argument("--min-time", type=float, default=0.2,
+                            help="Seconds each round runs for (calls per round are chosen to fit).")
+        parser.add_argument("--only", default=None, help="Run cases whose name contains this.")
+        parser.add_argument("--output", default=None, help="Write results as JSON.")
+        parser.add_argument("--baseline", default=None, help="Earlier --output file to compare with.")
+        parser.add_argument("--tolerance", type=float, default=15.0,
+                            help="Allowed slowdown of the best time against the baseline, in percent.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            cases = self.build_cases()
+            results = {}
+
+            for name, func in cases.items():
+                if options["only"] and options["only"] not in name:
+                    continue
+
+                results[name] = self.measure(func, options["repeat"], options["min_time"])
+                self.stdout.write(
+                    f"{name:<40} best {results[name]['best_us']:>11.1f} us   "
+                    f"median {results[name]['median_us']:>11.1f} us   ({results[name]['calls']} calls/round)"
+                )
+
+            transaction.set_rollback(True)
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options["baseline"]:
+            self.compare(results, options["baseline"], options["tolerance"])
+
+    def build_cases(self):
+        customer, chef, captain, _ = seed_orders(1000)
+        seed_food_items(chef, 1000)
+
+        request = Request(APIRequestFactory().get("/", HTTP_HOST="localhost"))
+        request.user = customer
+
+        # Serializers are timed on loaded rows: query counts are orders.tests' job
+        orders = list(Order.objects.with_details().filter(user=customer).order_by("id"))
+        foods = list(FoodItem.objects.filter(chef=chef).order_by("id")[:1000])
+
+        cart = Cart.objects.create(user=customer)
+        CartItem.objects.bulk_create([CartItem(cart=cart, food_item=food, quantity=2) for food in foods[:20]])
+        cart = Cart.objects.prefetch_related("cartitem_set__food_item").get(pk=cart.pk)
+
+        address_id = customer.delivery_addresses.first().id
+        order_payload = {
+            "delivery_address_id": address_id,
+            "items": [{"food_item": food.id, "quantity": 2} for food in foods[:3]],
+        }
+
+        captain_serializer = CaptainStatusUpdateSerializer()
+
+        access = str(ClaimsRefreshToken.for_user(customer).access_token)
+        auth_request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        authentication = ClaimsJWTAuthentication()
+
+        def place_order_validate():
+            serializer = PlaceOrderSerializer(data=order_payload, context={"request": request})
+            serializer.is_valid(raise_exception=True)
+
+        def place_order_create():
+            serializer = PlaceOrderSerializer(data=order_payload, context={"request": request})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        def captain_labels():
+            for label in CAPTAIN_LABELS:
+                captain_serializer.validate_status(label)
+
+        return {
+            "OrderSerializer x1": lambda: OrderSerializer(orders[:1], many=True).data,
+            "OrderSerializer x100": lambda: OrderSerializer(orders[:100], many=True).data,
+            "OrderSerializer x1000": lambda: OrderSerializer(orders, many=True).data,
+            f"CaptainStatusUpdate.validate_status x{len(CAPTAIN_LABELS)}": captain_labels,
+            "PlaceOrderSerializer validate": place_order_validate,
+            "PlaceOrderSerializer create": place_order_create,
+            "FoodItemSerializer x100": lambda: FoodItemSerializer(
+                foods[:100], many=True, context={"request": request}).data,
+            "FoodItemSerializer x1000": lambda: FoodItemSerializer(
+                foods, many=True, context={"request": request}).data,
+            "CartSerializer (20 items)": lambda: CartSerializer(cart).data,
+            "generate_jwt": lambda: generate_jwt(captain),
+            "AccessToken verify": lambda: AccessToken(access),
+            "ClaimsJWTAuthentication.authenticate": lambda: authentication.authenticate(auth_request),
+        }
+
+    @staticmethod
+    def measure(func, repeat, min_time):
+        func()  # warm caches (content types, compiled regexes, prepared querysets)
+
+        timer = timeit.Timer(func)
+        calls = 1
+        while timer.timeit(calls) < min_time / 5:
+            calls *= 2
+
+        rounds = [elapsed / calls * 1e6 for elapsed in timer.repeat(repeat=repeat, number=calls)]
+        return {
+            "best_us": round(min(rounds), 2),
+            "median_us": round(statistics.median(rounds), 2),
+            "calls": calls,
+        }
+
+    def compare(self, results, baseline_path, tolerance):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text())
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read baseline {baseline_path}: {exc}")
+
+        self.stdout.write(f"\nAgainst {baseline_path} (tolerance {tolerance:g}%):")
+        slower = []
+
+        for name, stats in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+
+            change = (stats["best_us"] - before["best_us"]) / before["best_us"] * 100
+            line = f"  {name:<40} {before['best_us']:>11.1f} -> {stats['best_us']:>11.1f} us ({change:+.1f}%)"
+            if change > tolerance:
+                slower.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if slower:
+            raise CommandError(f"Slower than baseline: {', '.join(slower)}")
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
@@ -0,0 +1,98 @@
+import io
+import timeit
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from food.models import FoodItem
+from food.serializers import FoodItemSerializer
+from maakaswad.parsers import ORJSONParser
+from maakaswad.renderers import ORJSONRenderer
+from orders.models import Order
+from orders.serializers import OrderSerializer
+from orders.seeding import seed_food_items, seed_orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders and parses real order and catalog payloads with the stock "
+        "DRF JSON renderer/parser and the orjson ones, checks the output is "
+        "identical (these payloads carry no floats, whose spelling can differ) "
+        "and reports throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+
+        with transaction.atomic():
+            customer, chef, _, _ = seed_orders(rows)
+            seed_food_items(chef, rows)
+            request = Request(APIRequestFactory().get("/", HTTP_HOST="localhost"))
+
+            payloads = {
+                "orders": OrderSerializer(
+                    Order.objects.with_details().filter(user=customer), many=True
+                ).data,
+                "food items": FoodItemSerializer(
+                    FoodItem.objects.filter(chef=chef), many=True, context={"request": request}
+                ).data,
+                # What APIViews return directly: Decimal sums, datetimes, lazy strings
+                "earnings": [
+                    {
+                        "today": Decimal("1520.50") + i,
+                        "total": Decimal("98000.00"),
+                        "updated": timezone.now(),
+                        "label": gettext_lazy("Delivered"),
+                    }
+                    for i in range(rows)
+                ],
+            }
+
+            transaction.set_rollback(True)
+
+        stock_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+        stock_parser, fast_parser = JSONParser(), ORJSONParser()
+
+        for name, data in payloads.items():
+            body = stock_renderer.render(data)
+
+            if fast_renderer.render(data) != body:
+                raise CommandError(f"ORJSONRenderer output differs for {name}.")
+
+            if fast_parser.parse(io.BytesIO(body)) != stock_parser.parse(io.BytesIO(body)):
+                raise CommandError(f"ORJSONParser output differs for {name}.")
+
+            size_mb = len(body) / (1024 * 1024)
+
+            timings = {
+                "render": (
+                    lambda: stock_renderer.render(data),
+                    lambda: fast_renderer.render(data),
+                ),
+                "parse": (
+                    lambda: stock_parser.parse(io.BytesIO(body)),
+                    lambda: fast_parser.parse(io.BytesIO(body)),
+                ),
+            }
+
+            for step, (stock, fast) in timings.items():
+                stock_time = min(timeit.repeat(stock, number=1, repeat=repeat))
+                fast_time = min(timeit.repeat(fast, number=1, repeat=repeat))
+
+                self.stdout.write(
+                    f"{name:<11} {step:<6} {len(body):>9} bytes  "
+                    f"stdlib {size_mb / stock_time:7.1f} MB/s  "
+                    f"orjson {size_mb / fast_time:7.1f} MB/s  ({stock_time / fast_time:.1f}x)"
+                )
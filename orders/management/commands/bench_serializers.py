@@ -0,0 +1,65 @@
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from food.encoders import encode_food_items
+from food.models import FoodItem
+from food.serializers import FoodItemSerializer
+from orders.encoders import encode_orders
+from orders.models import Order
+from orders.seeding import seed_food_items, seed_orders
+from orders.serializers import OrderSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the DRF serializers with the .values() fast path for order "
+        "and catalog lists: checks the JSON is byte-identical and reports timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+
+        with transaction.atomic():
+            customer, chef, _, _ = seed_orders(rows)
+            seed_food_items(chef, rows)
+
+            request = Request(APIRequestFactory().get("/", HTTP_HOST="localhost"))
+            orders = Order.objects.with_details().filter(user=customer)
+            foods = FoodItem.objects.filter(is_available=True)
+
+            cases = {
+                "orders": (
+                    lambda: OrderSerializer(orders.all(), many=True).data,
+                    lambda: encode_orders(orders.all()),
+                ),
+                "food items": (
+                    lambda: FoodItemSerializer(foods.all(), many=True, context={"request": request}).data,
+                    lambda: encode_food_items(foods.all(), request=request),
+                ),
+            }
+
+            renderer = JSONRenderer()
+
+            for name, (slow, fast) in cases.items():
+                if renderer.render(slow()) != renderer.render(fast()):
+                    raise CommandError(f"Fast path output differs from serializer output for {name}.")
+
+                slow_time = min(timeit.repeat(slow, number=1, repeat=repeat))
+                fast_time = min(timeit.repeat(fast, number=1, repeat=repeat))
+
+                self.stdout.write(
+                    f"{name:<12} {rows} rows  serializer {slow_time * 1000:8.1f} ms  "
+                    f"fast path {fast_time * 1000:8.1f} ms  ({slow_time / fast_time:.1f}x)"
+                )
+
+            transaction.set_rollback(True)
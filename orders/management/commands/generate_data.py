@@ -0,0 +1,371 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from cart.models import Cart, CartItem
+from food.models import Category, Favorite, FoodItem, SupportTicket
+from maakaswad.bulkload import BulkLoader, next_id, reset_sequences
+from orders.models import DeliveryAddress, Order, OrderItem
+from orders.seeding import ORDER_STATUS_MIX
+from users.models import User
+
+CITIES = (
+    # (name, latitude, longitude)
+    ("Hyderabad", 17.385044, 78.486671),
+    ("Bengaluru", 12.971599, 77.594563),
+    ("Chennai", 13.082680, 80.270718),
+    ("Pune", 18.520430, 73.856744),
+)
+
+# Relative order volume per hour of the day: lunch and dinner rushes
+HOURLY_WEIGHTS = (
+    0, 0, 0, 0, 0, 0,
+    1, 2, 3, 3, 4, 8,
+    16, 18, 12, 5, 4, 5,
+    8, 14, 16, 12, 6, 2,
+)
+
+ACTIVE_STATUSES = ("pending", "accepted", "preparing", "ready_for_pickup", "assigned", "picked_up", "out_for_delivery")
+CAPTAIN_STATUSES = ("assigned", "picked_up", "out_for_delivery", "delivered")
+MOVING_STATUSES = ("picked_up", "out_for_delivery")
+
+DISH_BASES = ("Paneer", "Chicken", "Veg", "Mutton", "Egg", "Dal", "Fish", "Mushroom")
+DISH_KINDS = ("Biryani", "Curry", "Thali", "Pulao", "Roti Combo", "Dosa", "Fry", "Khichdi")
+
+
+def parse_mix(value):
+    """"delivered=80,cancelled=8,pending=2" -> ((status, weight), ...)"""
+    valid = dict(Order.STATUS_CHOICES)
+    mix = []
+    for part in value.split(","):
+        status, _, weight = part.partition("=")
+        status = status.strip()
+        if status not in valid or not weight.strip().isdigit():
+            raise CommandError(f"Bad status mix entry: {part!r}")
+        mix.append((status, int(weight)))
+    return tuple(mix)
+
+
+def coordinate(value, rng, spread=0.08):
+    return Decimal(f"{value + rng.uniform(-spread, spread):.6f}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a production-scale synthetic dataset (customers, chefs with menus, "
+        "captains, orders with items, favorites, carts, support tickets) for "
+        "benchmarking. Rows are streamed with COPY on PostgreSQL and batched "
+        "INSERTs elsewhere; run it against a local database, never production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=100_000)
+        parser.add_argument("--customers", type=int, default=None, help="Default: orders / 10.")
+        parser.add_argument("--chefs", type=int, default=None, help="Default: orders / 2000, at least 10.")
+        parser.add_argument("--captains", type=int, default=None, help="Default: orders / 1000, at least 10.")
+        parser.add_argument("--foods-per-chef", type=int, default=20, help="Average menu size.")
+        parser.add_argument("--categories", type=int, default=25)
+        parser.add_argument("--days", type=int, default=180, help="History spread for finished orders.")
+        parser.add_argument("--status-mix", type=parse_mix, default=ORDER_STATUS_MIX,
+                            help='e.g. "delivered=80,cancelled=8,pending=2,..." (relative weights).')
+        parser.add_argument("--skew", type=float, default=2.0,
+                            help="Popularity skew of customers and chefs (1 = uniform).")
+        parser.add_argument("--favorites-per-customer", type=float, default=2.0, help="Average.")
+        parser.add_argument("--cart-share", type=float, default=0.2,
+                            help="Share of customers with an open cart.")
+        parser.add_argument("--tickets", type=int, default=None, help="Default: customers / 20.")
+        parser.add_argument("--online-captains", type=float, default=0.3, help="Share of captains online.")
+        parser.add_argument("--batch-size", type=int, default=50_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="syn", help="Username / email prefix of generated users.")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Users with prefix {prefix!r} already exist; pick another --prefix.")
+
+        orders = options["orders"]
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.customers = options["customers"] or max(orders // 10, 1)
+        self.chefs = options["chefs"] or max(orders // 2000, 10)
+        self.captains = options["captains"] or max(orders // 1000, 10)
+        self.cities = min(len(CITIES), self.chefs, self.captains, self.customers)
+        self.now = timezone.now()
+
+        started = time.monotonic()
+        steps = (
+            self.load_users,
+            self.load_catalog,
+            self.load_addresses,
+            self.load_orders,
+            self.load_favorites,
+            self.load_carts,
+            self.load_tickets,
+        )
+        for step in steps:
+            step_started = time.monotonic()
+            counts = step()
+            elapsed = time.monotonic() - step_started
+            summary = ", ".join(f"{count:,} {name}" for name, count in counts.items())
+            self.stdout.write(f"{summary} in {elapsed:.1f}s")
+
+        reset_sequences([User, Category, FoodItem, DeliveryAddress, Order, OrderItem,
+                         Favorite, Cart, CartItem, SupportTicket])
+
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.monotonic() - started:.1f}s."))
+
+    def loader(self, model, columns, parent=None):
+        return BulkLoader(model, columns, batch_size=self.batch_size, parent=parent)
+
+    # ------------------------------------------------------
+    # Picking rows: ids are computed, never looked up
+    # ------------------------------------------------------
+    def popular(self, count):
+        """Index in [0, count) favouring low indexes (--skew)."""
+        return int(count * self.rng.random() ** self.options["skew"])
+
+    def customer_in_city(self, city):
+        per_city = (self.customers - city + self.cities - 1) // self.cities
+        return self.popular(per_city) * self.cities + city
+
+    def chef_in_city(self, city):
+        per_city = (self.chefs - city + self.cities - 1) // self.cities
+        return self.popular(per_city) * self.cities + city
+
+    def captain_in_city(self, city):
+        per_city = (self.captains - city + self.cities - 1) // self.cities
+        return self.rng.randrange(per_city) * self.cities + city
+
+    def random_food(self, city):
+        chef = self.chef_in_city(city)
+        return self.food_start[chef] + self.rng.randrange(self.food_count[chef])
+
+    # ------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------
+    def load_users(self):
+        rng, prefix, now = self.rng, self.options["prefix"], self.now
+        users = self.loader(User, [
+            "id", "username", "email", "first_name", "role", "is_approved", "documents_submitted",
+            "registration_paid", "is_online", "rating", "city", "vehicle_number", "captain_id",
+            "password", "date_joined",
+        ])
+
+        self.customer_base = next_id(User)
+        self.chef_base = self.customer_base + self.customers
+        self.captain_base = self.chef_base + self.chefs
+
+        def joined():
+            return now - timedelta(days=rng.randrange(self.options["days"] * 2), seconds=rng.randrange(86400))
+
+        for i in range(self.customers):
+            users.add(self.customer_base + i, f"{prefix}_user_{i}", f"{prefix}_user_{i}@example.com", f"Customer {i}",
+                      "user", False, False, False, False, 0.0, CITIES[i % self.cities][0], None, None, "!", joined())
+
+        for i in range(self.chefs):
+            users.add(self.chef_base + i, f"{prefix}_chef_{i}", f"{prefix}_chef_{i}@example.com", f"Chef {i}",
+                      "chef", True, True, True, rng.random() < 0.5, round(rng.uniform(3.2, 5.0), 1),
+                      CITIES[i % self.cities][0], None, None, "!", joined())
+
+        online_share = self.options["online_captains"]
+        for i in range(self.captains):
+            users.add(self.captain_base + i, f"{prefix}_captain_{i}", f"{prefix}_captain_{i}@example.com",
+                      f"Captain {i}", "captain", True, True, True, rng.random() < online_share,
+                      round(rng.uniform(3.5, 5.0), 1), CITIES[i % self.cities][0], f"TS09AB{i % 10000:04d}",
+                      f"CAP{i:06d}", "!", joined())
+
+        users.flush()
+        return {"users": users.written}
+
+    def load_catalog(self):
+        rng, foods_per_chef = self.rng, self.options["foods_per_chef"]
+        categories = self.loader(Category, ["id", "name"])
+        foods = self.loader(FoodItem, ["id", "chef_id", "category_id", "name", "price", "is_available"])
+
+        category_base = next_id(Category)
+        for i in range(self.options["categories"]):
+            categories.add(category_base + i, f"{DISH_KINDS[i % len(DISH_KINDS)]} {i}")
+        categories.flush()
+
+        # Per chef: first food id and menu size; per food: price in paise
+        self.food_start, self.food_count, self.food_price = [], [], []
+        food_id = next_id(FoodItem)
+        self.food_base = food_id
+
+        for chef in range(self.chefs):
+            count = rng.randint(max(foods_per_chef // 2, 1), max(foods_per_chef * 3 // 2, 1))
+            self.food_start.append(food_id)
+            self.food_count.append(count)
+
+            for _ in range(count):
+                price = rng.randrange(60, 450) * 100 + rng.choice((0, 50, 99))
+                self.food_price.append(price)
+                foods.add(
+                    food_id, self.chef_base + chef, category_base + rng.randrange(self.options["categories"]),
+                    f"{rng.choice(DISH_BASES)} {rng.choice(DISH_KINDS)}", Decimal(price).scaleb(-2),
+                    rng.random() < 0.9,
+                )
+                food_id += 1
+
+        foods.flush()
+        return {"categories": categories.written, "food items": foods.written}
+
+    def load_addresses(self):
+        rng = self.rng
+        addresses = self.loader(DeliveryAddress, [
+            "id", "user_id", "full_name", "address", "city", "pincode", "phone", "latitude", "longitude",
+        ])
+
+        self.address_base = next_id(DeliveryAddress)
+        for i in range(self.customers):
+            city, latitude, longitude = CITIES[i % self.cities]
+            addresses.add(
+                self.address_base + i, self.customer_base + i, f"Customer {i}",
+                f"{rng.randrange(1, 999)}, {rng.randrange(1, 40)}th Cross", city, f"5{rng.randrange(100000):05d}",
+                f"9{rng.randrange(10 ** 9):09d}", coordinate(latitude, rng), coordinate(longitude, rng),
+            )
+
+        addresses.flush()
+        return {"addresses": addresses.written}
+
+    def load_orders(self):
+        rng, now = self.rng, self.now
+        orders = self.loader(Order, [
+            "id", "user_id", "assigned_chef_id", "assigned_captain_id", "delivery_address_id", "created_at",
+            "status", "total_amount", "delivery_fee", "driver_latitude", "driver_longitude",
+            "pickup_name", "pickup_latitude", "pickup_longitude",
+        ])
+        items = self.loader(OrderItem, ["id", "order_id", "food_item_id", "quantity"], parent=orders)
+
+        statuses = [status for status, _ in self.options["status_mix"]]
+        status_weights = list(accumulate(weight for _, weight in self.options["status_mix"]))
+        hours = range(24)
+        hour_weights = list(accumulate(HOURLY_WEIGHTS))
+        midnight = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        delivery_fee = Decimal("30.00")
+
+        # Kitchen location per chef: the captain's pickup point
+        pickups = [
+            (f"Chef {chef}", coordinate(CITIES[chef % self.cities][1], rng), coordinate(CITIES[chef % self.cities][2], rng))
+            for chef in range(self.chefs)
+        ]
+
+        order_id = next_id(Order)
+        item_id = next_id(OrderItem)
+
+        for _ in range(self.options["orders"]):
+            city = rng.randrange(self.cities)
+            customer = self.customer_in_city(city)
+            chef = self.chef_in_city(city)
+            status = rng.choices(statuses, cum_weights=status_weights)[0]
+
+            if status in ACTIVE_STATUSES:
+                # Live orders are from the last hour
+                created_at = now - timedelta(seconds=rng.randrange(3600))
+            else:
+                created_at = midnight - timedelta(days=rng.randrange(self.options["days"])) + timedelta(
+                    hours=rng.choices(hours, cum_weights=hour_weights)[0], minutes=rng.randrange(60),
+                )
+                if created_at > now:
+                    created_at -= timedelta(days=1)
+
+            total = 0
+            for _ in range(1 + int(rng.random() ** 2 * 4)):
+                offset = rng.randrange(self.food_count[chef])
+                quantity = 1 + int(rng.random() ** 3 * 3)
+                total += self.food_price[self.food_start[chef] - self.food_base + offset] * quantity
+                items.add(item_id, order_id, self.food_start[chef] + offset, quantity)
+                item_id += 1
+
+            captain = driver_latitude = driver_longitude = pickup = None
+            if status in CAPTAIN_STATUSES:
+                captain = self.captain_base + self.captain_in_city(city)
+                pickup = pickups[chef]
+                if status in MOVING_STATUSES:
+                    driver_latitude = coordinate(CITIES[city][1], rng)
+                    driver_longitude = coordinate(CITIES[city][2], rng)
+
+            orders.add(
+                order_id, self.customer_base + customer, None if status == "pending" else self.chef_base + chef,
+                captain, self.address_base + customer, created_at, status, Decimal(total).scaleb(-2),
+                delivery_fee, driver_latitude, driver_longitude,
+                *(pickup or (None, None, None)),
+            )
+            order_id += 1
+
+        orders.flush()
+        return {"orders": orders.written, "order items": items.written}
+
+    def load_favorites(self):
+        rng, now = self.rng, self.now
+        favorites = self.loader(Favorite, ["id", "user_id", "food_item_id", "created_at"])
+        average = self.options["favorites_per_customer"]
+
+        favorite_id = next_id(Favorite)
+        for customer in range(self.customers):
+            chosen = {
+                self.random_food(customer % self.cities)
+                for _ in range(int(rng.random() * average * 2 + 0.5))
+            }
+            for food in chosen:
+                favorites.add(favorite_id, self.customer_base + customer, food,
+                              now - timedelta(minutes=rng.randrange(self.options["days"] * 1440)))
+                favorite_id += 1
+
+        favorites.flush()
+        return {"favorites": favorites.written}
+
+    def load_carts(self):
+        rng, now = self.rng, self.now
+        carts = self.loader(Cart, ["id", "user_id", "created_at", "updated_at"])
+        items = self.loader(CartItem, ["id", "cart_id", "food_item_id", "quantity"], parent=carts)
+
+        # Some carts are past CART_IDLE_DAYS, so the sweeper has work
+        idle_minutes = settings.CART_IDLE_DAYS * 2 * 1440
+
+        cart_id = next_id(Cart)
+        item_id = next_id(CartItem)
+        for customer in range(self.customers):
+            if rng.random() >= self.options["cart_share"]:
+                continue
+
+            updated_at = now - timedelta(minutes=rng.randrange(idle_minutes))
+            carts.add(cart_id, self.customer_base + customer, updated_at - timedelta(minutes=rng.randrange(120)),
+                      updated_at)
+
+            city = customer % self.cities
+            chef = self.chef_in_city(city)
+            for offset in rng.sample(range(self.food_count[chef]), min(rng.randint(1, 3), self.food_count[chef])):
+                items.add(item_id, cart_id, self.food_start[chef] + offset, rng.randint(1, 3))
+                item_id += 1
+            cart_id += 1
+
+        carts.flush()
+        return {"carts": carts.written, "cart items": items.written}
+
+    def load_tickets(self):
+        rng, now = self.rng, self.now
+        tickets = self.loader(SupportTicket, ["id", "user_id", "message", "status", "created_at"])
+        messages = ("Where is my order?", "Food arrived cold.", "Refund not received.", "Wrong item delivered.")
+
+        count = self.options["tickets"]
+        if count is None:
+            count = self.customers // 20
+
+        ticket_id = next_id(SupportTicket)
+        for _ in range(count):
+            tickets.add(ticket_id, self.customer_base + self.popular(self.customers), rng.choice(messages),
+                        "open" if rng.random() < 0.15 else "resolved",
+                        now - timedelta(minutes=rng.randrange(self.options["days"] * 1440)))
+            ticket_id += 1
+
+        tickets.flush()
+        return {"support tickets": tickets.written}
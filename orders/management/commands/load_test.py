@@ -0,0 +1,338 @@
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from food.models import Category, FoodItem
+from orders.models import DeliveryAddress, Order
+from users.authentication import ClaimsRefreshToken
+from users.models import User
+
+MOVING_STATUSES = ("picked_up", "out_for_delivery")
+
+# Endpoints with fewer samples (in either run) are too noisy to judge
+MIN_COMPARE_REQUESTS = 50
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays a lunch-rush workload against a running server: customers "
+        "browse the menu, fill carts, place and track orders; chefs poll the "
+        "kitchen board and accept / prepare / hand off orders; captains stream "
+        "location pings and status updates. Reports p50/p95/p99 latency and "
+        "throughput per endpoint, writes them as JSON and optionally compares "
+        "against a baseline run.\n\n"
+        "Run it with the same settings (database, SECRET_KEY) as the server, "
+        "seeded with generate_data: tokens are minted for existing users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--duration", type=int, default=60, help="Seconds of load, after warmup.")
+        parser.add_argument("--warmup", type=int, default=5, help="Seconds whose samples are discarded.")
+        parser.add_argument("--customers", type=int, default=40, help="Concurrent virtual customers.")
+        parser.add_argument("--chefs", type=int, default=10)
+        parser.add_argument("--captains", type=int, default=20)
+        parser.add_argument("--think-ms", type=int, default=500, help="Mean pause between user actions.")
+        parser.add_argument("--ping-ms", type=int, default=1000, help="Captain location ping interval.")
+        parser.add_argument("--order-share", type=float, default=0.3,
+                            help="Share of customer sessions that end in an order.")
+        parser.add_argument("--track-polls", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", default=None,
+                            help="Results file (default: loadtest-results/<timestamp>.json).")
+        parser.add_argument("--baseline", default=None, help="Earlier results file to compare with.")
+        parser.add_argument("--tolerance", type=float, default=10.0,
+                            help="Allowed p95 / throughput regression against the baseline, in percent.")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        self.prepare_users(options)
+
+        self.samples = defaultdict(list)
+        self.placed = asyncio.Queue()
+
+        started = timezone.now()
+        asyncio.run(self.run(options))
+
+        results = {
+            "meta": {
+                "started": started.isoformat(),
+                "base_url": options["base_url"],
+                "duration_s": options["duration"],
+                "customers": len(self.customers),
+                "chefs": len(self.chefs),
+                "captains": len(self.captains),
+                "think_ms": options["think_ms"],
+                "ping_ms": options["ping_ms"],
+                "seed": options["seed"],
+            },
+            "endpoints": self.summarize(options["duration"]),
+        }
+
+        self.print_results(results["endpoints"])
+
+        output = Path(options["output"] or f"loadtest-results/{started:%Y%m%d-%H%M%S}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+        self.stdout.write(f"Results written to {output}")
+
+        if options["baseline"]:
+            self.compare(results["endpoints"], options["baseline"], options["tolerance"])
+
+    # ------------------------------------------------------
+    # Who plays
+    # ------------------------------------------------------
+    def prepare_users(self, options):
+        addresses = {}
+        for user_id, address_id in (
+            DeliveryAddress.objects.filter(user__role="user").order_by("user_id", "id").values_list("user_id", "id")
+        ):
+            addresses.setdefault(user_id, address_id)
+            if len(addresses) >= options["customers"]:
+                break
+
+        chef_ids = list(
+            User.objects.filter(role="chef", is_approved=True).order_by("id").values_list("id", flat=True)[:options["chefs"]]
+        )
+
+        moving = Order.objects.filter(status__in=MOVING_STATUSES, assigned_captain__isnull=False)
+        captain_ids = list(
+            moving.order_by("assigned_captain_id").values_list("assigned_captain_id", flat=True)
+            .distinct()[:options["captains"]]
+        )
+        captain_orders = defaultdict(list)
+        for captain_id, order_id in moving.filter(assigned_captain_id__in=captain_ids).values_list(
+            "assigned_captain_id", "id"
+        ):
+            captain_orders[captain_id].append(order_id)
+
+        menus = defaultdict(list)
+        for chef_id, food_id in FoodItem.objects.filter(is_available=True).order_by("chef_id", "id").values_list(
+            "chef_id", "id"
+        )[:20_000]:
+            menus[chef_id].append(food_id)
+
+        self.categories = list(Category.objects.values_list("id", flat=True))
+        self.menus = list(menus.values())
+
+        if not addresses or not self.menus:
+            raise CommandError("No customers with addresses or no menu items; seed with generate_data first.")
+
+        users = User.objects.in_bulk(list(addresses) + chef_ids + list(captain_orders))
+
+        def token(user_id):
+            return {"Authorization": f"Bearer {ClaimsRefreshToken.for_user(users[user_id]).access_token}"}
+
+        self.customers = [(token(user_id), address_id) for user_id, address_id in addresses.items()]
+        self.chefs = [token(user_id) for user_id in chef_ids]
+        self.captains = [(token(user_id), order_ids) for user_id, order_ids in captain_orders.items()]
+
+    # ------------------------------------------------------
+    # Running
+    # ------------------------------------------------------
+    async def run(self, options):
+        users = len(self.customers) + len(self.chefs) + len(self.captains)
+        limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+        async with httpx.AsyncClient(base_url=options["base_url"], limits=limits, timeout=30) as client:
+            self.client = client
+            self.started = time.perf_counter()
+            self.measure_from = self.started + options["warmup"]
+            self.deadline = self.measure_from + options["duration"]
+
+            await asyncio.gather(
+                *(self.customer(headers, address_id) for headers, address_id in self.customers),
+                *(self.chef(headers) for headers in self.chefs),
+                *(self.captain(headers, order_ids) for headers, order_ids in self.captains),
+            )
+
+    def running(self):
+        return time.perf_counter() < self.deadline
+
+    async def think(self, mean_ms=None):
+        await asyncio.sleep(self.rng.expovariate(1000 / (mean_ms or self.options["think_ms"])))
+
+    async def call(self, endpoint, method, path, headers=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        end = time.perf_counter()
+
+        if self.measure_from <= start and end <= self.deadline:
+            server_ms = None
+            if response is not None:
+                timing = response.headers.get("Server-Timing", "")
+                if timing.startswith("total;dur="):
+                    server_ms = float(timing.split(",", 1)[0].removeprefix("total;dur="))
+
+            self.samples[endpoint].append((
+                (end - start) * 1000,
+                response is not None and response.status_code < 400,
+                server_ms,
+            ))
+
+        return response
+
+    async def customer(self, headers, address_id):
+        rng = self.rng
+        while self.running():
+            params = {"category": rng.choice(self.categories)} if self.categories else None
+            await self.call("fooditem-list", "GET", "/api/food/items/", params=params)
+            await self.think()
+
+            menu = rng.choice(self.menus)
+            await self.call("cart-add", "POST", "/api/cart/add/", headers,
+                            json={"food_item_id": rng.choice(menu), "quantity": 1})
+            await self.think()
+
+            if rng.random() >= self.options["order_share"]:
+                continue
+
+            items = [{"food_item": food, "quantity": rng.randint(1, 3)}
+                     for food in rng.sample(menu, min(len(menu), rng.randint(1, 3)))]
+            response = await self.call("place-order", "POST", "/api/orders/place/", headers,
+                                       json={"delivery_address_id": address_id, "items": items})
+            if response is None or response.status_code != 201:
+                continue
+
+            order_id = response.json()["id"]
+            self.placed.put_nowait(order_id)
+
+            for _ in range(self.options["track_polls"]):
+                await self.think()
+                await self.call("track-order", "GET", f"/api/orders/track/{order_id}/", headers)
+
+    async def chef(self, headers):
+        while self.running():
+            await self.call("chef-kitchen-board", "GET", "/api/orders/chef/kitchen-board/", headers)
+
+            try:
+                order_id = self.placed.get_nowait()
+            except asyncio.QueueEmpty:
+                await self.think()
+                continue
+
+            response = await self.call("chef-accept-order", "POST", f"/api/orders/chef/accept/{order_id}/", headers)
+            if response is None or response.status_code != 200:
+                continue
+
+            for status in ("preparing", "ready_for_pickup"):
+                await self.think()
+                await self.call("chef-update-status", "PATCH", f"/api/orders/chef/update-status/{order_id}/",
+                                headers, json={"status": status})
+
+            await self.call("assign-captain", "POST", f"/api/orders/assign-captain/{order_id}/", headers)
+            await self.think()
+
+    async def captain(self, headers, order_ids):
+        # Orders bounce between picked_up and out_for_delivery, so the
+        # dataset looks the same before and after a run
+        rng = self.rng
+        statuses = {order_id: MOVING_STATUSES[0] for order_id in order_ids}
+
+        while self.running():
+            order_id = rng.choice(order_ids)
+            for _ in range(5):
+                await self.call("update-driver-location", "PATCH", f"/api/orders/track/update-location/{order_id}/",
+                                headers, json={
+                                    "driver_latitude": f"{17.385 + rng.uniform(-0.05, 0.05):.6f}",
+                                    "driver_longitude": f"{78.486 + rng.uniform(-0.05, 0.05):.6f}",
+                                })
+                await self.think(self.options["ping_ms"])
+
+            statuses[order_id] = MOVING_STATUSES[statuses[order_id] == MOVING_STATUSES[0]]
+            await self.call("captain-update-status", "PATCH", f"/api/orders/captain/update-status/{order_id}/",
+                            headers, json={"status": statuses[order_id]})
+
+    # ------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------
+    def summarize(self, duration):
+        summary = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            latencies = sorted(ms for ms, _, _ in samples)
+            server = sorted(ms for _, _, ms in samples if ms is not None)
+            errors = sum(1 for _, ok, _ in samples if not ok)
+
+            summary[endpoint] = {
+                "requests": len(samples),
+                "errors": errors,
+                "error_rate": round(errors / len(samples), 4),
+                "rps": round(len(samples) / duration, 2),
+                "mean_ms": round(sum(latencies) / len(latencies), 1),
+                "p50_ms": percentile(latencies, 0.50),
+                "p95_ms": percentile(latencies, 0.95),
+                "p99_ms": percentile(latencies, 0.99),
+                "max_ms": round(latencies[-1], 1),
+                "server_p50_ms": percentile(server, 0.50),
+                "server_p95_ms": percentile(server, 0.95),
+            }
+        return summary
+
+    def print_results(self, endpoints):
+        self.stdout.write(
+            f"{'endpoint':<24} {'requests':>8} {'errors':>6} {'rps':>7} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        )
+        for endpoint, stats in endpoints.items():
+            self.stdout.write(
+                f"{endpoint:<24} {stats['requests']:>8} {stats['errors']:>6} {stats['rps']:>7.1f} "
+                f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}"
+            )
+
+    def compare(self, endpoints, baseline_path, tolerance):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text())["endpoints"]
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Cannot read baseline {baseline_path}: {exc}")
+
+        self.stdout.write(f"\nAgainst {baseline_path} (tolerance {tolerance:g}%):")
+        regressions = []
+
+        for endpoint, stats in endpoints.items():
+            before = baseline.get(endpoint)
+            if before is None:
+                self.stdout.write(f"  {endpoint:<24} new endpoint")
+                continue
+            if min(stats["requests"], before["requests"]) < MIN_COMPARE_REQUESTS:
+                self.stdout.write(f"  {endpoint:<24} too few requests to compare")
+                continue
+
+            p95_change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+            rps_change = (stats["rps"] - before["rps"]) / before["rps"] * 100 if before["rps"] else 0.0
+
+            problems = []
+            if p95_change > tolerance:
+                problems.append("p95")
+            if rps_change < -tolerance:
+                problems.append("throughput")
+            if stats["error_rate"] > before["error_rate"] + 0.01:
+                problems.append("errors")
+
+            line = f"  {endpoint:<24} p95 {before['p95_ms']:.1f} -> {stats['p95_ms']:.1f} ms ({p95_change:+.1f}%)  " \
+                   f"rps {before['rps']:.1f} -> {stats['rps']:.1f} ({rps_change:+.1f}%)"
+            if problems:
+                regressions.append(endpoint)
+                self.stdout.write(self.style.ERROR(f"{line}  REGRESSED: {', '.join(problems)}"))
+            else:
+                self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"Regressed against baseline: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
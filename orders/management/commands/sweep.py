@@ -0,0 +1,84 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from orders.sweeper import (
+    cancel_stale_orders,
+    idle_cart_cutoff,
+    pending_cutoff,
+    purge_idle_carts,
+)
+from users.uploads import purge_stale_uploads, upload_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Cancels orders left pending past ORDER_PENDING_SLA_MINUTES and deletes "
+        "carts idle for CART_IDLE_DAYS and document uploads idle for "
+        "UPLOAD_SESSION_TTL_HOURS, in small batches that skip locked rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pending-minutes", type=int, default=None,
+                            help="Pending SLA in minutes (default: ORDER_PENDING_SLA_MINUTES).")
+        parser.add_argument("--cart-days", type=int, default=None,
+                            help="Cart idle time in days (default: CART_IDLE_DAYS).")
+        parser.add_argument("--upload-hours", type=int, default=None,
+                            help="Upload session idle time in hours (default: UPLOAD_SESSION_TTL_HOURS).")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--max-batches", type=int, default=None,
+                            help="Per kind of row (default: until nothing is left).")
+        parser.add_argument("--every", type=int, default=None, metavar="SECONDS",
+                            help="Keep running, sweeping again every SECONDS.")
+
+    def handle(self, *args, **options):
+        while True:
+            self.sweep(options)
+
+            if not options["every"]:
+                return
+
+            close_old_connections()
+            time.sleep(options["every"])
+
+    def sweep(self, options):
+        batch_size = options["batch_size"]
+        order_cutoff = pending_cutoff(options["pending_minutes"])
+        cart_cutoff = idle_cart_cutoff(options["cart_days"])
+        uploads_cutoff = upload_cutoff(options["upload_hours"])
+
+        orders = 0
+        for _ in self.batches(options):
+            count = cancel_stale_orders(order_cutoff, batch_size)
+            if not count:
+                break
+            orders += count
+
+        carts = items = 0
+        for _ in self.batches(options):
+            cart_count, item_count = purge_idle_carts(cart_cutoff, batch_size)
+            if not cart_count:
+                break
+            carts += cart_count
+            items += item_count
+
+        uploads = 0
+        for _ in self.batches(options):
+            count = purge_stale_uploads(uploads_cutoff, batch_size)
+            if not count:
+                break
+            uploads += count
+
+        self.stdout.write(
+            f"Cancelled {orders} stale pending orders, "
+            f"purged {carts} idle carts ({items} items) "
+            f"and {uploads} stale document uploads."
+        )
+
+    def batches(self, options):
+        limit = options["max_batches"]
+        batch = 0
+        while limit is None or batch < limit:
+            yield batch
+            batch += 1
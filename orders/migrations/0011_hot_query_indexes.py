@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+from maakaswad.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('orders', '0010_archivedorder_archivedorderitem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['user', '-created_at'], name='order_user_created'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['assigned_chef', 'status'], name='order_chef_status'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['assigned_captain', 'status', 'created_at'], name='order_captain_status_created'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['status', 'created_at'], name='order_pending_created'),
+        ),
+    ]
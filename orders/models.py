@@ -1,4 +1,5 @@
 ﻿from django.db import models
+from django.db.models import Q
 from users.models import User
 from food.models import FoodItem
 
@@ -26,6 +27,31 @@ class DeliveryAddress(models.Model):
         ordering = ['-id']
 
 
+# ==========================================================
+# 🔎 Order QuerySet (shared read path)
+# ==========================================================
+
+class OrderQuerySet(models.QuerySet):
+
+    def with_details(self):
+        """
+        Joins/prefetches everything OrderSerializer and OrderDetailSerializer
+        read, so serializing N orders costs a fixed number of queries
+        (orders + items) instead of several per order.
+        """
+        return self.select_related(
+            'user',
+            'assigned_chef',
+            'assigned_captain',
+            'delivery_address',
+        ).prefetch_related(
+            models.Prefetch(
+                'items',
+                queryset=OrderItem.objects.select_related('food_item')
+            )
+        )
+
+
 # ==========================================================
 # 🛒 Order Model (UPDATED FOR CHEF & CAPTAIN)
 # ==========================================================
@@ -136,11 +162,24 @@ class Order(models.Model):
         blank=True
     )
 
+    objects = OrderQuerySet.as_manager()
+
     def __str__(self):
         return f"Order #{self.id} - {self.status.upper()}"
 
     class Meta:
         ordering = ['-created_at']
+        # 🗂️ One per hot filter (see orders/tests/test_query_plans.py)
+        indexes = [
+            # My orders
+            models.Index(fields=['user', '-created_at'], name='order_user_created'),
+            # Chef earnings / kitchen board
+            models.Index(fields=['assigned_chef', 'status'], name='order_chef_status'),
+            # Captain orders, dashboard and earnings
+            models.Index(fields=['assigned_captain', 'status', 'created_at'], name='order_captain_status_created'),
+            # Chef pending pool and the sweeper; pending is a small slice of the table
+            models.Index(fields=['status', 'created_at'], condition=Q(status='pending'), name='order_pending_created'),
+        ]
 
 
 # ==========================================================
@@ -162,3 +201,105 @@ class OrderItem(models.Model):
     class Meta:
         verbose_name = "Order Item"
         verbose_name_plural = "Order Items"
+
+
+# ==========================================================
+# 🗄️ Order Archive (cold storage)
+# ==========================================================
+# Delivered / cancelled orders older than ORDER_ARCHIVE_AFTER_DAYS are moved
+# here by `manage.py archive_orders`, keeping their ids, so the hot Order
+# table only holds recent and in-flight orders. Same columns as Order /
+# OrderItem, so OrderSerializer and the encoders read both.
+
+class ArchivedOrderQuerySet(models.QuerySet):
+
+    def with_details(self):
+        return self.select_related(
+            'user',
+            'assigned_chef',
+            'assigned_captain',
+            'delivery_address',
+        ).prefetch_related(
+            models.Prefetch(
+                'items',
+                queryset=ArchivedOrderItem.objects.select_related('food_item')
+            )
+        )
+
+
+class ArchivedOrder(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_orders'
+    )
+
+    assigned_chef = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_chef_orders"
+    )
+
+    assigned_captain = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_captain_orders"
+    )
+
+    delivery_address = models.ForeignKey(
+        DeliveryAddress,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+
+    created_at = models.DateTimeField()
+    status = models.CharField(max_length=30, choices=Order.STATUS_CHOICES)
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    delivery_fee = models.DecimalField(max_digits=6, decimal_places=2)
+
+    driver_latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    driver_longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+
+    pickup_name = models.CharField(max_length=200, null=True, blank=True)
+    pickup_latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    pickup_longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ArchivedOrderQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Archived Order #{self.id} - {self.status.upper()}"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='archived_order_user_created'),
+        ]
+
+
+class ArchivedOrderItem(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+
+    order = models.ForeignKey(
+        ArchivedOrder,
+        on_delete=models.CASCADE,
+        related_name='items'
+    )
+    food_item = models.ForeignKey(FoodItem, on_delete=models.CASCADE, related_name='+')
+    quantity = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.quantity} x {self.food_item.name} (Archived Order #{self.order_id})"
+
+    class Meta:
+        verbose_name = "Archived Order Item"
+        verbose_name_plural = "Archived Order Items"
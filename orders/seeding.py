@@ -0,0 +1,237 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from food.models import Category, FoodItem, SupportTicket
+from orders.archive import archive_batch
+from orders.models import DeliveryAddress, Order, OrderItem
+from users.models import User
+
+
+def seed_orders(size, items_per_order=2, prefix="qc", archived=0):
+    """
+    Minimal customer/chef/captain + `size` orders for the query-count tests
+    and the serializer benchmark commands, plus `archived` delivered orders
+    of the customer moved into the archive tables. Call inside a test or a
+    rolled-back transaction.
+    """
+    customer = User.objects.create(
+        username=f"{prefix}_customer", email=f"{prefix}_customer@example.com", phone="9000000001", role="user"
+    )
+    chef = User.objects.create(
+        username=f"{prefix}_chef", email=f"{prefix}_chef@example.com", phone="9000000002", role="chef"
+    )
+    captain = User.objects.create(
+        username=f"{prefix}_captain", email=f"{prefix}_captain@example.com", phone="9000000003", role="captain"
+    )
+
+    category = Category.objects.create(name="Query Check")
+    foods = [
+        FoodItem.objects.create(
+            chef=chef,
+            category=category,
+            name=f"Dish {i}",
+            price=Decimal("120.00") + i,
+            image=f"food_images/dish_{i}.jpg" if i % 2 else None,
+        )
+        for i in range(max(items_per_order, 3))
+    ]
+
+    address = DeliveryAddress.objects.create(
+        user=customer,
+        full_name="Query Check",
+        address="1 Test Street",
+        city="Hyderabad",
+        pincode="500001",
+        phone="9000000001",
+        latitude=Decimal("17.385044"),
+        longitude=Decimal("78.486671"),
+    )
+
+    orders = Order.objects.bulk_create([
+        Order(
+            user=customer,
+            assigned_chef=chef,
+            assigned_captain=captain,
+            delivery_address=address if i % 5 else None,
+            status="assigned",
+            total_amount=Decimal("240.50"),
+            driver_latitude=Decimal("17.400000") if i % 3 else None,
+            driver_longitude=Decimal("78.480000") if i % 3 else None,
+            pickup_latitude=Decimal("17.390000") if i % 2 else None,
+            pickup_longitude=Decimal("78.490000") if i % 2 else None,
+        )
+        for i in range(size)
+    ])
+
+    OrderItem.objects.bulk_create([
+        OrderItem(order=order, food_item=food, quantity=1 + j)
+        for order in orders
+        for j, food in enumerate(foods[:items_per_order])
+    ])
+
+    if archived:
+        old = Order.objects.bulk_create([
+            Order(user=customer, assigned_chef=chef, assigned_captain=captain, delivery_address=address,
+                  status="delivered", total_amount=Decimal("180.00"))
+            for _ in range(archived)
+        ])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, food_item=food, quantity=1)
+            for order in old
+            for food in foods[:items_per_order]
+        ])
+
+        # created_at is auto_now_add: backdate past the archive cutoff afterwards
+        Order.objects.filter(id__in=[order.id for order in old]).update(
+            created_at=timezone.now() - timedelta(days=90)
+        )
+        archive_batch(timezone.now() - timedelta(days=30), archived)
+
+    return customer, chef, captain, orders
+
+
+def seed_food_items(chef, size):
+    """`size` extra menu items for `chef`, half of them with an image."""
+    category = FoodItem.objects.filter(chef=chef).first().category
+
+    return FoodItem.objects.bulk_create([
+        FoodItem(
+            chef=chef,
+            category=category,
+            name=f"Bench dish {i}",
+            description="Slow-cooked, home style.",
+            price=Decimal(i % 500) + Decimal("0.50"),
+            image=f"food_images/bench_{i}.jpg" if i % 2 else None,
+        )
+        for i in range(size)
+    ])
+
+
+ORDER_STATUS_MIX = (
+    # (status, share of orders) — roughly a live marketplace
+    ("delivered", 80),
+    ("cancelled", 8),
+    ("pending", 2),
+    ("accepted", 2),
+    ("preparing", 2),
+    ("ready_for_pickup", 1),
+    ("assigned", 2),
+    ("picked_up", 1),
+    ("out_for_delivery", 2),
+)
+
+
+def seed_marketplace(orders, customers=None, chefs=None, captains=None, foods_per_chef=20,
+                     categories=20, tickets=None, days=120, prefix="mk", batch_size=2000):
+    """
+    Bulk-inserts a marketplace-shaped dataset: customers, chefs and captains,
+    a catalog, `orders` orders (with items) spread over the last `days` days
+    in ORDER_STATUS_MIX proportions, and support tickets. Deterministic, so
+    query plans are comparable between runs.
+    """
+    customers = customers or max(orders // 10, 1)
+    chefs = chefs or max(orders // 200, 1)
+    captains = captains or max(orders // 200, 1)
+    tickets = customers // 2 if tickets is None else tickets
+
+    def users(role, count):
+        return User.objects.bulk_create([
+            User(
+                username=f"{prefix}_{role}_{i}",
+                email=f"{prefix}_{role}_{i}@example.com",
+                role=role,
+                is_approved=role != "user",
+                password="!",
+            )
+            for i in range(count)
+        ], batch_size=batch_size)
+
+    customer_rows = users("user", customers)
+    chef_rows = users("chef", chefs)
+    captain_rows = users("captain", captains)
+
+    category_rows = Category.objects.bulk_create([
+        Category(name=f"{prefix} category {i}") for i in range(categories)
+    ])
+
+    food_rows = FoodItem.objects.bulk_create([
+        FoodItem(
+            chef=chef,
+            category=category_rows[(c * foods_per_chef + i) % categories],
+            name=f"{prefix} dish {c}-{i}",
+            price=Decimal(80 + (c * 7 + i * 13) % 400) + Decimal("0.50"),
+            is_available=i % 10 != 0,
+        )
+        for c, chef in enumerate(chef_rows)
+        for i in range(foods_per_chef)
+    ], batch_size=batch_size)
+
+    addresses = DeliveryAddress.objects.bulk_create([
+        DeliveryAddress(
+            user=customer,
+            full_name=customer.username,
+            address=f"{i} Test Street",
+            city="Hyderabad",
+            pincode="500001",
+            phone="9000000000",
+            latitude=Decimal("17.385044"),
+            longitude=Decimal("78.486671"),
+        )
+        for i, customer in enumerate(customer_rows)
+    ], batch_size=batch_size)
+
+    statuses = [status for status, share in ORDER_STATUS_MIX for _ in range(share)]
+    now = timezone.now()
+
+    order_rows = []
+    for i in range(orders):
+        status = statuses[(i * 37) % len(statuses)]
+        chef_index = (i * 7) % chefs
+        order_rows.append(Order(
+            user=customer_rows[(i * 13) % customers],
+            assigned_chef=None if status == "pending" else chef_rows[chef_index],
+            assigned_captain=(
+                captain_rows[(i * 11) % captains]
+                if status in ("assigned", "picked_up", "out_for_delivery", "delivered") else None
+            ),
+            delivery_address=addresses[(i * 13) % customers],
+            status=status,
+            total_amount=Decimal(150 + (i * 31) % 900) + Decimal("0.50"),
+            delivery_fee=Decimal("30.00"),
+        ))
+
+    order_rows = Order.objects.bulk_create(order_rows, batch_size=batch_size)
+
+    # created_at is auto_now_add, so spread it afterwards (bulk_update skips pre_save)
+    for i, order in enumerate(order_rows):
+        order.created_at = now - timedelta(minutes=(i * 7919) % (days * 24 * 60))
+    Order.objects.bulk_update(order_rows, ["created_at"], batch_size=batch_size)
+
+    OrderItem.objects.bulk_create([
+        OrderItem(
+            order=order,
+            food_item=food_rows[((i * 7) % chefs) * foods_per_chef + (i + j) % foods_per_chef],
+            quantity=1 + (i + j) % 3,
+        )
+        for i, order in enumerate(order_rows)
+        for j in range(1 + i % 3)
+    ], batch_size=batch_size)
+
+    SupportTicket.objects.bulk_create([
+        SupportTicket(
+            user=customer_rows[(i * 17) % customers],
+            message="Where is my order?",
+            status="resolved" if i % 4 else "open",
+        )
+        for i in range(tickets)
+    ], batch_size=batch_size)
+
+    return {
+        "customers": customer_rows,
+        "chefs": chef_rows,
+        "captains": captain_rows,
+        "categories": category_rows,
+        "orders": len(order_rows),
+    }
@@ -5,6 +5,8 @@ from rest_framework import serializers
 
 from .models import DeliveryAddress, Order, OrderItem
 from food.models import FoodItem
+from food.serializers import FoodItemSerializer
+from maakaswad.sparse import SparseFieldsMixin
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +14,7 @@ logger = logging.getLogger(__name__)
 # ==========================================================
 # 📍 Delivery Address Serializer
 # ==========================================================
-class DeliveryAddressSerializer(serializers.ModelSerializer):
+class DeliveryAddressSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = DeliveryAddress
@@ -31,7 +33,7 @@ class DeliveryAddressSerializer(serializers.ModelSerializer):
 # ==========================================================
 # 🍱 Order Item Serializer
 # ==========================================================
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     food_item_name = serializers.CharField(
         source='food_item.name',
@@ -55,11 +57,16 @@ class OrderItemSerializer(serializers.ModelSerializer):
             'quantity'
         ]
 
+        # ?expand=items.food_item
+        expandable_fields = {
+            'food_item': FoodItemSerializer,
+        }
+
 
 # ==========================================================
 # 🛒 Order List Serializer
 # ==========================================================
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     items = OrderItemSerializer(many=True, read_only=True)
     delivery_address = DeliveryAddressSerializer(read_only=True)
@@ -89,6 +96,13 @@ class OrderSerializer(serializers.ModelSerializer):
             'items'
         ]
 
+        # Columns read by the SerializerMethodFields (for ?fields= pruning)
+        sparse_sources = {
+            'driver_location': ['driver_latitude', 'driver_longitude'],
+            'pickup_location': ['pickup_latitude', 'pickup_longitude'],
+            'destination': ['delivery_address__latitude', 'delivery_address__longitude'],
+        }
+
     # Driver live location
     def get_driver_location(self, obj):
         if obj.driver_latitude and obj.driver_longitude:
@@ -141,7 +155,7 @@ class OrderSerializer(serializers.ModelSerializer):
 # ==========================================================
 # 📄 Order Detail Serializer
 # ==========================================================
-class OrderDetailSerializer(serializers.ModelSerializer):
+class OrderDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     items = OrderItemSerializer(many=True, read_only=True)
     delivery_address = DeliveryAddressSerializer(read_only=True)
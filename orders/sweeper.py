@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
+
+from cart.models import Cart, CartItem
+
+from .models import Order
+
+
+# ==========================================================
+# 🧹 Sweeper: stale pending orders and idle carts
+# ==========================================================
+# Each batch locks its rows with SKIP LOCKED, so rows a request is
+# touching right now are left for the next run instead of waited on.
+
+def pending_cutoff(minutes=None):
+    minutes = settings.ORDER_PENDING_SLA_MINUTES if minutes is None else minutes
+    return now() - timedelta(minutes=minutes)
+
+
+def idle_cart_cutoff(days=None):
+    days = settings.CART_IDLE_DAYS if days is None else days
+    return now() - timedelta(days=days)
+
+
+def cancel_stale_orders(cutoff, batch_size):
+    """
+    Cancels up to `batch_size` orders still pending since before `cutoff`.
+    Returns the number of orders cancelled.
+    """
+    with transaction.atomic():
+        ids = list(
+            Order.objects.filter(status="pending", created_at__lt=cutoff)
+            .order_by("id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:batch_size]
+        )
+
+        if not ids:
+            return 0
+
+        return Order.objects.filter(id__in=ids, status="pending").update(status="cancelled")
+
+
+def purge_idle_carts(cutoff, batch_size):
+    """
+    Deletes up to `batch_size` carts not touched since `cutoff`, with their
+    items. Returns (carts, items) deleted.
+    """
+    with transaction.atomic():
+        ids = list(
+            Cart.objects.filter(updated_at__lt=cutoff)
+            .order_by("id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:batch_size]
+        )
+
+        if not ids:
+            return 0, 0
+
+        items, _ = CartItem.objects.filter(cart_id__in=ids).delete()
+        carts, _ = Cart.objects.filter(id__in=ids).delete()
+
+    return carts, items
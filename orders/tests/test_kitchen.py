@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from orders.kitchen import build_kitchen_board
+from orders.models import Order, OrderItem
+from orders.seeding import seed_orders
+
+
+class KitchenBoardTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.chef, _, orders = seed_orders(6, items_per_order=2)
+        statuses = ["accepted", "accepted", "accepted", "preparing", "preparing", "ready_for_pickup"]
+        for order, status in zip(orders, statuses):
+            order.status = status
+        Order.objects.bulk_update(orders, ["status"])
+
+        cls.oldest = timezone.now() - timedelta(minutes=40)
+        Order.objects.filter(pk=orders[4].pk).update(created_at=cls.oldest)
+        cls.orders = orders
+
+    def test_board_counts_and_oldest_order_in_two_queries(self):
+        with self.assertNumQueries(2):
+            board = build_kitchen_board(self.chef.id)
+
+        self.assertEqual(board["status_counts"], {"accepted": 3, "preparing": 2})
+        self.assertEqual(board["oldest_order_at"], self.oldest)
+
+        # seed_orders gives every order 1 x the first dish and 2 x the second;
+        # the ready_for_pickup order is off the board
+        first, second = OrderItem.objects.filter(order=self.orders[0]).order_by("quantity").values_list(
+            "food_item_id", flat=True)
+        self.assertEqual(
+            [(row["food_item"], row["quantity"], row["orders"]) for row in board["items"]],
+            [(second, 10, 5), (first, 5, 5)],
+        )
+
+    def test_empty_board(self):
+        board = build_kitchen_board(self.chef.id + 1000)
+
+        self.assertEqual(board["items"], [])
+        self.assertEqual(board["status_counts"], {"accepted": 0, "preparing": 0})
+        self.assertIsNone(board["oldest_order_at"])
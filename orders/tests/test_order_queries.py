@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from orders.models import ArchivedOrder
+from orders.seeding import seed_orders
+from orders.views import (
+    CaptainDashboardView,
+    CaptainOrderListView,
+    ChefOrderListView,
+    TrackOrderView,
+    UserOrderDetailView,
+    UserOrderListView,
+)
+
+SIZES = (1, 10, 100)
+
+
+class OrderReadPathQueryTests(TestCase):
+    """
+    Every order read path runs the same number of queries for 1, 10 and 100
+    orders (and as many archived ones): no per-order lookups.
+    """
+
+    def assertFixedQueries(self, num, view, role, kwargs=lambda world: {}):
+        for size in SIZES:
+            with self.subTest(orders=size), transaction.atomic():
+                customer, chef, captain, orders = seed_orders(size, archived=size)
+                world = {
+                    "customer": customer, "chef": chef, "captain": captain, "order": orders[0].id,
+                    "archived": ArchivedOrder.objects.filter(user=customer).values_list("id", flat=True).first(),
+                }
+
+                request = APIRequestFactory().get("/")
+                force_authenticate(request, user=world[role])
+
+                with self.assertNumQueries(num):
+                    response = view.as_view()(request, **kwargs(world))
+                    response.render()
+
+                self.assertEqual(response.status_code, 200)
+                transaction.set_rollback(True)
+
+    def test_user_orders(self):
+        self.assertFixedQueries(4, UserOrderListView, "customer")
+
+    def test_order_detail(self):
+        self.assertFixedQueries(2, UserOrderDetailView, "customer", lambda world: {"pk": world["order"]})
+
+    def test_archived_order_detail(self):
+        self.assertFixedQueries(3, UserOrderDetailView, "customer", lambda world: {"pk": world["archived"]})
+
+    def test_track_order(self):
+        self.assertFixedQueries(2, TrackOrderView, "customer", lambda world: {"order_id": world["order"]})
+
+    def test_track_archived_order(self):
+        self.assertFixedQueries(3, TrackOrderView, "customer", lambda world: {"order_id": world["archived"]})
+
+    def test_chef_orders(self):
+        self.assertFixedQueries(2, ChefOrderListView, "chef")
+
+    def test_captain_orders(self):
+        self.assertFixedQueries(2, CaptainOrderListView, "captain")
+
+    def test_captain_dashboard(self):
+        self.assertFixedQueries(7, CaptainDashboardView, "captain")
@@ -0,0 +1,342 @@
+import json
+import os
+import re
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from cart.models import Cart, CartItem
+from food.models import Category, Favorite, SupportTicket
+from orders.models import Order
+from orders.seeding import seed_food_items, seed_orders
+from users.authentication import ClaimsRefreshToken, current_token_version
+from users.models import DeliveryAddress as UserAddress, UploadSession, User
+from users.uploads import start_upload
+
+BUDGETS_FILE = Path(__file__).with_name("query_budgets.json")
+
+# RECORD_QUERY_BUDGETS=1 manage.py test orders.tests.test_query_budgets
+# rewrites BUDGETS_FILE with the measured counts
+RECORD = os.environ.get("RECORD_QUERY_BUDGETS") == "1"
+
+SIZES = (3, 30)
+
+PASSWORD = "qc-password-1"
+
+METRICS_TOKEN = "qc-metrics-token"
+
+# Routes not exercised, with the reason
+SKIPPED = {
+    "^static/(?P<path>.*)$": "static files",
+    "api/users/social/": "calls Google",
+    "api/payments/create/": "calls Razorpay",
+    "api/payments/verify/": "needs a Razorpay-signed payment",
+}
+
+
+def case(role, kwargs=None, data=None, format="json", content_type=None, headers=None):
+    """
+    How to call one route/method: as `role` (None for anonymous) with URL
+    kwargs, a request body and extra headers, all built from the seeded
+    world. A `content_type` sends the body as raw bytes instead of `format`.
+    """
+    return {"role": role, "kwargs": kwargs or (lambda w: {}), "data": data or (lambda w: None),
+            "format": None if content_type else format, "content_type": content_type, "headers": headers or (lambda w: {})}
+
+
+def user_address(w):
+    return {"full_name": "Query Check", "phone": "9000000001", "pincode": "500001", "house": "1",
+            "street": "Test Street", "city": "Hyderabad", "state": "Telangana"}
+
+
+def order_address(w):
+    return {"full_name": "Query Check", "address": "1 Test Street", "city": "Hyderabad",
+            "pincode": "500001", "phone": "9000000001"}
+
+
+# (method, route) -> case; every route and method the URLconf exposes needs
+# an entry here or in SKIPPED
+ROUTE_CASES = {
+    ("GET", ""): case(None),
+    ("GET", "health/db-pool/"): case("admin"),
+    ("GET", "metrics"): case(None, headers=lambda w: {"HTTP_AUTHORIZATION": f"Bearer {METRICS_TOKEN}"}),
+
+    # users
+    ("GET", "api/users/health/"): case(None),
+    ("POST", "api/users/register/"): case(None, data=lambda w: {
+        "username": "qc_new", "email": "qc_new@example.com", "password": PASSWORD, "phone": "9000000099"}),
+    ("POST", "api/users/login/"): case(None, data=lambda w: {
+        "identifier": w["customer"].email, "password": PASSWORD}),
+    ("POST", "api/users/partner-register/"): case(None, data=lambda w: {
+        "username": "qc_partner", "email": "qc_partner@example.com", "password": PASSWORD, "phone": "9000000098"}),
+    ("POST", "api/users/partner-login/"): case(None, data=lambda w: {
+        "identifier": w["chef"].email, "password": PASSWORD}),
+    ("POST", "api/users/partner/update-role/"): case("captain", data=lambda w: {"role": "captain"}),
+    ("GET", "api/users/partner/get-role/"): case("chef"),
+    ("POST", "api/users/partner/documents/"): case("chef", data=lambda w: {"aadhaar_number": "123412341234"},
+                                                   format="multipart"),
+    ("POST", "api/users/partner/documents/uploads/"): case("chef", data=lambda w: {
+        "document": "pan_image", "filename": "pan.png", "size": 100, "sha256": "0" * 64}),
+    ("GET", "api/users/partner/documents/uploads/<uuid:upload_id>/"): case(
+        "chef", kwargs=lambda w: {"upload_id": w["upload"]}),
+    ("PUT", "api/users/partner/documents/uploads/<uuid:upload_id>/"): case(
+        "chef", kwargs=lambda w: {"upload_id": w["upload"]}, data=lambda w: b"0123456789",
+        content_type="application/octet-stream", headers=lambda w: {"HTTP_UPLOAD_OFFSET": "0"}),
+    ("DELETE", "api/users/partner/documents/uploads/<uuid:upload_id>/"): case(
+        "chef", kwargs=lambda w: {"upload_id": w["upload"]}),
+    ("PATCH", "api/users/update-online-status/"): case("captain", data=lambda w: {"is_online": True}),
+    ("GET", "api/users/profile/"): case("customer"),
+    ("PUT", "api/users/profile/"): case("customer", data=lambda w: {"city": "Pune"}),
+    ("PUT", "api/users/notifications/"): case("customer", data=lambda w: {"notifications_enabled": False}),
+    ("GET", "api/users/addresses/"): case("customer"),
+    ("POST", "api/users/addresses/"): case("customer", data=user_address),
+    ("GET", "api/users/addresses/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["user_address"]}),
+    ("PUT", "api/users/addresses/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["user_address"]},
+                                                   data=user_address),
+    ("PATCH", "api/users/addresses/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["user_address"]},
+                                                     data=lambda w: {"landmark": "Near the park"}),
+    ("DELETE", "api/users/addresses/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["user_address"]}),
+    ("POST", "api/users/forgot-password/"): case(None, data=lambda w: {"email": w["customer"].email}),
+    ("POST", "api/users/reset-password/"): case(None, data=lambda w: {
+        "email": w["customer"].email, "token": w["reset_token"], "new_password": "qc-password-2"}),
+    ("POST", "api/users/delete-account/"): case("customer"),
+
+    # food
+    ("GET", "api/food/categories/"): case(None),
+    ("GET", "api/food/items/"): case(None),
+    ("GET", "api/food/items/<int:pk>/"): case(None, kwargs=lambda w: {"pk": w["food"]}),
+    ("GET", "api/food/chef/items/"): case("chef"),
+    ("POST", "api/food/chef/items/"): case("chef", data=lambda w: {
+        "name": "New dish", "price": "99.00", "category": w["category"]}),
+    ("GET", "api/food/chef/items/<int:pk>/"): case("chef", kwargs=lambda w: {"pk": w["food"]}),
+    ("PUT", "api/food/chef/items/<int:pk>/"): case("chef", kwargs=lambda w: {"pk": w["food"]}, data=lambda w: {
+        "name": "Renamed dish", "price": "149.00", "category": w["category"]}),
+    ("PATCH", "api/food/chef/items/<int:pk>/"): case("chef", kwargs=lambda w: {"pk": w["food"]},
+                                                     data=lambda w: {"is_available": False}),
+    ("DELETE", "api/food/chef/items/<int:pk>/delete/"): case("chef", kwargs=lambda w: {"pk": w["food"]}),
+    ("GET", "api/food/favorites/"): case("customer"),
+    ("POST", "api/food/favorites/toggle/<int:food_id>/"): case("customer", kwargs=lambda w: {"food_id": w["food"]}),
+    ("GET", "api/food/support/"): case("customer"),
+    ("POST", "api/food/support/"): case("customer", data=lambda w: {"message": "Where is my order?"}),
+
+    # cart
+    ("GET", "api/cart/"): case("customer"),
+    ("POST", "api/cart/"): case("customer", data=lambda w: {"user": w["customer"].pk}),
+    ("POST", "api/cart/add/"): case("customer", data=lambda w: {"food_item_id": w["food"], "quantity": 1}),
+    ("DELETE", "api/cart/item/delete/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["cart_item"]}),
+    ("PUT", "api/cart/item/update/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["cart_item"]},
+                                                    data=lambda w: {"quantity": 3}),
+    ("PATCH", "api/cart/item/update/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["cart_item"]},
+                                                      data=lambda w: {"quantity": 3}),
+
+    # orders
+    ("POST", "api/orders/place/"): case("customer", data=lambda w: {
+        "delivery_address_id": w["order_address"],
+        "items": [{"food_item": w["food"], "quantity": 2}, {"food_item": w["other_food"], "quantity": 1}]}),
+    ("GET", "api/orders/my-orders/"): case("customer"),
+    ("GET", "api/orders/my-orders/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["order"]}),
+    ("POST", "api/orders/cancel/<int:order_id>/"): case("customer", kwargs=lambda w: {"order_id": w["pending"]}),
+    ("POST", "api/orders/address/create/"): case("customer", data=order_address),
+    ("GET", "api/orders/address/"): case("customer"),
+    ("GET", "api/orders/address/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["order_address"]}),
+    ("PUT", "api/orders/address/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["order_address"]},
+                                                  data=order_address),
+    ("PATCH", "api/orders/address/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["order_address"]},
+                                                    data=lambda w: {"city": "Pune"}),
+    ("DELETE", "api/orders/address/<int:pk>/"): case("customer", kwargs=lambda w: {"pk": w["order_address"]}),
+    ("GET", "api/orders/track/<int:order_id>/"): case("customer", kwargs=lambda w: {"order_id": w["order"]}),
+    ("PATCH", "api/orders/track/update-location/<int:order_id>/"): case(
+        "captain", kwargs=lambda w: {"order_id": w["order"]},
+        data=lambda w: {"driver_latitude": "17.400001", "driver_longitude": "78.480001"}),
+    ("GET", "api/orders/chef/orders/"): case("chef"),
+    ("POST", "api/orders/chef/accept/<int:order_id>/"): case("chef", kwargs=lambda w: {"order_id": w["pending"]}),
+    ("PATCH", "api/orders/chef/update-status/<int:order_id>/"): case(
+        "chef", kwargs=lambda w: {"order_id": w["order"]}, data=lambda w: {"status": "preparing"}),
+    ("GET", "api/orders/chef/kitchen-board/"): case("chef"),
+    ("GET", "api/orders/chef/earnings/"): case("chef"),
+    ("GET", "api/orders/captain/orders/"): case("captain"),
+    ("PATCH", "api/orders/captain/update-status/<int:order_id>/"): case(
+        "captain", kwargs=lambda w: {"order_id": w["order"]}, data=lambda w: {"status": "delivered"}),
+    ("POST", "api/orders/assign-captain/<int:order_id>/"): case("chef", kwargs=lambda w: {"order_id": w["order"]}),
+    ("GET", "api/orders/captain/earnings/"): case("captain"),
+    ("GET", "api/orders/captain/dashboard/"): case("captain"),
+}
+
+
+def walk(patterns, prefix=""):
+    """(route, pattern) for every endpoint of the URLconf, admin excluded."""
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            if route != "admin/":
+                yield from walk(pattern.url_patterns, route)
+        else:
+            yield route, pattern
+
+
+def methods(pattern):
+    view_class = getattr(pattern.callback, "view_class", None)
+    if view_class is None:
+        return ["GET"]
+    return [method.upper() for method in ("get", "post", "put", "patch", "delete") if hasattr(view_class, method)]
+
+
+def seed_world(size):
+    """Everything the route cases point at, with `size` rows behind every list."""
+    customer, chef, captain, orders = seed_orders(size, archived=size)
+    admin = User.objects.create(username="qc_admin", email="qc_admin@example.com", is_staff=True, is_superuser=True)
+
+    for user in (customer, chef):
+        user.set_password(PASSWORD)
+        user.save(update_fields=["password"])
+    customer.set_reset_token("qc-reset-token")
+
+    foods = seed_food_items(chef, size)
+    Category.objects.bulk_create([Category(name=f"Query Check {i}") for i in range(size)])
+
+    pending = Order.objects.bulk_create([
+        Order(user=customer, status="pending", total_amount=Decimal("99.00"),
+              delivery_address=orders[1].delivery_address)
+        for _ in range(size)
+    ])
+
+    cart = Cart.objects.create(user=customer)
+    cart_items = CartItem.objects.bulk_create([CartItem(cart=cart, food_item=food, quantity=1) for food in foods])
+    Favorite.objects.bulk_create([Favorite(user=customer, food_item=food) for food in foods[1:]])
+    SupportTicket.objects.bulk_create([SupportTicket(user=customer, message=f"Ticket {i}") for i in range(size)])
+    user_addresses = UserAddress.objects.bulk_create([
+        UserAddress(user=customer, full_name="Query Check", phone="9000000001", pincode="500001", house=str(i),
+                    street="Test Street", city="Hyderabad", state="Telangana")
+        for i in range(size)
+    ])
+    uploads = UploadSession.objects.bulk_create([
+        UploadSession(user=chef, document="pan_image", filename="pan.png", size=100, sha256="0" * 64)
+        for _ in range(size)
+    ])
+    start_upload(uploads[0])
+
+    return {
+        "customer": customer,
+        "chef": chef,
+        "captain": captain,
+        "admin": admin,
+        "reset_token": "qc-reset-token",
+        "order": orders[1].id,
+        "order_address": orders[1].delivery_address_id,
+        "pending": pending[0].id,
+        "food": foods[0].id,
+        "other_food": foods[1].id,
+        "category": foods[0].category_id,
+        "cart_item": cart_items[0].id,
+        "user_address": user_addresses[0].id,
+        "upload": uploads[0].id,
+    }
+
+
+def route_calls():
+    """(method, route) of every endpoint, and the ones with neither a case nor a reason to skip."""
+    calls, missing = [], []
+    for route, pattern in walk(get_resolver().url_patterns):
+        if route in SKIPPED:
+            continue
+        for method in methods(pattern):
+            (calls if (method, route) in ROUTE_CASES else missing).append((method, route))
+    return calls, missing
+
+
+@override_settings(
+    # Private cache, emptied before every request: cold paths are the worst case
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                        "LOCATION": "orders-tests-query-budgets"}},
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    METRICS_BEARER_TOKEN=METRICS_TOKEN,
+)
+class QueryBudgetTests(TestCase):
+    """
+    Calls every API route (every method) as the right role on seeded data of
+    SIZES[0] and SIZES[1] rows per list, archived orders included, and fails
+    when a route's query count grows with the data or exceeds its budget in
+    query_budgets.json.
+    """
+
+    def setUp(self):
+        upload_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(upload_dir.cleanup)
+
+        uploads = override_settings(UPLOAD_SESSION_DIR=upload_dir.name)
+        uploads.enable()
+        self.addCleanup(uploads.disable)
+
+    def test_every_route_has_a_case(self):
+        _, missing = route_calls()
+        self.assertEqual(missing, [], "add a case to ROUTE_CASES (or a reason to SKIPPED)")
+
+    def test_query_counts_are_flat_and_within_budget(self):
+        calls, _ = route_calls()
+        counts = {size: self.measure(size, calls) for size in SIZES}
+        small, large = SIZES
+
+        if RECORD:
+            BUDGETS_FILE.write_text(json.dumps(
+                {f"{method} /{route}": max(counts[small][f"{method} /{route}"], counts[large][f"{method} /{route}"])
+                 for method, route in sorted(calls, key=lambda call: (call[1], call[0]))},
+                indent=2,
+            ) + "\n")
+
+        budgets = json.loads(BUDGETS_FILE.read_text())
+
+        for method, route in calls:
+            key = f"{method} /{route}"
+            before, after = counts[small][key], counts[large][key]
+
+            with self.subTest(key):
+                self.assertLessEqual(after, before, f"grows with data ({before} -> {after})")
+                self.assertIn(key, budgets, "no recorded budget")
+                self.assertLessEqual(after, budgets[key], "over budget")
+
+    def measure(self, size, calls):
+        counts = {}
+
+        with transaction.atomic():
+            world = seed_world(size)
+            client = APIClient()
+            tokens = {role: ClaimsRefreshToken.for_user(world[role]).access_token
+                      for role in {spec["role"] for spec in ROUTE_CASES.values() if spec["role"]}}
+
+            for method, route in calls:
+                spec = ROUTE_CASES[(method, route)]
+                url = "/" + route
+                for name, value in spec["kwargs"](world).items():
+                    url = re.sub(rf"<(?:\w+:)?{name}>", str(value), url)
+
+                data = spec["data"](world)
+
+                # Every call starts from the same seeded state
+                with transaction.atomic():
+                    cache.clear()
+                    # Real bearer tokens, so authentication is counted too; the
+                    # token version is cached, as it is between a user's requests
+                    client.credentials()
+                    if spec["role"]:
+                        current_token_version(world[spec["role"]].pk)
+                        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[spec['role']]}")
+                    with CaptureQueriesContext(connection) as ctx:
+                        response = client.generic(method, url, **spec["headers"](world)) if data is None else getattr(
+                            client, method.lower())(url, data, format=spec["format"],
+                                                    content_type=spec["content_type"], **spec["headers"](world))
+                    transaction.set_rollback(True)
+
+                key = f"{method} /{route}"
+                self.assertLess(response.status_code, 400, f"{key} returned {response.status_code} with {size} rows")
+                counts[key] = len(ctx.captured_queries)
+
+            transaction.set_rollback(True)
+
+        return counts
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase, tag
+from django.utils import timezone
+
+from food.models import FoodItem, SupportTicket
+from maakaswad.plans import sequential_scans
+from orders.models import Order
+from orders.seeding import seed_marketplace
+
+ORDERS = 20_000
+
+
+def hot_queries(data):
+    """The filters behind the busiest endpoints, on one seeded user of each kind."""
+    customer = data["customers"][0]
+    chef = data["chefs"][0]
+    captain = data["captains"][0]
+    category = data["categories"][0]
+    now = timezone.now()
+
+    return {
+        "user-orders": Order.objects.filter(user=customer).order_by("-created_at"),
+        "chef-orders": Order.objects.filter(Q(assigned_chef=chef) | Q(status="pending")),
+        "chef-earnings": Order.objects.filter(assigned_chef=chef, status="delivered"),
+        "kitchen-board": Order.objects.filter(assigned_chef=chef, status__in=("accepted", "preparing")),
+        "captain-orders": Order.objects.filter(assigned_captain=captain).order_by("-created_at"),
+        "captain-earnings": Order.objects.filter(
+            assigned_captain=captain, status="delivered", created_at__gte=now - timedelta(days=7)
+        ),
+        "pending-sweep": Order.objects.filter(status="pending", created_at__lt=now - timedelta(minutes=45)),
+        "food-by-category": FoodItem.objects.filter(is_available=True, category=category),
+        "chef-menu": FoodItem.objects.filter(chef=chef),
+        "support-tickets": SupportTicket.objects.filter(user=customer).order_by("-created_at"),
+    }
+
+
+@tag("slow")
+class HotQueryPlanTests(TestCase):
+    """
+    EXPLAINs the hot order / catalog / ticket queries on a marketplace-shaped
+    dataset of ORDERS orders and fails if any of them falls back to a
+    sequential scan. Skip with --exclude-tag slow.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_marketplace(ORDERS)
+
+        # Fresh planner statistics for the seeded rows
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                for model in (Order, FoodItem, SupportTicket):
+                    cursor.execute(f"ANALYZE {model._meta.db_table}")
+            else:
+                cursor.execute("ANALYZE")
+
+    def test_hot_queries_use_an_index(self):
+        for name, queryset in hot_queries(self.data).items():
+            with self.subTest(name):
+                plan = queryset.explain()
+                self.assertEqual(sequential_scans(plan), [], plan)
@@ -20,6 +20,7 @@ from .views import (
     ChefOrderListView,
     ChefAcceptOrderView,
     ChefUpdateStatusView,
+    ChefKitchenBoardView,
     ChefEarningsView,
 
     # Captain
@@ -60,6 +61,9 @@ urlpatterns = [
     path('chef/accept/<int:order_id>/', ChefAcceptOrderView.as_view(), name='chef-accept-order'),
     path('chef/update-status/<int:order_id>/', ChefUpdateStatusView.as_view(), name='chef-update-status'),
 
+    # ⭐ CHEF KITCHEN BOARD
+    path('chef/kitchen-board/', ChefKitchenBoardView.as_view(), name='chef-kitchen-board'),
+
     # ⭐ CHEF EARNINGS
     path('chef/earnings/', ChefEarningsView.as_view(), name='chef-earnings'),
 
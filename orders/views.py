@@ -1,6 +1,7 @@
 ﻿import logging
 from datetime import timedelta
 from django.utils.timezone import now
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Sum
 
@@ -8,7 +9,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Order, DeliveryAddress
+from .models import ArchivedOrder, Order, DeliveryAddress
 from .serializers import (
     OrderSerializer,
     OrderDetailSerializer,
@@ -18,6 +19,11 @@ from .serializers import (
     ChefStatusUpdateSerializer,
     CaptainStatusUpdateSerializer,
 )
+from .encoders import encode_orders
+from .archive import archived_totals, merge_history
+from .kitchen import invalidate_kitchen_board, kitchen_board
+from maakaswad.metrics import LOCATION_UPDATES
+from maakaswad.sparse import SparseFieldsViewMixin, prune_queryset, sparse_requested
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +42,7 @@ class PlaceOrderView(APIView):
 
         if serializer.is_valid():
             order = serializer.save()
+            order = Order.objects.with_details().get(pk=order.pk)
             return Response(OrderDetailSerializer(order).data, status=201)
 
         return Response(serializer.errors, status=400)
@@ -44,20 +51,48 @@ class PlaceOrderView(APIView):
 # ==========================================================
 # 🛒 CUSTOMER - My Orders
 # ==========================================================
-class UserOrderListView(generics.ListAPIView):
+class UserOrderListView(SparseFieldsViewMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = OrderSerializer
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return Order.objects.with_details().filter(user=self.request.user)
 
+    def get_archived_queryset(self):
+        return ArchivedOrder.objects.with_details().filter(user=self.request.user)
 
-class UserOrderDetailView(generics.RetrieveAPIView):
+    def list(self, request, *args, **kwargs):
+        # 🗄️ history = hot orders + archived orders, newest first
+        hot = self.filter_queryset(self.get_queryset())
+        archived = self.filter_queryset(self.get_archived_queryset())
+
+        if sparse_requested(request):
+            hot_data = self.get_serializer(hot, many=True).data
+            archived_data = self.get_serializer(archived, many=True).data
+        else:
+            # ⚡ same payload as OrderSerializer, built from .values() rows
+            hot_data = encode_orders(hot)
+            archived_data = encode_orders(archived)
+
+        return Response(merge_history(hot_data, archived_data))
+
+
+class UserOrderDetailView(SparseFieldsViewMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = OrderDetailSerializer
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return Order.objects.with_details().filter(user=self.request.user)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # 🗄️ older finished orders live in the archive
+            archived = self.filter_queryset(
+                ArchivedOrder.objects.with_details().filter(user=self.request.user)
+            )
+            return get_object_or_404(archived, pk=self.kwargs['pk'])
 
 
 # ==========================================================
@@ -75,8 +110,11 @@ class CancelOrderView(APIView):
         if now() - order.created_at > timedelta(minutes=2):
             return Response({"detail": "Cancel period expired."}, status=400)
 
-        order.status = "cancelled"
-        order.save(update_fields=["status"])
+        # Conditional write: a chef accepting (or the sweeper cancelling)
+        # since the read above wins instead of being overwritten
+        cancelled = Order.objects.filter(id=order.id, status="pending").update(status="cancelled")
+        if not cancelled:
+            return Response({"detail": "Order cannot be cancelled."}, status=400)
 
         return Response({"detail": "Order cancelled successfully."})
 
@@ -84,7 +122,7 @@ class CancelOrderView(APIView):
 # ==========================================================
 # 👩‍🍳 CHEF - View Orders
 # ==========================================================
-class ChefOrderListView(generics.ListAPIView):
+class ChefOrderListView(SparseFieldsViewMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = OrderSerializer
 
@@ -92,11 +130,18 @@ class ChefOrderListView(generics.ListAPIView):
         if self.request.user.role != "chef":
             return Order.objects.none()
 
-        return Order.objects.filter(
+        return Order.objects.with_details().filter(
             Q(assigned_chef=self.request.user) |
             Q(status="pending")
         ).distinct().order_by("-created_at")
 
+    def list(self, request, *args, **kwargs):
+        if sparse_requested(request):
+            return super().list(request, *args, **kwargs)
+
+        # ⚡ same payload as OrderSerializer, built from .values() rows
+        return Response(encode_orders(self.filter_queryset(self.get_queryset())))
+
 
 # ==========================================================
 # 👩‍🍳 CHEF - Accept Order (🔥 UPDATED ONLY)
@@ -109,16 +154,19 @@ class ChefAcceptOrderView(APIView):
         if request.user.role != "chef":
             return Response({"detail": "Only chef allowed."}, status=403)
 
-        order = get_object_or_404(Order, id=order_id)
+        # Assign only chef, and only while still pending: a single conditional
+        # write, so two chefs (or a chef and the sweeper's cancellation)
+        # can't both win
+        accepted = Order.objects.filter(id=order_id, status="pending").update(
+            assigned_chef=request.user,
+            status="accepted"
+        )
 
-        if order.status != "pending":
+        if not accepted:
+            get_object_or_404(Order, id=order_id)
             return Response({"detail": "Order already taken."}, status=400)
 
-        # Assign only chef
-        order.assigned_chef = request.user
-        order.status = "accepted"
-
-        order.save(update_fields=["assigned_chef", "status"])
+        invalidate_kitchen_board(request.user.id)
 
         return Response({
             "detail": "Order accepted successfully"
@@ -150,15 +198,32 @@ class ChefUpdateStatusView(APIView):
 
         if serializer.is_valid():
             serializer.save()
+            invalidate_kitchen_board(request.user.id)
             return Response({"detail": "Order status updated by chef."})
 
         return Response(serializer.errors, status=400)
 
 
+# ==========================================================
+# 👩‍🍳 CHEF - Kitchen Board
+# ==========================================================
+class ChefKitchenBoardView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    # 🛢️ rebuilt right after invalidation; a lagging replica would be cached
+    read_from_primary = True
+
+    def get(self, request):
+
+        if request.user.role != "chef":
+            return Response({"detail": "Only chef allowed."}, status=403)
+
+        return Response(kitchen_board(request.user.id))
+
+
 # ==========================================================
 # 🚴 CAPTAIN - View Orders
 # ==========================================================
-class CaptainOrderListView(generics.ListAPIView):
+class CaptainOrderListView(SparseFieldsViewMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = OrderSerializer
 
@@ -166,10 +231,17 @@ class CaptainOrderListView(generics.ListAPIView):
         if self.request.user.role != "captain":
             return Order.objects.none()
 
-        return Order.objects.filter(
+        return Order.objects.with_details().filter(
             assigned_captain=self.request.user
         ).order_by("-created_at")
 
+    def list(self, request, *args, **kwargs):
+        if sparse_requested(request):
+            return super().list(request, *args, **kwargs)
+
+        # ⚡ same payload as OrderSerializer, built from .values() rows
+        return Response(encode_orders(self.filter_queryset(self.get_queryset())))
+
 
 # ==========================================================
 # 🚴 CAPTAIN - Update Status (🔥 UPDATED ONLY)
@@ -198,6 +270,7 @@ class CaptainUpdateStatusView(APIView):
 
             old_status = order.status
             serializer.save()
+            invalidate_kitchen_board(order.assigned_chef_id)
 
             # 🔥 EARNINGS FIX
             if order.status == "delivered" and old_status != "delivered":
@@ -231,6 +304,7 @@ class AssignCaptainView(APIView):
         order.assigned_captain = captain
         order.status = "assigned"
         order.save(update_fields=["assigned_captain", "status"])
+        invalidate_kitchen_board(order.assigned_chef_id)
 
         return Response({
             "detail": "Captain assigned automatically",
@@ -243,15 +317,27 @@ class AssignCaptainView(APIView):
 # ==========================================================
 class TrackOrderView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # 🛢️ driver location is written by the captain, not this client
+    read_from_primary = True
 
     def get(self, request, order_id):
-        order = get_object_or_404(
-            Order,
-            id=order_id,
-            user=request.user
-        )
+        serializer = OrderSerializer(context={'request': request})
 
-        return Response(OrderSerializer(order).data)
+        try:
+            order = get_object_or_404(
+                prune_queryset(Order.objects.with_details(), serializer),
+                id=order_id,
+                user=request.user
+            )
+        except Http404:
+            # 🗄️ older finished orders live in the archive
+            order = get_object_or_404(
+                prune_queryset(ArchivedOrder.objects.with_details(), serializer),
+                id=order_id,
+                user=request.user
+            )
+
+        return Response(OrderSerializer(order, context={'request': request}).data)
 
 
 # ==========================================================
@@ -279,6 +365,7 @@ class UpdateDriverLocationView(APIView):
 
         if serializer.is_valid():
             serializer.save()
+            LOCATION_UPDATES.inc()
             return Response({"detail": "Driver location updated."})
 
         return Response(serializer.errors, status=400)
@@ -295,7 +382,7 @@ class CreateDeliveryAddressView(generics.CreateAPIView):
         serializer.save(user=self.request.user)
 
 
-class ListDeliveryAddressesView(generics.ListAPIView):
+class ListDeliveryAddressesView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = DeliveryAddressSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -303,7 +390,7 @@ class ListDeliveryAddressesView(generics.ListAPIView):
         return DeliveryAddress.objects.filter(user=self.request.user)
 
 
-class DeliveryAddressDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DeliveryAddressDetailView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = DeliveryAddressSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -343,6 +430,11 @@ class ChefEarningsView(APIView):
 
         orders_completed = delivered_orders.count()
 
+        # 🗄️ older delivered orders are in the archive (today/week never are)
+        archived = archived_totals(assigned_chef=request.user, status="delivered")
+        total_earnings += archived["total_amount"] or 0
+        orders_completed += archived["orders"]
+
         return Response({
             "today": today_earnings,
             "week": week_earnings,
@@ -380,11 +472,15 @@ class CaptainEarningsView(APIView):
             for o in delivered_orders.filter(created_at__gte=now() - timedelta(days=7))
         )
 
+        # 🗄️ older delivered orders are in the archive (today/week never are)
+        archived = archived_totals(assigned_captain=request.user, status="delivered")
+        captain_total += archived["delivery_fee"] or 0
+
         return Response({
             "captain_today": captain_today,
             "captain_week": captain_week,
             "captain_total": captain_total,
-            "orders": delivered_orders.count(),
+            "orders": delivered_orders.count() + archived["orders"],
         })
 
 
@@ -406,7 +502,10 @@ class CaptainDashboardView(APIView):
         in_progress = orders.filter(
             status__in=["picked_up", "out_for_delivery"]
         ).count()
-        delivered = orders.filter(status="delivered").count()
+        delivered = orders.filter(status="delivered").count() + ArchivedOrder.objects.filter(
+            assigned_captain=request.user,
+            status="delivered"
+        ).count()
 
         earnings_today = sum(
             o.delivery_fee
@@ -416,20 +515,22 @@ class CaptainDashboardView(APIView):
             )
         )
 
-        active_orders = orders.exclude(status="delivered")
+        active_orders = orders.with_details().exclude(status="delivered")
 
         # 👇👇 EE DEBUG CODE IKKADA ADD CHEYYI 👇👇
-        print("Captain ID:", request.user.id)
-        print("Captain:", request.user.username)
-        print("Assigned Orders:", orders.count())
-
-        for order in orders:
-            print(
-                "Order:",
-                order.id,
-                order.status,
-                order.assigned_captain_id,
-            )
+        # (debug only: each line below costs a query on every dashboard poll)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Captain ID: %s", request.user.id)
+            logger.debug("Captain: %s", request.user.username)
+            logger.debug("Assigned Orders: %s", orders.count())
+
+            for order in orders:
+                logger.debug(
+                    "Order: %s %s %s",
+                    order.id,
+                    order.status,
+                    order.assigned_captain_id,
+                )
 
         # 👇 RETURN
         return Response({
@@ -437,5 +538,5 @@ class CaptainDashboardView(APIView):
             "in_progress": in_progress,
             "delivered": delivered,
             "earnings_today": earnings_today,
-            "active_orders": OrderSerializer(active_orders, many=True).data,
+            "active_orders": encode_orders(active_orders),
         })
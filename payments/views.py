@@ -1,86 +1,116 @@
-import razorpay
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
+import hashlib
+import hmac
+
+import httpx
 from django.conf import settings
-from orders.models import Order
-from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+
+from maakaswad.async_views import json_response, request_data
+from maakaswad.httpclient import send
+from orders.models import Order
+
+RAZORPAY_ORDERS_URL = 'https://api.razorpay.com/v1/orders'
+
+
+def razorpay_error(response):
+    """Error description from a Razorpay API error body."""
+    try:
+        return response.json()['error']['description']
+    except (ValueError, KeyError, TypeError):
+        return f'Razorpay error {response.status_code}'
 
-# Initialize Razorpay client using your Razorpay key and secret
-razorpay_client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
 
+def valid_payment_signature(razorpay_order_id, razorpay_payment_id, razorpay_signature):
+    """Razorpay checkout signature: HMAC-SHA256 of 'order_id|payment_id' with the key secret."""
+    if not (razorpay_order_id and razorpay_payment_id and razorpay_signature):
+        return False
 
-class CreateRazorpayOrder(APIView):
+    expected = hmac.new(
+        settings.RAZORPAY_KEY_SECRET.encode(),
+        f'{razorpay_order_id}|{razorpay_payment_id}'.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    return hmac.compare_digest(expected, razorpay_signature)
+
+
+# Async views: the Razorpay round trip doesn't hold a worker thread (see maakaswad/asgi.py)
+@method_decorator(csrf_exempt, name='dispatch')
+class CreateRazorpayOrder(View):
     """
     Creates a Razorpay Order from a given local Order ID and total amount.
     """
 
-    def post(self, request):
+    async def post(self, request):
+        data = request_data(request)
+        if data is None:
+            return json_response({'error': 'Invalid JSON body'}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            order_id = request.data.get('order_id')
-            order = Order.objects.get(id=order_id)
-
-            amount_in_paise = int(order.total_amount * 100)  # Razorpay expects amount in paise
-
-            razorpay_order = razorpay_client.order.create({
-                'amount': amount_in_paise,
-                'currency': 'INR',
-                'payment_capture': 1,
-                'notes': {
-                    'order_id': str(order.id),
-                    'user': order.user.username
-                }
-            })
-
-            return Response({
-                'razorpay_order_id': razorpay_order['id'],
-                'razorpay_key': settings.RAZORPAY_KEY_ID,
-                'amount': amount_in_paise,
-                'currency': 'INR',
-                'order_id': order.id
-            }, status=status.HTTP_200_OK)
-
-        except Order.DoesNotExist:
-            return Response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            order = await Order.objects.select_related('user').aget(id=data.get('order_id'))
+        except (Order.DoesNotExist, ValueError):
+            return json_response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        amount_in_paise = int(order.total_amount * 100)  # Razorpay expects amount in paise
+
+        try:
+            response = await send(
+                'POST',
+                RAZORPAY_ORDERS_URL,
+                auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                json={
+                    'amount': amount_in_paise,
+                    'currency': 'INR',
+                    'payment_capture': 1,
+                    'notes': {
+                        'order_id': str(order.id),
+                        'user': order.user.username
+                    }
+                },
+            )
+        except httpx.HTTPError as e:
+            return json_response({'error': str(e) or 'Razorpay unreachable'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if response.status_code != 200:
+            return json_response({'error': razorpay_error(response)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return json_response({
+            'razorpay_order_id': response.json()['id'],
+            'razorpay_key': settings.RAZORPAY_KEY_ID,
+            'amount': amount_in_paise,
+            'currency': 'INR',
+            'order_id': order.id
+        }, status=status.HTTP_200_OK)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
-class VerifyPayment(APIView):
+class VerifyPayment(View):
     """
     Verifies Razorpay payment signature and updates order status.
     """
 
-    def post(self, request):
+    async def post(self, request):
+        data = request_data(request)
+        if data is None:
+            return json_response({'error': 'Invalid JSON body'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Verifying signature (locally, no Razorpay call)
+        if not valid_payment_signature(
+            data.get('razorpay_order_id'),
+            data.get('razorpay_payment_id'),
+            data.get('razorpay_signature'),
+        ):
+            return json_response({'error': 'Invalid payment signature'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Update order status to 'paid'
         try:
-            data = request.data
-            razorpay_order_id = data.get('razorpay_order_id')
-            razorpay_payment_id = data.get('razorpay_payment_id')
-            razorpay_signature = data.get('razorpay_signature')
-            order_id = data.get('order_id')
-
-            # Verifying signature
-            params_dict = {
-                'razorpay_order_id': razorpay_order_id,
-                'razorpay_payment_id': razorpay_payment_id,
-                'razorpay_signature': razorpay_signature
-            }
-
-            try:
-                razorpay_client.utility.verify_payment_signature(params_dict)
-            except razorpay.errors.SignatureVerificationError:
-                return Response({'error': 'Invalid payment signature'}, status=status.HTTP_400_BAD_REQUEST)
-
-            # Update order status to 'paid'
-            order = Order.objects.get(id=order_id)
-            order.status = 'paid'
-            order.save()
-
-            return Response({'message': 'Payment verified successfully', 'order_id': order.id}, status=status.HTTP_200_OK)
-
-        except Order.DoesNotExist:
-            return Response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            order = await Order.objects.aget(id=data.get('order_id'))
+        except (Order.DoesNotExist, ValueError):
+            return json_response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        order.status = 'paid'
+        await order.asave(update_fields=['status'])
+
+        return json_response({'message': 'Payment verified successfully', 'order_id': order.id}, status=status.HTTP_200_OK)
@@ -1,15 +1,37 @@
 from django.contrib import admin
+from .authentication import bump_token_version
 from .models import User
 from .models import DeliveryAddress
+from .models import OutboundEmail
+from .models import UploadSession
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = ('id', 'username', 'email', 'phone', 'role', 'captain_id', 'vehicle_number', 'city')
     list_filter = ('role', 'city')
     search_fields = ('username', 'email', 'phone', 'captain_id')
+    readonly_fields = ('token_version',)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and {'role', 'is_approved', 'is_active'} & set(form.changed_data):
+            bump_token_version(obj)
 
 @admin.register(DeliveryAddress)
 class DeliveryAddressAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'full_name', 'phone', 'city', 'state', 'pincode', 'default')
     search_fields = ('full_name', 'phone', 'city')
     list_filter = ('city', 'state', 'default')
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'to', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to', 'subject', 'dedup_key')
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'document', 'received', 'size', 'status', 'updated_at')
+    list_filter = ('status', 'document')
+    raw_id_fields = ('user',)
@@ -1,18 +1,82 @@
-from django.contrib.auth.backends import ModelBackend
-from django.db.models import Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .backends import EmailUsernamePhoneBackend  # noqa: F401  (old import path; settings use users.backends)
+from .models import ClaimsUser
 
 User = get_user_model()
 
-class EmailUsernamePhoneBackend(ModelBackend):
-    def authenticate(self, request, username=None, password=None, **kwargs):
+
+# ==========================================================
+# 🔑 Claims-based JWT authentication
+# ==========================================================
+# Access and refresh tokens carry the user's role, approval flag and
+# token_version. While that version is current, request.user is a ClaimsUser
+# built from the claims, so views that only check request.user.id / .role /
+# .is_approved run without a users query; touching any other field loads the
+# row once. The current version per user is read from the cache (the row on a
+# miss); bump_token_version() after changing role or approval makes older
+# claims stale, and requests with stale (or claim-less, pre-version) tokens
+# load the user from the database exactly like simplejwt's JWTAuthentication.
+
+CLAIM_FIELDS = ('role', 'is_approved', 'token_version')
+
+
+def _version_key(user_id):
+    return f'users:token_version:{user_id}'
+
+
+def current_token_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = User.objects.filter(pk=user_id).values_list('token_version', flat=True).first()
+        if version is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        cache.set(_version_key(user_id), version, settings.JWT_CLAIMS_VERSION_CACHE_SECONDS)
+    return version
+
+
+def bump_token_version(user):
+    """Call after changing a user's role, approval or active flag."""
+    User.objects.filter(pk=user.pk).update(token_version=models.F('token_version') + 1)
+    user.token_version = User.objects.filter(pk=user.pk).values_list('token_version', flat=True).get()
+    cache.set(_version_key(user.pk), user.token_version, settings.JWT_CLAIMS_VERSION_CACHE_SECONDS)
+
+
+def forget_token_version(user_id):
+    cache.delete(_version_key(user_id))
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        return token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
         try:
-            user = User.objects.get(
-                Q(email=username) | Q(username=username) | Q(phone=username)
-            )
-        except User.DoesNotExist:
-            return None
-
-        if user.check_password(password):
-            return user
-        return None
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        if any(field not in validated_token for field in CLAIM_FIELDS):
+            return super().get_user(validated_token)
+
+        if validated_token['token_version'] != current_token_version(user_id):
+            return super().get_user(validated_token)
+
+        return ClaimsUser.from_db(
+            None,
+            ['id', *CLAIM_FIELDS],
+            [user_id, *(validated_token[field] for field in CLAIM_FIELDS)],
+        )
@@ -1,16 +1,51 @@
+import re
+
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
+PHONE_SHAPE = re.compile(r'^\+?[\d\s()-]+$')
+
+
+def find_login_user(identifier):
+    """
+    The user an email / phone / username login identifier belongs to, or None.
+
+    The identifier's shape picks the column, so a login is one index probe
+    (LOWER(email), phone or LOWER(username), see User.Meta.indexes) rather
+    than an OR over all three, which no index serves. Usernames may contain
+    '@' or be all digits, so those shapes fall back to a username probe.
+    """
+    identifier = str(identifier).strip()
+    lowered = identifier.lower()
+
+    if '@' in identifier:
+        probes = [('email_lower', lowered), ('username_lower', lowered)]
+    elif PHONE_SHAPE.match(identifier):
+        probes = [('phone', identifier), ('username_lower', lowered)]
+    else:
+        probes = [('username_lower', lowered)]
+
+    users = User.objects.alias(email_lower=Lower('email'), username_lower=Lower('username'))
+    for lookup, value in probes:
+        # No .first(): its ORDER BY id can steer the planner onto the primary key
+        match = list(users.filter(**{lookup: value})[:1])
+        if match:
+            return match[0]
+    return None
+
+
 class EmailUsernamePhoneBackend(ModelBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
-        try:
-            user = User.objects.get(
-                Q(username=username) | Q(email=username) | Q(phone=username)
-            )
-        except User.DoesNotExist:
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if not username or password is None:
+            return None
+
+        user = find_login_user(username)
+        if user is None:
             return None
 
         if user.check_password(password) and self.user_can_authenticate(user):
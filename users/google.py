@@ -0,0 +1,157 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+
+import httpx
+import jwt
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from maakaswad.httpclient import send
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================================
+# 🔑 Google sign-in token verification
+# ==========================================================
+# ID tokens are checked locally against Google's signing keys (JWKS), kept
+# in process memory: fetched on first use, refreshed in a background
+# thread once older than their Cache-Control max-age, and re-fetched at
+# once when a token names an unknown key (Google rotated). Legacy access
+# tokens still go to the userinfo endpoint over the shared async client.
+#
+# Either way the resulting profile is cached for GOOGLE_TOKEN_CACHE_SECONDS
+# (never past an ID token's expiry), so a repeat login with the same token
+# makes no round trip at all.
+
+GOOGLE_ISSUERS = ['accounts.google.com', 'https://accounts.google.com']
+
+# Unknown key ids and stale key sets don't trigger more than one fetch per
+# this many seconds, even while fetches fail
+MIN_REFETCH_SECONDS = 60
+
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+class InvalidGoogleToken(Exception):
+    pass
+
+
+class GoogleKeySet:
+
+    def __init__(self, url):
+        self.url = url
+        self.keys = {}
+        self.max_age = settings.GOOGLE_JWKS_REFRESH_SECONDS
+        self.fetched_at = None
+        self.attempted_at = None
+        self.lock = threading.Lock()
+        self.refreshing = False
+
+    def get(self, kid):
+        now = time.monotonic()
+        # A failed fetch leaves fetched_at old: space out retries either way
+        may_fetch = self.attempted_at is None or now - self.attempted_at >= MIN_REFETCH_SECONDS
+
+        if kid not in self.keys:
+            if may_fetch:
+                self.refresh()
+        elif now - self.fetched_at >= self.max_age and may_fetch and not self.refreshing:
+            # Current keys keep verifying while the new set downloads
+            self.refreshing = True
+            threading.Thread(target=self.refresh, name='google-jwks', daemon=True).start()
+
+        key = self.keys.get(kid)
+        if key is None:
+            raise InvalidGoogleToken('Unknown signing key')
+        return key
+
+    def refresh(self):
+        with self.lock:
+            try:
+                self.attempted_at = time.monotonic()
+                response = httpx.get(self.url, timeout=httpx.Timeout(
+                    settings.OUTBOUND_HTTP_TIMEOUT, connect=settings.OUTBOUND_HTTP_CONNECT_TIMEOUT))
+                response.raise_for_status()
+                keyset = jwt.PyJWKSet.from_dict(response.json())
+            except (httpx.HTTPError, ValueError, jwt.PyJWTError):
+                logger.warning("Could not refresh Google signing keys from %s", self.url, exc_info=True)
+                return
+            finally:
+                self.refreshing = False
+
+            self.keys = {key.key_id: key for key in keyset.keys}
+            max_age = _MAX_AGE.search(response.headers.get('cache-control', ''))
+            self.max_age = int(max_age.group(1)) if max_age else settings.GOOGLE_JWKS_REFRESH_SECONDS
+            self.fetched_at = time.monotonic()
+
+
+_keysets = {}
+
+
+def google_keys():
+    url = settings.GOOGLE_JWKS_URL
+    if url not in _keysets:
+        _keysets[url] = GoogleKeySet(url)
+    return _keysets[url]
+
+
+def verify_id_token(id_token):
+    """Profile and expiry (epoch seconds) of a valid ID token for one of our client ids."""
+    if not settings.GOOGLE_CLIENT_IDS:
+        raise InvalidGoogleToken('Google ID tokens are not configured (GOOGLE_CLIENT_IDS)')
+
+    try:
+        kid = jwt.get_unverified_header(id_token).get('kid')
+        claims = jwt.decode(
+            id_token,
+            google_keys().get(kid).key,
+            algorithms=['RS256'],
+            audience=settings.GOOGLE_CLIENT_IDS,
+            issuer=GOOGLE_ISSUERS,
+            options={'require': ['exp', 'iat', 'iss', 'aud', 'sub']},
+        )
+    except jwt.PyJWTError as exc:
+        raise InvalidGoogleToken(str(exc))
+
+    if not claims.get('email') or not claims.get('email_verified'):
+        raise InvalidGoogleToken('Email missing or not verified')
+
+    return {'email': claims['email'], 'name': claims.get('name')}, claims['exp']
+
+
+async def google_profile(id_token=None, access_token=None):
+    """{'email', 'name'} of the Google account behind an ID token (preferred) or access token."""
+    token = id_token or access_token
+    cache_key = f'google:profile:{hashlib.sha256(token.encode()).hexdigest()}'
+
+    profile = await cache.aget(cache_key)
+    if profile is not None:
+        return profile
+
+    ttl = settings.GOOGLE_TOKEN_CACHE_SECONDS
+    if id_token:
+        # Off the event loop: a cold key set is fetched synchronously
+        profile, expires = await sync_to_async(verify_id_token, thread_sensitive=False)(id_token)
+        ttl = min(ttl, int(expires - time.time()))
+    else:
+        response = await send(
+            'GET',
+            settings.GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        if response.status_code != 200:
+            raise InvalidGoogleToken('Rejected by userinfo')
+
+        data = response.json()
+        if not data.get('email'):
+            raise InvalidGoogleToken('No email in userinfo')
+        profile = {'email': data['email'], 'name': data.get('name')}
+
+    if ttl > 0:
+        await cache.aset(cache_key, profile, ttl)
+    return profile
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from rest_framework.exceptions import Throttled
+
+from maakaswad.metrics import THROTTLED
+
+
+# ==========================================================
+# 🔐 Bounded password hashing
+# ==========================================================
+# PBKDF2 takes ~100 ms of CPU per hash. Every login, registration and
+# password reset hashes here instead of on the request thread, at most
+# PASSWORD_HASHING_CONCURRENCY at a time per worker process, so a burst
+# of sign-ins can't take every core from order traffic. Up to
+# PASSWORD_HASHING_QUEUE more wait for a slot; beyond that the request is
+# refused at once with a 429 rather than queueing behind the others.
+#
+# Only pure hashing runs on the executor: saves stay on the request
+# thread, which owns the database connection.
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASHING_CONCURRENCY,
+    thread_name_prefix='password-hashing',
+)
+_slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_CONCURRENCY + settings.PASSWORD_HASHING_QUEUE)
+
+
+class HashingBusy(Throttled):
+    default_detail = 'Too many sign-ins in progress, please retry shortly.'
+
+
+def run_hashing(func, *args):
+    if not _slots.acquire(blocking=False):
+        THROTTLED.labels('hashing_busy').inc()
+        raise HashingBusy(wait=1)
+
+    try:
+        future = _executor.submit(func, *args)
+    except BaseException:
+        _slots.release()
+        raise
+
+    future.add_done_callback(lambda _: _slots.release())
+    return future.result()
+
+
+def verify_password(user, raw_password):
+    """user.check_password(), including Django's rehash when hasher settings changed."""
+    rehash = []
+    valid = run_hashing(check_password, raw_password, user.password, rehash.append)
+
+    if rehash:
+        set_password(user, raw_password)
+        user.save(update_fields=['password'])
+    return valid
+
+
+def set_password(user, raw_password):
+    """user.set_password() on the executor; the caller saves."""
+    run_hashing(user.set_password, raw_password)
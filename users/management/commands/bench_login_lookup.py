@@ -0,0 +1,119 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+from maakaswad.bulkload import BulkLoader, next_id
+from maakaswad.plans import sequential_scans
+from users.backends import find_login_user
+from users.models import User
+
+
+def legacy_lookup(identifier):
+    """What LoginView / PartnerLoginView ran before find_login_user."""
+    return User.objects.filter(
+        Q(email__iexact=identifier) |
+        Q(phone=identifier) |
+        Q(username__iexact=identifier)
+    ).first()
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads a multi-million-row users table (rolled back afterwards) and "
+        "times login identifier lookups: the old email / phone / username OR "
+        "against find_login_user's single index probe, for email (mixed "
+        "case), phone and username identifiers. Fails if a probe's plan "
+        "scans the table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2_000_000)
+        parser.add_argument("--lookups", type=int, default=300, help="Timed lookups per identifier kind.")
+        parser.add_argument("--legacy-lookups", type=int, default=10,
+                            help="Timed lookups per kind for the old query (each is a table scan).")
+        parser.add_argument("--batch-size", type=int, default=50_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            base = self.load_users(options["users"], options["batch_size"])
+            self.stdout.write(f"Loaded {options['users']:,} users in {time.perf_counter() - started:.1f}s")
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {User._meta.db_table}" if connection.vendor == "postgresql" else "ANALYZE")
+
+            def picks(count):
+                return [rng.randrange(options["users"]) for _ in range(count)]
+
+            kinds = {
+                "email": lambda i: f"Bench.User{i}@Example.com",
+                "phone": lambda i: f"+91{7_000_000_000 + i}",
+                "username": lambda i: f"BENCH_user_{i}",
+            }
+
+            failures = []
+            for kind, identifier in kinds.items():
+                expected = base + picks(1)[0]
+                sample = identifier(expected - base)
+                user = find_login_user(sample)
+                if user is None or user.pk != expected:
+                    failures.append(f"{kind}: {sample!r} resolved to {user and user.pk}, expected {expected}")
+
+                plan = self.probe_plan(sample)
+                scans = sequential_scans(plan)
+                if scans:
+                    failures.append(f"{kind}: probe scans {', '.join(scans)}")
+                    self.stdout.write("    " + plan.replace("\n", "\n    "))
+
+                new = self.time(find_login_user, [identifier(i) for i in picks(options["lookups"])])
+                old = self.time(legacy_lookup, [identifier(i) for i in picks(options["legacy_lookups"])])
+                self.stdout.write(
+                    f"{kind:<9} probe  mean {new[0]:>9.3f} ms  p95 {new[1]:>9.3f} ms   "
+                    f"old OR  mean {old[0]:>9.3f} ms  p95 {old[1]:>9.3f} ms   "
+                    f"({old[0] / new[0]:,.0f}x)"
+                )
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError("\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("Every login identifier resolves with one index probe."))
+
+    @staticmethod
+    def load_users(count, batch_size):
+        users = BulkLoader(User, ["id", "username", "email", "phone", "role", "password"], batch_size=batch_size)
+        base = next_id(User)
+        for i in range(count):
+            users.add(base + i, f"bench_user_{i}", f"bench.user{i}@example.com", f"+91{7_000_000_000 + i}", "user", "!")
+        users.flush()
+        return base
+
+    @staticmethod
+    def probe_plan(identifier):
+        """EXPLAIN of the probe find_login_user makes first for this identifier."""
+        with CaptureQueriesContext(connection) as ctx:
+            find_login_user(identifier)
+
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {ctx.captured_queries[0]['sql']}")
+            rows = cursor.fetchall()
+        return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+    @staticmethod
+    def time(lookup, identifiers):
+        durations = []
+        for identifier in identifiers:
+            started = time.perf_counter()
+            lookup(identifier)
+            durations.append((time.perf_counter() - started) * 1000)
+        durations.sort()
+        return statistics.fmean(durations), durations[int(len(durations) * 0.95)]
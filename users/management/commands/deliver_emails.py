@@ -0,0 +1,55 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from users.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends due messages from the email outbox in batches over one SMTP "
+        "connection, retrying failures with backoff (see users/outbox.py)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--max-batches", type=int, default=None,
+                            help="Per run (default: until nothing is due).")
+        parser.add_argument("--every", type=int, default=None, metavar="SECONDS",
+                            help="Keep running, checking for due messages every SECONDS.")
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+
+        while True:
+            try:
+                self.deliver(connection, options)
+            finally:
+                # Don't hold an idle SMTP session between runs
+                connection.close()
+
+            if not options["every"]:
+                return
+
+            close_old_connections()
+            time.sleep(options["every"])
+
+    def deliver(self, connection, options):
+        sent = failed = batches = 0
+
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            batch_sent, batch_failed = deliver_batch(connection, options["batch_size"])
+            if not batch_sent and not batch_failed:
+                break
+
+            sent += batch_sent
+            failed += batch_failed
+            batches += 1
+
+            if not batch_sent and getattr(connection, "connection", None) is None:
+                # Server unreachable: leave the rest for the next run
+                break
+
+        self.stdout.write(f"Sent {sent} emails, {failed} failed or deferred.")
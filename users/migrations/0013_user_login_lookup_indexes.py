@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:20
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+from maakaswad.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('users', '0012_user_token_version_claimsuser'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(Lower('email'), name='user_email_lower'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(Lower('username'), name='user_username_lower'),
+        ),
+    ]
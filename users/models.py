@@ -1,5 +1,10 @@
-﻿from django.contrib.auth.models import AbstractUser
-from django.db import models
+﻿import uuid
+
+from django.contrib.auth.models import AbstractUser
+from django.db import models, transaction
+from django.db.models.functions import Lower
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from datetime import timedelta
@@ -90,12 +95,26 @@ class User(AbstractUser):
     reset_token = models.CharField(max_length=64, blank=True, null=True)
     reset_token_expiry = models.DateTimeField(blank=True, null=True)
 
+    # -------------------------------------------------------
+    # 🔑 JWT claims version
+    # -------------------------------------------------------
+    # Tokens carry role / is_approved / this number (users/authentication.py);
+    # bumping it makes the claims in every token issued so far stale.
+    token_version = models.PositiveIntegerField(default=0)
+
     # -------------------------------------------------------
     # Django Auth Config
     # -------------------------------------------------------
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'phone']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Case-insensitive login lookups (users.backends.find_login_user)
+            models.Index(Lower('email'), name='user_email_lower'),
+            models.Index(Lower('username'), name='user_username_lower'),
+        ]
+
     def __str__(self):
         return f"{self.email} ({self.role})"
 
@@ -128,6 +147,43 @@ class User(AbstractUser):
         )
 
 
+# -----------------------------------------------------------
+# 🔑 Token principal
+# -----------------------------------------------------------
+
+class ClaimsUser(User):
+    """
+    request.user for JWT requests whose claims are current: built from the
+    token without a query. Other fields are deferred; the first access to
+    any of them loads all of them in one query, after which it behaves like
+    a normal User (save() writes only the loaded fields).
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+
+# Signals are sent with the instance's own class, and request.user is a
+# ClaimsUser, so DeleteAccountView deletes through the proxy. (A receiver
+# without a sender would also work, but would stop Django fast-deleting
+# every other model.)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=ClaimsUser)
+def forget_deleted_user_token_version(sender, instance, **kwargs):
+    from .authentication import forget_token_version
+    user_id = instance.pk
+    forget_token_version(user_id)
+    # Again once the delete is visible: a request in between may have
+    # cached the version from the not yet deleted row
+    transaction.on_commit(lambda: forget_token_version(user_id))
+
+
 # -----------------------------------------------------------
 # ⭐ Delivery Address
 # -----------------------------------------------------------
@@ -157,4 +213,100 @@ class DeliveryAddress(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Delivery Address"
-        verbose_name_plural = "Delivery Addresses"
\ No newline at end of file
+        verbose_name_plural = "Delivery Addresses"
+
+
+# -----------------------------------------------------------
+# 📬 Email outbox
+# -----------------------------------------------------------
+
+class OutboundEmail(models.Model):
+    """
+    A message queued by a request (in its transaction) and sent later by
+    manage.py deliver_emails (users/outbox.py).
+    """
+
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+
+    # At most one pending message per key; queueing again replaces it
+    dedup_key = models.CharField(max_length=200, blank=True, null=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # The worker's queue scan
+            models.Index(fields=['next_attempt_at'], condition=models.Q(status='pending'), name='email_pending_due'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['dedup_key'], condition=models.Q(status='pending'), name='email_pending_dedup'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to} ({self.status})"
+
+
+# -----------------------------------------------------------
+# 📤 Resumable KYC document uploads
+# -----------------------------------------------------------
+
+class UploadSession(models.Model):
+    """
+    One partner document uploaded in chunks (users/uploads.py). Bytes go
+    to a file under UPLOAD_SESSION_DIR; the user's image field is only set
+    once all `size` bytes are in and match `sha256`.
+    """
+
+    DOCUMENT_CHOICES = (
+        ('aadhaar_image', 'Aadhaar image'),
+        ('pan_image', 'PAN image'),
+    )
+
+    STATUS_CHOICES = (
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+
+    document = models.CharField(max_length=20, choices=DOCUMENT_CHOICES)
+    filename = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    sha256 = models.CharField(max_length=64)
+
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.document} for {self.user_id}: {self.received}/{self.size} ({self.status})"
+
+
+@receiver(post_delete, sender=UploadSession)
+def remove_partial_upload(sender, instance, **kwargs):
+    # Finished uploads were already moved into storage; this catches aborted,
+    # expired and cascaded (deleted account) ones
+    from .uploads import partial_path
+    partial_path(instance).unlink(missing_ok=True)
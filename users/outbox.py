@@ -0,0 +1,117 @@
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+
+from .models import OutboundEmail
+
+
+# ==========================================================
+# 📬 Email outbox
+# ==========================================================
+# Requests never talk SMTP: queue_email() inserts a row in the request's
+# transaction (so a rolled-back request sends nothing) and
+# manage.py deliver_emails sends due rows in batches over one SMTP
+# connection, locking each batch with SKIP LOCKED so several workers can
+# run. Temporary failures retry with exponential backoff; permanent ones
+# (rejected recipient, too many attempts) end as 'failed'.
+#
+# Delivery is at least once: a worker that dies between the server
+# accepting a message and the row being marked sent will send it again.
+
+def queue_email(to, subject, body, dedup_key=None, from_email=None):
+    """
+    Queue one message. With a dedup_key, a still-pending message with the
+    same key is replaced instead (e.g. only the newest reset token is sent).
+    """
+    fields = {
+        'to': to,
+        'subject': subject,
+        'body': body,
+        'from_email': from_email or settings.DEFAULT_FROM_EMAIL,
+        'next_attempt_at': now(),
+        'attempts': 0,
+        'last_error': '',
+    }
+
+    if dedup_key is None:
+        return OutboundEmail.objects.create(**fields)
+
+    pending = OutboundEmail.objects.filter(dedup_key=dedup_key, status='pending')
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                return OutboundEmail.objects.create(dedup_key=dedup_key, **fields)
+        except IntegrityError:
+            pass
+        # One is pending: replace it, unless it was sent meanwhile (then insert again)
+        if pending.update(**fields):
+            return pending.first()
+    raise IntegrityError(f"Could not queue email for {dedup_key!r}")
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(
+        settings.EMAIL_OUTBOX_RETRY_SECONDS * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_RETRY_SECONDS,
+    ))
+
+
+# Refusals of one message; the session stays usable for the next
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+def is_permanent(exc):
+    """A 5xx refusal of the message itself: retrying won't help."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(exc, MESSAGE_ERRORS) and exc.smtp_code >= 500
+
+
+def deliver_batch(connection, batch_size):
+    """
+    Send up to `batch_size` due messages over `connection` (a Django SMTP
+    backend, left open for the caller's next batch). When the server can't
+    be reached the batch stops; untried messages wait for the next one.
+    Returns (sent, failed) counts; messages to retry count as failed.
+    """
+    with transaction.atomic():
+        rows = list(
+            OutboundEmail.objects.filter(status='pending', next_attempt_at__lte=now())
+            .order_by('next_attempt_at')
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+
+        tried = []
+        sent = failed = 0
+        for row in rows:
+            tried.append(row)
+            row.attempts += 1
+            try:
+                connection.open()
+                EmailMessage(row.subject, row.body, row.from_email, [row.to], connection=connection).send()
+            except (smtplib.SMTPException, OSError) as exc:
+                row.last_error = f"{type(exc).__name__}: {exc}"
+                failed += 1
+                if is_permanent(exc) or row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                    row.status = 'failed'
+                else:
+                    row.next_attempt_at = now() + retry_delay(row.attempts)
+
+                if not isinstance(exc, MESSAGE_ERRORS):
+                    # Server unreachable, disconnected or refusing us: don't try the rest now
+                    connection.close()
+                    break
+            else:
+                row.status = 'sent'
+                row.sent_at = now()
+                row.last_error = ''
+                sent += 1
+
+        OutboundEmail.objects.bulk_update(
+            tried, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+
+    return sent, failed
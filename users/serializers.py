@@ -1,6 +1,12 @@
-﻿from rest_framework import serializers
+﻿import os
+
+from django.conf import settings
+from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import DeliveryAddress
+from .hashing import set_password
+from .models import DeliveryAddress, UploadSession
+from .usernames import save_with_unique_username
+from maakaswad.sparse import SparseFieldsMixin
 
 User = get_user_model()
 
@@ -9,7 +15,7 @@ User = get_user_model()
 # ✅ USER PROFILE SERIALIZER (Includes KYC + ONLINE STATUS)
 # ===========================================================
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -85,6 +91,34 @@ class PartnerDocumentSerializer(serializers.ModelSerializer):
         return value
 
 
+# ===========================================================
+# 📤 RESUMABLE DOCUMENT UPLOAD SERIALIZER
+# ===========================================================
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = UploadSession
+        fields = ["id", "document", "filename", "size", "sha256", "received", "status"]
+        read_only_fields = ["id", "received", "status"]
+
+    def validate_filename(self, value):
+        return os.path.basename(value.replace("\\", "/")) or "document"
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.UPLOAD_MAX_BYTES:
+            raise serializers.ValidationError(
+                f"Size must be between 1 and {settings.UPLOAD_MAX_BYTES} bytes."
+            )
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if len(value) != 64 or not all(c in "0123456789abcdef" for c in value):
+            raise serializers.ValidationError("Expected a hex sha256 digest.")
+        return value
+
+
 # ===========================================================
 # ✅ REGISTRATION SERIALIZER
 # ===========================================================
@@ -143,19 +177,14 @@ class RegisterSerializer(serializers.ModelSerializer):
         password = validated_data["password"]
         phone = validated_data.get("phone", "")
 
-        # ✅ Auto generate username from email
-        username = email.split("@")[0]
-
-        # Prevent duplicate username crash
-        if User.objects.filter(username=username).exists():
-            username = f"{username}_{User.objects.count()}"
-
-        user = User.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
+        # create_user(), with the hash made on the bounded executor and
+        # the username allocated from the email local part
+        user = User(
+            email=User.objects.normalize_email(email),
             phone=phone
         )
+        set_password(user, password)
+        save_with_unique_username(user, email.split("@")[0])
 
         user.role = role
 
@@ -180,7 +209,7 @@ class RegisterSerializer(serializers.ModelSerializer):
 # ✅ DELIVERY ADDRESS SERIALIZER
 # ===========================================================
 
-class DeliveryAddressSerializer(serializers.ModelSerializer):
+class DeliveryAddressSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryAddress
         fields = [
@@ -0,0 +1,177 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from asgiref.sync import async_to_sync
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from users.google import MIN_REFETCH_SECONDS, google_keys
+from users.views import SocialLoginView
+
+CLIENT_ID = "users-tests.apps.googleusercontent.com"
+
+
+class FakeKeyServer:
+    """Serves a JWKS on 127.0.0.1 like https://www.googleapis.com/oauth2/v3/certs and counts fetches."""
+
+    def __init__(self):
+        self.keys = {}
+        self.fetches = 0
+        self.failing = False  # answer 503, as Google does when it is unreachable
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.fetches += 1
+                if server.failing:
+                    self.send_error(503)
+                    return
+                body = json.dumps({"keys": [
+                    {**jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key(), as_dict=True),
+                     "kid": kid, "alg": "RS256", "use": "sig"}
+                    for kid, key in server.keys.items()
+                ]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", "public, max-age=3600")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/oauth2/v3/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def add_key(self, kid):
+        self.keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return self.keys[kid]
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def id_token(key, kid, email="google.test@example.com", **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com", "aud": CLIENT_ID, "sub": email, "email": email,
+        "email_verified": True, "name": "Google Test", "iat": now, "exp": now + 3600, **claims,
+    }
+    return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+
+@override_settings(
+    GOOGLE_CLIENT_IDS=[CLIENT_ID],
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                        "LOCATION": "users-tests-google"}},
+)
+class GoogleIdTokenLoginTests(TestCase):
+    """Social login with ID tokens against a local fake key server (one per test, so key sets don't leak)."""
+
+    def setUp(self):
+        cache.clear()
+        self.keys = FakeKeyServer()
+        self.addCleanup(self.keys.stop)
+
+        jwks = override_settings(GOOGLE_JWKS_URL=self.keys.url)
+        jwks.enable()
+        self.addCleanup(jwks.disable)
+
+        self.key = self.keys.add_key("key-1")
+
+    def login(self, token):
+        request = RequestFactory().post("/api/users/social/", {"provider": "google", "id_token": token},
+                                        content_type="application/json")
+        return async_to_sync(SocialLoginView.as_view())(request).status_code
+
+    def test_verifies_locally_after_one_key_fetch(self):
+        token = id_token(self.key, "key-1")
+
+        self.assertEqual(self.login(token), 200)
+        self.assertEqual(self.keys.fetches, 1)
+
+        # Same token (verified-token cache), then a new token under a known key
+        self.assertEqual(self.login(token), 200)
+        self.assertEqual(self.login(id_token(self.key, "key-1", iat=int(time.time()) - 5)), 200)
+        self.assertEqual(self.keys.fetches, 1)
+
+    def test_refuses_invalid_tokens(self):
+        forged = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        now = int(time.time())
+
+        for name, token in [
+            ("wrong audience", id_token(self.key, "key-1", aud="someone-else")),
+            ("expired", id_token(self.key, "key-1", iat=now - 7200, exp=now - 3600)),
+            ("unverified email", id_token(self.key, "key-1", email_verified=False)),
+            ("signed by another key under a known kid", id_token(forged, "key-1")),
+        ]:
+            with self.subTest(name):
+                self.assertEqual(self.login(token), 400)
+
+        self.assertEqual(self.keys.fetches, 1)
+
+    def test_rotated_key_is_fetched_on_first_sight(self):
+        self.assertEqual(self.login(id_token(self.key, "key-1")), 200)
+
+        # Fetches for unknown kids are at least MIN_REFETCH_SECONDS apart
+        google_keys().attempted_at -= MIN_REFETCH_SECONDS
+        rotated = self.keys.add_key("key-2")
+        self.assertEqual(self.login(id_token(rotated, "key-2")), 200)
+        self.assertEqual(self.keys.fetches, 2)
+
+        unknown = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.assertEqual(self.login(id_token(unknown, "key-3")), 400)
+        self.assertEqual(self.keys.fetches, 2)
+
+    def test_stale_key_set_is_refreshed_in_the_background(self):
+        self.assertEqual(self.login(id_token(self.key, "key-1")), 200)
+
+        # Past max-age the old set still verifies while a refresh runs
+        keyset = self.make_stale(google_keys())
+        self.assertEqual(self.login(id_token(self.key, "key-1", iat=int(time.time()) - 1)), 200)
+
+        self.wait_for_refresh(keyset)
+        self.assertEqual(self.keys.fetches, 2)
+
+    def test_failed_background_refresh_is_not_retried_on_every_login(self):
+        self.assertEqual(self.login(id_token(self.key, "key-1")), 200)
+
+        keyset = self.make_stale(google_keys())
+        self.keys.failing = True
+        with self.assertLogs("users.google", "WARNING"):
+            self.assertEqual(self.login(id_token(self.key, "key-1", iat=int(time.time()) - 1)), 200)
+            self.wait_for_refresh(keyset)
+        self.assertEqual(self.keys.fetches, 2)
+
+        # Still stale, but the failed attempt was just now: old keys verify, no new fetch
+        for seconds in range(2, 5):
+            self.assertEqual(self.login(id_token(self.key, "key-1", iat=int(time.time()) - seconds)), 200)
+            self.assertFalse(keyset.refreshing)
+        self.assertEqual(self.keys.fetches, 2)
+
+        # Once MIN_REFETCH_SECONDS have passed it tries again
+        self.keys.failing = False
+        keyset.attempted_at -= MIN_REFETCH_SECONDS
+        self.assertEqual(self.login(id_token(self.key, "key-1", iat=int(time.time()) - 5)), 200)
+        self.wait_for_refresh(keyset)
+        self.assertEqual(self.keys.fetches, 3)
+
+    @staticmethod
+    def make_stale(keyset):
+        """As if the key set had been fetched max-age (and MIN_REFETCH_SECONDS) ago."""
+        seconds = max(keyset.max_age, MIN_REFETCH_SECONDS)
+        keyset.fetched_at -= seconds
+        keyset.attempted_at -= seconds
+        return keyset
+
+    def wait_for_refresh(self, keyset):
+        deadline = time.monotonic() + 5
+        while keyset.refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(keyset.refreshing)
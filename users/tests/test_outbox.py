@@ -0,0 +1,182 @@
+import socketserver
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from rest_framework.test import APIClient
+
+from users.models import OutboundEmail, User
+from users.outbox import queue_email
+
+
+class FakeSMTPServer:
+    """
+    Minimal SMTP server on 127.0.0.1 standing in for the real one: records
+    connections and accepted messages; `replies` maps a recipient to the
+    reply its RCPT (5xx) or DATA (4xx) should get instead of success.
+    """
+
+    def __init__(self):
+        self.reset()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self):
+                server.connections += 1
+                self.reply("220 fake-smtp ready")
+                recipients = []
+                while True:
+                    line = self.rfile.readline().decode(errors="replace").strip()
+                    command = line[:4].upper()
+                    if not line or command == "QUIT":
+                        self.reply("221 bye")
+                        return
+                    if command == "EHLO":
+                        self.reply("250-fake-smtp")
+                        self.reply("250 8BITMIME")
+                    elif command == "RCPT":
+                        address = line.split(":", 1)[1].strip(" <>")
+                        reply = server.replies.get(address, "")
+                        if reply.startswith("5"):
+                            self.reply(reply)
+                        else:
+                            recipients.append(address)
+                            self.reply("250 ok")
+                    elif command == "DATA":
+                        self.reply("354 go ahead")
+                        body = []
+                        while (data := self.rfile.readline()) not in (b".\r\n", b""):
+                            body.append(data)
+                        reply = next((server.replies[r] for r in recipients if r in server.replies), None)
+                        if reply:
+                            self.reply(reply)
+                        else:
+                            server.messages.append((recipients, b"".join(body).decode(errors="replace")))
+                            self.reply("250 queued")
+                        recipients = []
+                    elif command == "RSET":
+                        recipients = []
+                        self.reply("250 ok")
+                    else:  # HELO, MAIL, NOOP
+                        self.reply("250 ok")
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self):
+        self.connections = 0
+        self.messages = []
+        self.replies = {}
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class EmailOutboxTests(TestCase):
+    """Outbox queueing and deliver_emails against a local SMTP stand-in."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.smtp = FakeSMTPServer()
+        cls.addClassCleanup(cls.smtp.stop)
+
+    def setUp(self):
+        self.smtp.reset()
+        cache.clear()
+
+        smtp_settings = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1", EMAIL_PORT=self.smtp.port, EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER="", EMAIL_HOST_PASSWORD="", EMAIL_TIMEOUT=2,
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                                "LOCATION": "users-tests-outbox"}},
+        )
+        smtp_settings.enable()
+        self.addCleanup(smtp_settings.disable)
+
+    def deliver(self, batch_size=10):
+        call_command("deliver_emails", batch_size=batch_size, stdout=StringIO())
+
+    def test_forgot_password_queues_and_replaces_pending_email(self):
+        user = User.objects.create(username="outbox_test", email="outbox.test@example.com")
+        client = APIClient()
+
+        for _ in range(2):
+            response = client.post("/api/users/forgot-password/", {"email": user.email}, format="json")
+            self.assertEqual(response.status_code, 200)
+
+        # Queued only: the request never talks SMTP
+        self.assertEqual(self.smtp.connections, 0)
+
+        user.refresh_from_db()
+        pending = OutboundEmail.objects.get(to=user.email, status="pending")
+        self.assertIn(user.reset_token, pending.body)
+
+        self.deliver()
+        self.assertEqual(len(self.smtp.messages), 1)
+        self.assertIn(user.reset_token, self.smtp.messages[0][1])
+
+    def test_delivers_batches_over_one_connection(self):
+        for i in range(25):
+            queue_email(f"customer{i}@example.com", f"Order {i}", "Your order is on its way.")
+
+        self.deliver(batch_size=10)
+
+        self.assertEqual(OutboundEmail.objects.filter(status="sent").count(), 25)
+        self.assertEqual(len(self.smtp.messages), 25)
+        self.assertEqual(self.smtp.connections, 1)
+
+    def test_temporary_failure_is_retried_and_permanent_one_given_up(self):
+        self.smtp.replies = {"busy@example.com": "451 try again later", "gone@example.com": "550 no such user"}
+        busy = queue_email("busy@example.com", "Busy", "x")
+        gone = queue_email("gone@example.com", "Gone", "x")
+        fine = queue_email("fine@example.com", "Fine", "x")
+
+        self.deliver()
+        for message in (busy, gone, fine):
+            message.refresh_from_db()
+
+        self.assertEqual((busy.status, busy.attempts), ("pending", 1))
+        self.assertAlmostEqual((busy.next_attempt_at - now()).total_seconds(),
+                               settings.EMAIL_OUTBOX_RETRY_SECONDS, delta=5)
+        self.assertEqual(gone.status, "failed")
+        self.assertEqual(fine.status, "sent")
+
+        # Sent once the server recovers
+        self.smtp.replies = {}
+        OutboundEmail.objects.filter(pk=busy.pk).update(next_attempt_at=now())
+        self.deliver()
+        busy.refresh_from_db()
+        self.assertEqual(busy.status, "sent")
+
+    def test_unreachable_server_costs_one_attempt(self):
+        with override_settings(EMAIL_PORT=1):  # nothing listens there
+            later = [queue_email(f"later{i}@example.com", "Later", "x") for i in range(5)]
+            self.deliver()
+
+        states = sorted(OutboundEmail.objects.filter(pk__in=[m.pk for m in later])
+                        .values_list("attempts", "status"))
+        self.assertEqual(states, [(0, "pending")] * 4 + [(1, "pending")])
+
+    def test_gives_up_after_max_attempts(self):
+        later = [queue_email(f"later{i}@example.com", "Later", "x") for i in range(5)]
+        OutboundEmail.objects.filter(pk__in=[m.pk for m in later]).update(
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS - 1, next_attempt_at=now() - timedelta(seconds=1))
+        self.smtp.replies = {f"later{i}@example.com": "451 still busy" for i in range(5)}
+
+        self.deliver()
+
+        self.assertEqual(OutboundEmail.objects.filter(pk__in=[m.pk for m in later], status="failed").count(), 5)
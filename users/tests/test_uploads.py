@@ -0,0 +1,111 @@
+import hashlib
+import io
+import tempfile
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from PIL import Image
+from rest_framework.test import APIClient
+
+from users.models import UploadSession, User
+from users.uploads import partial_path, purge_stale_uploads, upload_cutoff
+
+UPLOADS = "/api/users/partner/documents/uploads/"
+
+
+def png(size=(64, 64)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 120, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class ChunkedUploadTests(TestCase):
+    """Resumable KYC document uploads, with UPLOAD_SESSION_DIR and MEDIA_ROOT in temp dirs."""
+
+    def setUp(self):
+        dirs = [tempfile.TemporaryDirectory() for _ in range(2)]
+        for tmp in dirs:
+            self.addCleanup(tmp.cleanup)
+
+        storage = override_settings(UPLOAD_SESSION_DIR=dirs[0].name, MEDIA_ROOT=dirs[1].name)
+        storage.enable()
+        self.addCleanup(storage.disable)
+
+        self.user = User.objects.create(username="upload_chef", email="upload.chef@example.com", role="chef")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.document = png()
+
+    def start(self, content=None, sha256=None):
+        content = self.document if content is None else content
+        response = self.client.post(UPLOADS, {
+            "document": "pan_image", "filename": "pan.png", "size": len(content),
+            "sha256": sha256 or hashlib.sha256(content).hexdigest(),
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        return UploadSession.objects.get(pk=response.data["id"])
+
+    def put(self, session, offset, chunk, checksum=None):
+        headers = {"HTTP_UPLOAD_OFFSET": str(offset)}
+        if checksum:
+            headers["HTTP_UPLOAD_CHECKSUM"] = checksum
+        return self.client.put(f"{UPLOADS}{session.pk}/", chunk, content_type="application/octet-stream",
+                               **headers)
+
+    def test_resumes_and_attaches_the_document(self):
+        session = self.start()
+        half = len(self.document) // 2
+
+        response = self.put(session, 0, self.document[:half])
+        self.assertEqual((response.status_code, response.data["received"]), (200, half))
+
+        # A client that lost the response asks where to resume
+        response = self.client.get(f"{UPLOADS}{session.pk}/")
+        self.assertEqual((response.data["received"], response.data["status"]), (half, "uploading"))
+
+        # Sending the same chunk again is a conflict, not a second copy
+        response = self.put(session, 0, self.document[:half])
+        self.assertEqual((response.status_code, response.data["received"]), (409, half))
+
+        response = self.put(session, half, self.document[half:])
+        self.assertEqual((response.status_code, response.data["status"]), (200, "complete"))
+
+        self.user.refresh_from_db()
+        with self.user.pan_image.open("rb") as stored:
+            self.assertEqual(stored.read(), self.document)
+        self.assertFalse(partial_path(session).exists())
+
+    def test_chunk_with_bad_checksum_is_discarded(self):
+        session = self.start()
+
+        response = self.put(session, 0, self.document, checksum="0" * 64)
+        self.assertEqual((response.status_code, response.data["received"]), (400, 0))
+        self.assertEqual(partial_path(session).stat().st_size, 0)
+
+        response = self.put(session, 0, self.document, checksum=hashlib.sha256(self.document).hexdigest())
+        self.assertEqual((response.status_code, response.data["status"]), (200, "complete"))
+
+    def test_whole_file_sha256_mismatch_discards_the_upload(self):
+        session = self.start(sha256=hashlib.sha256(b"another document").hexdigest())
+
+        response = self.put(session, 0, self.document)
+        self.assertEqual(response.status_code, 422)
+
+        self.assertFalse(UploadSession.objects.filter(pk=session.pk).exists())
+        self.assertFalse(partial_path(session).exists())
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.pan_image)
+
+    def test_purge_removes_stale_sessions_and_their_files(self):
+        stale, fresh = self.start(), self.start()
+        for session in (stale, fresh):
+            self.assertEqual(self.put(session, 0, self.document[:100]).status_code, 200)
+        UploadSession.objects.filter(pk=stale.pk).update(updated_at=now() - timedelta(days=2))
+
+        self.assertEqual(purge_stale_uploads(upload_cutoff(hours=24), batch_size=10), 1)
+
+        self.assertFalse(UploadSession.objects.filter(pk=stale.pk).exists())
+        self.assertFalse(partial_path(stale).exists())
+        self.assertTrue(partial_path(fresh).exists())
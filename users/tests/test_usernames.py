@@ -0,0 +1,60 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import TransactionTestCase, override_settings, skipUnlessDBFeature, tag
+
+from users.hashing import HashingBusy
+from users.models import User
+from users.serializers import RegisterSerializer
+
+
+@tag("stress")
+@skipUnlessDBFeature("test_db_allows_multiple_connections")  # not SQLite's in-memory test database
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ConcurrentRegistrationTests(TransactionTestCase):
+    """
+    Registrations whose emails share one local part all want the same
+    username. Run from concurrent threads, committed for real, every one
+    must still get an account with its own username. Cheap hashes: this
+    measures username allocation, not PBKDF2. Skip with --exclude-tag stress.
+    """
+
+    USERS = 10_000
+    THREADS = 16
+    LOCAL_PART = "priya"
+
+    def register(self, i):
+        payload = {
+            "username": f"client_{i}",  # required by the serializer, not used for the account
+            "email": f"{self.LOCAL_PART}@{i}.stress.example",
+            "password": "stress-password-1",
+            "phone": None,
+        }
+        try:
+            while True:
+                serializer = RegisterSerializer(data=payload)
+                if not serializer.is_valid():
+                    return f"invalid: {serializer.errors}"
+                try:
+                    serializer.save()
+                    return None
+                except HashingBusy:
+                    # What a client does with the 429's Retry-After
+                    time.sleep(0.005)
+        except Exception as exc:
+            return f"{type(exc).__name__}: {exc}"
+        finally:
+            connection.close()
+
+    def test_shared_local_part_gets_distinct_usernames(self):
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            errors = Counter(error for error in pool.map(self.register, range(self.USERS)) if error)
+
+        self.assertEqual(errors, Counter())
+
+        registered = User.objects.filter(email__endswith=".stress.example")
+        self.assertEqual(registered.count(), self.USERS)
+        self.assertEqual(registered.values("username").distinct().count(), self.USERS)
+        self.assertEqual(registered.filter(username=self.LOCAL_PART).count(), 1)
@@ -0,0 +1,87 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from maakaswad.metrics import THROTTLED
+
+
+# ==========================================================
+# 🚦 Failed-attempt throttling
+# ==========================================================
+# Token buckets in the shared cache (Redis in production): every failed
+# login / reset attempt spends a token from the identifier's bucket and
+# from the client IP's bucket, and buckets refill over
+# LOGIN_FAILURE_REFILL_SECONDS. While either is empty the endpoint answers
+# 429 before any password is hashed. Successful attempts cost nothing.
+#
+# Spending is a read-then-write, so parallel failures can overdraw a bucket
+# by a few tokens; the hashing cap (users/hashing.py) bounds what that costs.
+
+class TokenBucket:
+
+    def __init__(self, scope, capacity, refill_seconds):
+        self.scope = scope
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.rate = capacity / refill_seconds
+
+    def key(self, ident):
+        # Hashed: identifiers are emails / phones, and keys stay short
+        return f'throttle:{self.scope}:{hashlib.sha256(ident.encode()).hexdigest()[:32]}'
+
+    def level(self, state, now):
+        if state is None:
+            return self.capacity
+        tokens, stamp = state
+        return min(self.capacity, tokens + (now - stamp) * self.rate)
+
+    def wait(self, state, now):
+        """Seconds until a token is available: 0 when one is."""
+        tokens = self.level(state, now)
+        return 0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def spend(self, ident, state, now):
+        cache.set(self.key(ident), (max(self.level(state, now) - 1, 0), now), self.refill_seconds)
+
+
+class FailedAttemptThrottle:
+    """Failed attempts at one action, limited per identifier and per client IP."""
+
+    def __init__(self, scope):
+        self.by_identifier = TokenBucket(
+            f'{scope}:id', settings.LOGIN_FAILURES_PER_IDENTIFIER, settings.LOGIN_FAILURE_REFILL_SECONDS)
+        self.by_ip = TokenBucket(
+            f'{scope}:ip', settings.LOGIN_FAILURES_PER_IP, settings.LOGIN_FAILURE_REFILL_SECONDS)
+        self.scope = scope
+
+    def _buckets(self, request, identifier):
+        # DRF's client IP: REST_FRAMEWORK['NUM_PROXIES'] hops into X-Forwarded-For
+        ip = BaseThrottle().get_ident(request)
+        return [(self.by_identifier, str(identifier).strip().lower()), (self.by_ip, ip)]
+
+    def _states(self, buckets):
+        found = cache.get_many([bucket.key(ident) for bucket, ident in buckets])
+        return [found.get(bucket.key(ident)) for bucket, ident in buckets]
+
+    def check(self, request, identifier):
+        """Raise a 429 while the identifier or the client IP is out of attempts."""
+        buckets = self._buckets(request, identifier)
+        now = time.time()
+        wait = max(bucket.wait(state, now) for (bucket, _), state in zip(buckets, self._states(buckets)))
+        if wait:
+            THROTTLED.labels(self.scope).inc()
+            raise Throttled(wait=wait)
+
+    def failed(self, request, identifier):
+        buckets = self._buckets(request, identifier)
+        now = time.time()
+        for (bucket, ident), state in zip(buckets, self._states(buckets)):
+            bucket.spend(ident, state, now)
+
+
+login_failures = FailedAttemptThrottle('login')
+reset_failures = FailedAttemptThrottle('reset_password')
@@ -0,0 +1,179 @@
+import fcntl
+import hashlib
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils.timezone import now
+
+from .models import UploadSession
+
+
+# ==========================================================
+# 📤 Resumable KYC document uploads
+# ==========================================================
+# A partner declares the document (size and sha256) up front, then PUTs
+# raw chunks with an Upload-Offset header. Each chunk is copied from the
+# request stream to UPLOAD_SESSION_DIR/<id>.part in READ_SIZE pieces, so
+# memory stays flat whatever the document size; a dropped connection
+# keeps what was written and the client asks for the offset and resumes.
+#
+# Only when the last byte is in is the whole file hashed and, if it
+# matches, validated as an image and moved onto the user by
+# PartnerDocumentSerializer. A mismatch discards the session.
+
+READ_SIZE = 64 * 1024
+
+
+class UploadConflict(Exception):
+    """The chunk is not at the current offset, or another chunk is being written."""
+
+
+class ChunkError(Exception):
+    """The chunk was cut short or does not match its Upload-Checksum."""
+
+
+class ChecksumMismatch(Exception):
+    """The assembled file does not match the sha256 declared for the session."""
+
+
+class AssembledFile(File):
+    """
+    A finished .part file. Looks like a TemporaryUploadedFile, so image
+    validation opens it by path and FileSystemStorage moves it into place.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def partial_path(session):
+    return Path(settings.UPLOAD_SESSION_DIR) / f"{session.pk}.part"
+
+
+def upload_cutoff(hours=None):
+    hours = settings.UPLOAD_SESSION_TTL_HOURS if hours is None else hours
+    return now() - timedelta(hours=hours)
+
+
+def start_upload(session):
+    path = partial_path(session)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+def write_chunk(session, stream, offset, length, checksum=None):
+    """
+    Appends `length` bytes from `stream` at `offset` and returns the new
+    offset. Anything past `offset` from an earlier, interrupted chunk is
+    overwritten; a chunk that fails leaves the file as it was.
+    """
+    path = partial_path(session)
+
+    try:
+        fh = open(path, 'r+b')
+    except FileNotFoundError:
+        raise UploadConflict("Upload data is gone; start a new upload.")
+
+    with fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadConflict("Another chunk of this upload is being written.")
+
+        # Re-read under the lock: the row is the only trusted offset
+        session.refresh_from_db(fields=['received', 'status'])
+        if session.status != 'uploading' or offset != session.received:
+            raise UploadConflict("Chunk is not at the current offset.")
+
+        fh.seek(offset)
+        fh.truncate()
+
+        digest = hashlib.sha256()
+        remaining = length
+        while remaining:
+            piece = stream.read(min(READ_SIZE, remaining))
+            if not piece:
+                break
+            fh.write(piece)
+            digest.update(piece)
+            remaining -= len(piece)
+
+        if remaining or (checksum and digest.hexdigest() != checksum.lower()):
+            fh.truncate(offset)
+            raise ChunkError("Chunk checksum mismatch." if not remaining else "Chunk was cut short.")
+
+        fh.flush()
+        os.fsync(fh.fileno())
+
+        session.received = offset + length
+        UploadSession.objects.filter(pk=session.pk).update(received=session.received, updated_at=now())
+
+    return session.received
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        while piece := fh.read(READ_SIZE):
+            digest.update(piece)
+    return digest.hexdigest()
+
+
+def finish_upload(session, user):
+    """
+    Checks the assembled file against the session's sha256 and attaches it
+    to `user`. Returns None on success or the serializer's errors, in which
+    case (as on ChecksumMismatch) the session and its file are deleted.
+    """
+    from .serializers import PartnerDocumentSerializer
+
+    path = partial_path(session)
+
+    if file_sha256(path) != session.sha256:
+        session.delete()
+        raise ChecksumMismatch("Uploaded file does not match its sha256.")
+
+    with open(path, 'rb') as fh:
+        serializer = PartnerDocumentSerializer(
+            user,
+            data={session.document: AssembledFile(fh, name=session.filename)},
+            partial=True
+        )
+
+        if not serializer.is_valid():
+            session.delete()
+            return serializer.errors
+
+        with transaction.atomic():
+            serializer.save()
+            session.status = 'complete'
+            session.save(update_fields=['status', 'updated_at'])
+
+    path.unlink(missing_ok=True)
+    return None
+
+
+def purge_stale_uploads(cutoff, batch_size):
+    """
+    Deletes up to `batch_size` sessions not touched since `cutoff` (their
+    partial files go with them, see models.remove_partial_upload). Returns
+    the number of sessions deleted.
+    """
+    with transaction.atomic():
+        ids = list(
+            UploadSession.objects.filter(updated_at__lt=cutoff)
+            .order_by('created_at')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+
+        if not ids:
+            return 0
+
+        deleted, _ = UploadSession.objects.filter(id__in=ids).delete()
+
+    return deleted
@@ -18,6 +18,8 @@ from .views import (
     GetPartnerRoleView,
     NotificationSettingsView,
     PartnerDocumentsView,
+    DocumentUploadCreateView,
+    DocumentUploadView,
     UpdateOnlineStatusView,   # ✅ FIXED IMPORT
 )
 
@@ -57,6 +59,8 @@ urlpatterns = [
 
     # 🔥 Partner KYC Submission
     path("partner/documents/", PartnerDocumentsView.as_view(), name="partner-documents"),
+    path("partner/documents/uploads/", DocumentUploadCreateView.as_view(), name="document-upload-create"),
+    path("partner/documents/uploads/<uuid:upload_id>/", DocumentUploadView.as_view(), name="document-upload"),
 
     # 🔥 Online / Offline Toggle API (FIXED)
     path("update-online-status/", UpdateOnlineStatusView.as_view(), name="update-online-status"),
@@ -0,0 +1,56 @@
+import re
+import secrets
+import string
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+
+User = get_user_model()
+
+
+# ==========================================================
+# 🏷️ Unique username allocation
+# ==========================================================
+# New accounts get a username from their email local part (or Google name).
+# The first try is the plain base ("priya"), later tries add a random
+# suffix ("priya_k3x9q2", 36^6 possibilities), and the unique constraint
+# decides: no COUNT, no exists() check that another registration can race.
+
+SUFFIX_ALPHABET = string.ascii_lowercase + string.digits
+SUFFIX_LENGTH = 6
+MAX_ATTEMPTS = 5
+
+_NOT_ALLOWED = re.compile(r'[^\w.@+-]')
+
+
+def username_base(text):
+    """A valid username stem from an email local part or display name."""
+    base = _NOT_ALLOWED.sub('', User.normalize_username(text).replace(' ', '_'))
+    max_length = User._meta.get_field('username').max_length - SUFFIX_LENGTH - 1
+    return base[:max_length] or 'user'
+
+
+def username_candidates(base):
+    yield base
+    while True:
+        yield f"{base}_{''.join(secrets.choice(SUFFIX_ALPHABET) for _ in range(SUFFIX_LENGTH))}"
+
+
+def save_with_unique_username(user, base):
+    """
+    Insert the unsaved `user` under the first free username from `base`.
+    Each attempt runs in its own savepoint, so the caller's transaction
+    survives a collision; other integrity errors (email, phone) propagate.
+    """
+    candidates = username_candidates(username_base(base))
+
+    for attempt in range(MAX_ATTEMPTS):
+        user.username = next(candidates)
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+            return user
+        except IntegrityError:
+            user.pk = None
+            if attempt == MAX_ATTEMPTS - 1 or not User.objects.filter(username=user.username).exists():
+                raise
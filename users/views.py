@@ -1,30 +1,45 @@
-﻿from django.db.models import Q
-from django.contrib.auth import get_user_model
+﻿from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.utils.crypto import get_random_string
-from django.core.mail import send_mail
+from django.utils.decorators import method_decorator
+from django.views import View
+from asgiref.sync import sync_to_async
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.permissions import AllowAny
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.parsers import MultiPartParser, FormParser
 
 import traceback
-import requests
 
 from .serializers import (
     UserSerializer,
     RegisterSerializer,
     DeliveryAddressSerializer,
     NotificationSettingsSerializer,
-    PartnerDocumentSerializer
+    PartnerDocumentSerializer,
+    UploadSessionSerializer,
 )
-from .models import DeliveryAddress
+from .authentication import ClaimsRefreshToken, bump_token_version
+from .backends import find_login_user
+from .google import InvalidGoogleToken, google_profile
+from .hashing import set_password, verify_password
+from .models import DeliveryAddress, UploadSession
+from .outbox import queue_email
+from .throttling import login_failures, reset_failures
+from .uploads import (
+    ChecksumMismatch, ChunkError, UploadConflict,
+    finish_upload, start_upload, write_chunk,
+)
+from .usernames import save_with_unique_username
+from maakaswad.async_views import json_response, request_data
+from maakaswad.sparse import SparseFieldsViewMixin
 
 User = get_user_model()
 
@@ -32,7 +47,7 @@ User = get_user_model()
 # ✅ JWT GENERATOR
 # ==========================================================
 def generate_jwt(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = ClaimsRefreshToken.for_user(user)
     return {
         "access": str(refresh.access_token),
         "refresh": str(refresh),
@@ -51,50 +66,55 @@ def health_check(request):
 # ==========================================================
 # 🟢 GOOGLE SOCIAL LOGIN
 # ==========================================================
-class SocialLoginView(APIView):
-    permission_classes = [AllowAny]
+def create_social_user(email, name):
+    user = User(email=email, role="user", is_approved=True, registration_paid=True)
+    try:
+        return save_with_unique_username(user, name)
+    except IntegrityError:
+        # Same Google account signing in twice at once: the other request created it
+        return User.objects.get(email=email)
 
-    def post(self, request):
-        provider = request.data.get("provider")
-        access_token = request.data.get("access_token")
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SocialLoginView(View):
+    # Async: a Google round trip (access tokens, cold key set) doesn't hold a
+    # worker thread (see maakaswad/asgi.py); ID tokens verify locally (users/google.py)
+
+    async def post(self, request):
+        data = request_data(request)
+        if data is None:
+            return json_response({"detail": "Invalid JSON body"}, status=400)
+
+        provider = data.get("provider")
+        id_token = data.get("id_token")
+        access_token = data.get("access_token")
 
         if provider != "google":
-            return Response({"detail": "Only Google login supported"}, status=400)
+            return json_response({"detail": "Only Google login supported"}, status=400)
 
-        if not access_token:
-            return Response({"detail": "Missing Google access token"}, status=400)
+        if not id_token and not access_token:
+            return json_response({"detail": "Missing Google token"}, status=400)
 
         try:
-            response = requests.get(
-                "https://www.googleapis.com/oauth2/v3/userinfo",
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
+            profile = await google_profile(id_token=id_token, access_token=access_token)
+            email = profile["email"]
+            name = profile["name"] or email.split("@")[0]
 
-            if response.status_code != 200:
-                return Response({"detail": "Invalid Google token"}, status=400)
-
-            data = response.json()
-            email = data.get("email")
-            name = data.get("name") or email.split("@")[0]
-
-            user, created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    "username": name,
-                    "role": "user",
-                    "is_approved": True,
-                    "registration_paid": True
-                }
-            )
+            user = await User.objects.filter(email=email).afirst()
+            if user is None:
+                user = await sync_to_async(create_social_user)(email, name)
 
             if user.role != "user":
-                return Response({"detail": "Partner accounts cannot login here"}, status=403)
+                return json_response({"detail": "Partner accounts cannot login here"}, status=403)
+
+            return json_response(await sync_to_async(generate_jwt)(user), status=200)
 
-            return Response(generate_jwt(user), status=200)
+        except InvalidGoogleToken:
+            return json_response({"detail": "Invalid Google token"}, status=400)
 
         except Exception:
             traceback.print_exc()
-            return Response({"detail": "Google login failed"}, status=500)
+            return json_response({"detail": "Google login failed"}, status=500)
 
 
 # ==========================================================
@@ -154,13 +174,11 @@ class LoginView(APIView):
         if not identifier or not password:
             return Response({"detail": "Missing credentials"}, status=400)
 
-        user = User.objects.filter(
-            Q(email__iexact=identifier) |
-            Q(phone=identifier) |
-            Q(username__iexact=identifier)
-        ).first()
+        login_failures.check(request, identifier)
+        user = find_login_user(identifier)
 
-        if not user or not user.check_password(password):
+        if not user or not verify_password(user, password):
+            login_failures.failed(request, identifier)
             return Response({"detail": "Invalid credentials"}, status=401)
 
         if user.role != "user":
@@ -183,13 +201,11 @@ class PartnerLoginView(APIView):
         if not identifier or not password:
             return Response({"detail": "Missing credentials"}, status=400)
 
-        user = User.objects.filter(
-            Q(email__iexact=identifier) |
-            Q(phone=identifier) |
-            Q(username__iexact=identifier)
-        ).first()
+        login_failures.check(request, identifier)
+        user = find_login_user(identifier)
 
-        if not user or not user.check_password(password):
+        if not user or not verify_password(user, password):
+            login_failures.failed(request, identifier)
             return Response({"detail": "Invalid credentials"}, status=401)
 
         # Only partners allowed
@@ -219,8 +235,10 @@ class UpdatePartnerRoleView(APIView):
         user.is_approved = False
         user.registration_paid = False
         user.save()
+        bump_token_version(user)
 
-        return Response({"detail": "Role updated. Submit documents."})
+        # Tokens the app already holds now carry stale claims; send fresh ones
+        return Response({"detail": "Role updated. Submit documents.", **generate_jwt(user)})
 
 
 # ==========================================================
@@ -244,6 +262,95 @@ class PartnerDocumentsView(APIView):
         return Response(serializer.errors, status=400)
 
 
+# ==========================================================
+# 📤 RESUMABLE KYC DOCUMENT UPLOADS (users/uploads.py)
+# ==========================================================
+class DocumentUploadCreateView(APIView):
+    """POST {document, filename, size, sha256} -> a session to PUT chunks to."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = UploadSessionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        session = serializer.save(user=request.user)
+        start_upload(session)
+
+        return Response(
+            {**serializer.data, "chunk_size": settings.UPLOAD_CHUNK_MAX_BYTES},
+            status=201
+        )
+
+
+class DocumentUploadView(APIView):
+    """
+    GET: where to resume. PUT: one raw chunk (application/octet-stream) at
+    the Upload-Offset header, optionally with its sha256 in Upload-Checksum.
+    DELETE: abandon the upload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = []  # chunks are streamed from request.stream, never parsed
+
+    def get_session(self, request, upload_id):
+        return UploadSession.objects.filter(pk=upload_id, user_id=request.user.pk).first()
+
+    def get(self, request, upload_id):
+        session = self.get_session(request, upload_id)
+        if session is None:
+            return Response({"error": "Upload not found"}, status=404)
+
+        return Response(UploadSessionSerializer(session).data)
+
+    def put(self, request, upload_id):
+        session = self.get_session(request, upload_id)
+        if session is None:
+            return Response({"error": "Upload not found"}, status=404)
+
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset and Content-Length are required"}, status=400)
+
+        if length <= 0 or offset < 0 or offset + length > session.size:
+            return Response({"error": "Chunk does not fit the declared size"}, status=400)
+
+        if length > settings.UPLOAD_CHUNK_MAX_BYTES:
+            return Response({"error": f"Chunks are at most {settings.UPLOAD_CHUNK_MAX_BYTES} bytes"}, status=413)
+
+        try:
+            received = write_chunk(
+                session, request.stream, offset, length,
+                checksum=request.headers.get("Upload-Checksum")
+            )
+        except UploadConflict as exc:
+            return Response({"error": str(exc), "received": session.received}, status=409)
+        except ChunkError as exc:
+            return Response({"error": str(exc), "received": offset}, status=400)
+
+        if received < session.size:
+            return Response(UploadSessionSerializer(session).data)
+
+        try:
+            errors = finish_upload(session, request.user)
+        except ChecksumMismatch as exc:
+            return Response({"error": str(exc)}, status=422)
+
+        if errors:
+            return Response(errors, status=400)
+
+        return Response(UploadSessionSerializer(session).data)
+
+    def delete(self, request, upload_id):
+        session = self.get_session(request, upload_id)
+        if session is None:
+            return Response({"error": "Upload not found"}, status=404)
+
+        session.delete()
+        return Response(status=204)
+
+
 # ==========================================================
 # 🔵 GET ROLE STATUS
 # ==========================================================
@@ -266,7 +373,7 @@ class UserProfileView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        return Response(UserSerializer(request.user).data)
+        return Response(UserSerializer(request.user, context={'request': request}).data)
 
     def put(self, request):
         serializer = UserSerializer(request.user, data=request.data, partial=True)
@@ -297,7 +404,7 @@ class NotificationSettingsView(APIView):
 # ==========================================================
 # 🟢 DELIVERY ADDRESS
 # ==========================================================
-class DeliveryAddressListCreateView(ListCreateAPIView):
+class DeliveryAddressListCreateView(SparseFieldsViewMixin, ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = DeliveryAddressSerializer
 
@@ -308,7 +415,7 @@ class DeliveryAddressListCreateView(ListCreateAPIView):
         serializer.save(user=self.request.user)
 
 
-class DeliveryAddressDetailView(RetrieveUpdateDestroyAPIView):
+class DeliveryAddressDetailView(SparseFieldsViewMixin, RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = DeliveryAddressSerializer
 
@@ -342,14 +449,17 @@ class ForgotPasswordView(APIView):
         try:
             user = User.objects.get(email=email)
             token = get_random_string(32)
-            user.set_reset_token(token)
 
-            send_mail(
-                subject="Password Reset",
-                message=f"Reset token: {token}",
-                from_email="noreply@maakaswad.com",
-                recipient_list=[email],
-            )
+            # Token and email commit together; deliver_emails sends it
+            with transaction.atomic():
+                user.set_reset_token(token)
+                queue_email(
+                    to=email,
+                    subject="Password Reset",
+                    body=f"Reset token: {token}",
+                    from_email="noreply@maakaswad.com",
+                    dedup_key=f"password-reset:{user.pk}",
+                )
 
             return Response({"detail": "Reset token sent"})
 
@@ -371,19 +481,23 @@ class ResetPasswordView(APIView):
         if not all([email, token, new_password]):
             return Response({"detail": "All fields required"}, status=400)
 
+        reset_failures.check(request, email)
+
         try:
             user = User.objects.get(email=email)
 
             if user.reset_token != token or user.reset_token_expiry < timezone.now():
+                reset_failures.failed(request, email)
                 return Response({"detail": "Invalid or expired token"}, status=400)
 
-            user.set_password(new_password)
+            set_password(user, new_password)
             user.clear_reset_token()
             user.save()
 
             return Response({"detail": "Password reset successful"})
 
         except User.DoesNotExist:
+            reset_failures.failed(request, email)
             return Response({"detail": "User not found"}, status=404)
 
         # ==========================================================